@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.routers.internal import users, organizations, shelters, animals, adoptionRequests, staff, vaccinations, medicalRecords, analytics,  auth as internal_auth
+from app.api.routers.internal import users, organizations, shelters, animals, adoptionRequests, staff, vaccinations, medicalRecords, analytics, admin, sync, exports,  auth as internal_auth
 from app.api.routers.public import animals as public_animals
 
 api_router = APIRouter()
@@ -14,5 +14,8 @@ api_router.include_router(staff.router, prefix="/internal/staff", tags=["interna
 api_router.include_router(vaccinations.router, prefix="/internal/vaccinations", tags=["internal-vaccination"])
 api_router.include_router(medicalRecords.router, prefix="/internal/medicalRecords", tags=["internal-medicalRecord"])
 api_router.include_router(analytics.router, prefix="/internal/analytics", tags=["Internal - analytics"])
+api_router.include_router(admin.router, prefix="/internal/admin", tags=["Internal - admin"])
+api_router.include_router(sync.router, prefix="/internal/sync", tags=["Internal - sync"])
+api_router.include_router(exports.router, prefix="/internal/exports", tags=["Internal - exports"])
 
 api_router.include_router(public_animals.router, prefix="/public/animals", tags=["Public - Animals"])
\ No newline at end of file
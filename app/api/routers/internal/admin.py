@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.compression import compression_stats
+from app.core.profiling import get_profile_path, list_profiles
+from app.core.security import require_operator
+from app.db.instrumentation import route_query_stats
+
+router = APIRouter()
+# process wide data from every organization's requests: operator token, not a tenant role
+
+
+@router.get("/compression", dependencies=[Depends(require_operator)])
+def get_compression_stats():
+    """Bytes saved and CPU time spent by the response compression middleware."""
+    return compression_stats.snapshot()
+
+
+@router.get("/sql", dependencies=[Depends(require_operator)])
+def get_sql_stats():
+    """Per-route query counts and DB time, slowest routes first, with likely N+1 counts."""
+    return route_query_stats.snapshot()
+
+
+@router.get("/profiles", dependencies=[Depends(require_operator)])
+def read_profiles():
+    """Recent request profiles (collapsed stacks), newest first."""
+    return list_profiles()
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_operator)])
+def download_profile(name: str):
+    """Download one profile, e.g. to render it with flamegraph.pl or speedscope."""
+    path = get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -1,16 +1,21 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
 from app.core.security import require_roles
 from app.db.database import get_session
 from app.core.deps import get_current_user, get_tenant_organization, get_accessible_shelter_ids, ensure_animal_access
-from app.schemas.models import User, AdoptionRequest, Animal, Organization
+from app.db.adoptions import reject_open_requests
+from app.schemas.enums import AdoptionStatus, RequestStatus
+from app.schemas.models import User, AdoptionRequest, Animal, Organization, utc_now
 from app.schemas.schema_AdoptionRequest import (
     AdoptionRequestCreate,
     AdoptionRequestRead,
     AdoptionRequestUpdate,
 )
+from app.core.streaming import StreamFormat, stream_query
+from app.core.config import settings
+from app.core.projection import parse_fields, partial_model, project, projected_response
 
 router = APIRouter()
 
@@ -34,6 +39,7 @@ def create_adoption_request(
         adopter_user_id= current_user.id,
         status=request_in.status,
         staff_notes=request_in.staff_notes,
+        decided_at=None if request_in.status == RequestStatus.submitted else utc_now(),
     )
     session.add(request)
     session.commit()
@@ -48,27 +54,40 @@ def create_adoption_request(
 def read_adoption_requests(
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        tenant_org: Organization = Depends(get_tenant_organization)
+        tenant_org: Organization = Depends(get_tenant_organization),
+        stream: StreamFormat | None = Query(None, description="Stream the full result as 'json' or 'ndjson'"),
+        fields: str | None = Query(None, description="Comma separated fields to return, e.g. 'id,name'")
 ):
     """Retrieve all adoption requests."""
     accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
     query = select(AdoptionRequest).join(Animal).where(Animal.shelter_id.in_(accessible_shelters))
+    names = parse_fields(fields, AdoptionRequestRead)
+    if stream:
+        return stream_query(project(query, AdoptionRequest, names).order_by(AdoptionRequest.id), partial_model(AdoptionRequestRead, names), stream)
+    if names or settings.FAST_JSON_RESPONSES:
+        return projected_response(session, query, AdoptionRequest, AdoptionRequestRead, names)
     requests = session.exec(query).all()
     return requests
 
 
+def _etag(request: AdoptionRequest) -> str:
+    return f'"{request.version}"'
+
+
 @router.get("/{request_id}", response_model=AdoptionRequestRead, dependencies=[Depends(require_roles('org_admin','staff'))])
 def read_adoption_request(
         request_id: int,
+        response: Response,
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user),
         tenant_org: Organization = Depends(get_tenant_organization)
 ):
     """Retrieve a single adoption request by ID."""
     request = session.get(AdoptionRequest, request_id)
-    ensure_animal_access(session, current_user, tenant_org, request.animal_id)
     if not request:
         raise HTTPException(status_code=404, detail="Adoption request not found.")
+    ensure_animal_access(session, current_user, tenant_org, request.animal_id)
+    response.headers["ETag"] = _etag(request)
     return request
 
 
@@ -76,32 +95,48 @@ def read_adoption_request(
 def update_adoption_request(
         request_id: int,
         request_in: AdoptionRequestUpdate,
+        response: Response,
+        if_match: str | None = Header(None, description="ETag of the version being edited, 412 if it changed since"),
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user),
         tenant_org: Organization = Depends(get_tenant_organization)
 ):
-    """Update an adoption request (staff/admin only)."""
+    """
+    Update an adoption request (staff/admin only). Approving marks the animal adopted and rejects
+    its other open requests; a concurrent approval for the same animal gets a 409.
+    """
     request_db = session.get(AdoptionRequest, request_id)
     if not request_db:
         raise HTTPException(status_code=404, detail="Adoption request not found.")
     ensure_animal_access(session, current_user, tenant_org, request_db.animal_id )
+    if if_match not in (None, "*") and if_match.removeprefix("W/") != _etag(request_db):
+        raise HTTPException(status_code=412, detail="Adoption request was modified, reload it and retry.")
     old_status = request_db.status
 
     update_data = request_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(request_db, key, value)
 
+    approved = False
     if "status" in update_data and update_data["status"] != old_status:
+        request_db.decided_at = None if update_data["status"] == RequestStatus.submitted else utc_now()
         animal_db = session.get(Animal, request_db.animal_id)
         if not animal_db:
             raise  HTTPException(status_code=404, detail="Animal not found")
         if update_data["status"] == 'Approved':
+            if animal_db.status == AdoptionStatus.adopted:
+                raise HTTPException(status_code=409, detail="Animal is already adopted.")
+            # the animal's version check makes a concurrent approval fail at flush (StaleDataError, 409)
             animal_db.status = animal_db.status.adopted
+            approved = True
         session.add(animal_db)
 
     session.add(request_db)
+    if approved:
+        reject_open_requests(session, animal_db, request_db.id)
     session.commit()
     session.refresh(request_db)
+    response.headers["ETag"] = _etag(request_db)
     return request_db
 
 
@@ -1,14 +1,31 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func
-from sqlalchemy import func, case
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, select
+from app.core.cache import analytics_cache, bump_generations
+from app.core.config import settings
 from app.core.deps import get_session, get_current_user, get_tenant_organization
 from app.core.security import require_roles
-from app.schemas.models import AdoptionRequest, Animal, Shelter, Organization, User
+from app.core.precompute import SNAPSHOTS, delete_snapshots, read_snapshot
+from app.db.cohorts import cohort_funnel
+from app.db.rollups import adoption_timeseries, rebuild_rollups, utc_today
+from app.db.shelter_stats import rebuild_shelter_stats
+from app.schemas.models import Shelter, Organization, User
 
 router = APIRouter()
 
 
+def _snapshot(session: Session, organization_id: int, name: str) -> dict:
+    """A precomputed snapshot (with its 'computed_at'), or the cached live result when snapshots are off."""
+    if settings.ANALYTICS_SNAPSHOTS:
+        return read_snapshot(session, organization_id, name)
+    return analytics_cache.get_or_compute(
+        organization_id, (name,), lambda s: SNAPSHOTS[name](s, organization_id), session
+    )
+
+
 @router.get("/", dependencies=[Depends(require_roles('org_admin'))])
 def get_basic_analytics(
         session: Session = Depends(get_session),
@@ -19,52 +36,75 @@ def get_basic_analytics(
     if current_user.role != 'org_admin':
         raise HTTPException(status_code=403, detail="unauthorized operation for non 'org_admin' role")
 
-    # Adoption success rate per shelter
-    adoption_success_query = (
-        select(
-            Shelter.name,
-            func.count(AdoptionRequest.id).label("total_requests"),
-            func.sum(
-                case(
-                    (AdoptionRequest.status == "Approved", 1),
-                    else_=0
-                )
-            ).label("approved_requests"),
-        ).where(Shelter.organization_id == tenant_org.id)
-        .join(Animal, Animal.shelter_id == Shelter.id)
-        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
-        .group_by(Shelter.id)
-    )
+    return _snapshot(session, tenant_org.id, "basic")
+
+
+@router.get("/timeseries", dependencies=[Depends(require_roles('org_admin'))])
+def get_adoption_timeseries(
+        interval: Literal["day", "week", "month"] = "month",
+        start: Optional[date] = Query(None, description="first request day (UTC), default one year before 'end'"),
+        end: Optional[date] = Query(None, description="last request day (UTC), default today"),
+        group_by: list[Literal["shelter", "species"]] = Query([]),
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Adoption request volume and success rate per week/month, optionally per shelter and/or species"""
+    end = end or utc_today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'start' is after 'end'")
+
+    organization_id = tenant_org.id
+    by_shelter, by_species = "shelter" in group_by, "species" in group_by
+
+    def compute(s: Session) -> dict:
+        series = adoption_timeseries(s, organization_id, interval, start, end, by_shelter, by_species)
+        # keep the days closed on the way and release the rollup state lock
+        s.commit()
+        if by_shelter:
+            names = dict(s.exec(select(Shelter.id, Shelter.name).where(Shelter.organization_id == organization_id)).all())
+            for entry in series:
+                entry["shelter_name"] = names.get(entry["shelter_id"])
+        return {"interval": interval, "start": start, "end": end, "series": series}
+
+    key = ("timeseries", interval, start, end, by_shelter, by_species)
+    return analytics_cache.get_or_compute(organization_id, key, compute, session)
 
-    success_results = session.exec(adoption_success_query).all()
-    success_rate_per_shelter = [
-        {
-            "shelter_name": s[0],
-            "total_requests": s[1],
-            "approved_requests": s[2],
-            "success_rate": round((s[2] / s[1]) * 100, 2) if s[1] else 0
-        }
-        for s in success_results
-    ]
-
-    # Top 3 adopted breeds
-    top_breeds_query = (
-        select(Animal.breed_name, func.count(AdoptionRequest.id))
-        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
-        .join(Shelter, Shelter.id == Animal.shelter_id)
-        .where( Shelter.organization_id == tenant_org.id )
-        .where(AdoptionRequest.status == "Approved")
-        .group_by(Animal.breed_name)
-        .order_by(func.count(AdoptionRequest.id).desc())
-        .limit(3)
+
+@router.get("/length-of-stay", dependencies=[Depends(require_roles('org_admin'))])
+def get_length_of_stay(
+        group_by: Optional[Literal["shelter", "species", "breed"]] = None,
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Days from intake to adoption (p50, p90, mean, histogram), overall or per shelter, species or breed"""
+    return _snapshot(session, tenant_org.id, f"length_of_stay:{group_by}" if group_by else "length_of_stay")
+
+
+@router.get("/cohorts", dependencies=[Depends(require_roles('org_admin'))])
+def get_cohort_funnel(
+        before: Optional[date] = Query(None, description="only cohorts of months before this date's month, 'next_before' of the previous page"),
+        limit: int = Query(12, ge=1, le=60, description="cohorts per page"),
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Adoption funnel per monthly intake cohort: requested, approved and waiting shares, median time to decision"""
+    organization_id = tenant_org.id
+    return analytics_cache.get_or_compute(
+        organization_id, ("cohorts", before, limit), lambda s: cohort_funnel(s, organization_id, before, limit), session
     )
 
-    top_breeds = [
-        {"breed": breed, "adopted_count": count}
-        for breed, count in session.exec(top_breeds_query).all()
-    ]
 
-    return {
-        "adoption_success_per_shelter": success_rate_per_shelter,
-        "top_adopted_breeds": top_breeds
-    }
+@router.post("/rebuild", dependencies=[Depends(require_roles('org_admin'))])
+def rebuild_analytics(
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Recompute the organization's shelter counters from scratch, drop its daily rollups and snapshots (reconciliation)."""
+    rebuild_shelter_stats(session, tenant_org.id)
+    rebuild_rollups(session, tenant_org.id)
+    delete_snapshots(session, tenant_org.id)
+    bump_generations(session, [tenant_org.id])
+    session.commit()
+    analytics_cache.invalidate(tenant_org.id)
+    return {"status": "rebuilt", "organization_id": tenant_org.id}
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session, select
 
 from app.db.database import get_session
@@ -8,6 +8,10 @@ from app.schemas.models import User, Animal, Organization, Staff, Shelter
 from app.core.security import require_roles
 from app.core.deps import get_accessible_shelter_ids
 from app.schemas.schema_animal import AnimalCreate, AnimalRead, AnimalUpdate
+from app.core.streaming import StreamFormat, stream_query
+from app.db.loading import ANIMAL_DELETE_CASCADE
+from app.core.config import settings
+from app.core.projection import parse_fields, partial_model, project, projected_response
 
 router = APIRouter()
 
@@ -55,11 +59,18 @@ def create_animal(
 def read_animals(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-    tenant_org: Organization = Depends(get_tenant_organization)
+    tenant_org: Organization = Depends(get_tenant_organization),
+    stream: StreamFormat | None = Query(None, description="Stream the full result as 'json' or 'ndjson'"),
+    fields: str | None = Query(None, description="Comma separated fields to return, e.g. 'id,name'")
 ):
     """Return all animals (visible to authorized users)."""
     accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
     query = select(Animal).where(Animal.shelter_id.in_(accessible_shelters))
+    names = parse_fields(fields, AnimalRead)
+    if stream:
+        return stream_query(project(query, Animal, names).order_by(Animal.id), partial_model(AnimalRead, names), stream)
+    if names or settings.FAST_JSON_RESPONSES:
+        return projected_response(session, query, Animal, AnimalRead, names)
     animals = session.exec(query).all()
     return animals
 
@@ -118,7 +129,7 @@ def delete_animal(
     tenant_org: Organization = Depends(get_tenant_organization)
 ):
     """Delete an animal record (admin only)."""
-    animal = session.get(Animal, animal_id)
+    animal = session.get(Animal, animal_id, options=ANIMAL_DELETE_CASCADE)
     if not animal:
         raise HTTPException(status_code=404, detail="Animal not found.")
     accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlmodel import Session, select
+
+from app.core import exports
+from app.core.deps import get_session, get_current_user, get_tenant_organization
+from app.core.security import require_roles
+from app.schemas.enums import ExportStatus
+from app.schemas.models import ExportJob, Organization, User
+from app.schemas.schema_export import ExportJobCreate, ExportJobRead
+
+router = APIRouter()
+
+
+def _read(job: ExportJob) -> ExportJobRead:
+    files = [
+        {"entity": entity, "size_bytes": size, "url": f"/api/internal/exports/{job.id}/files/{entity}"}
+        for entity, size in exports.export_files(job)
+    ]
+    return ExportJobRead.model_validate(job, update={"files": files})
+
+
+def _get_job(session: Session, job_id: int, tenant_org: Organization) -> ExportJob:
+    job = session.get(ExportJob, job_id)
+    if not job or job.organization_id != tenant_org.id:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.post("/", response_model=ExportJobRead, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_roles('org_admin'))])
+def create_export(
+        export_in: ExportJobCreate,
+        session: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Start a columnar export of the organization's animals, adoption requests, vaccinations and medical records."""
+    if exports.pa is None:
+        raise HTTPException(status_code=501, detail="Columnar exports need the optional 'pyarrow' package")
+    job = ExportJob(organization_id=tenant_org.id, requested_by_user_id=current_user.id,
+                    format=export_in.format, status=ExportStatus.queued)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    exports.submit_export(job.id)
+    return _read(job)
+
+
+@router.get("/", response_model=list[ExportJobRead], dependencies=[Depends(require_roles('org_admin'))])
+def list_exports(
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """List the organization's exports, newest first."""
+    jobs = session.exec(
+        select(ExportJob).where(ExportJob.organization_id == tenant_org.id).order_by(ExportJob.id.desc()).limit(50)
+    ).all()
+    return [_read(job) for job in jobs]
+
+
+@router.get("/{export_id}", response_model=ExportJobRead, dependencies=[Depends(require_roles('org_admin'))])
+def read_export(
+        export_id: int,
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Export status and, once completed, its files."""
+    return _read(_get_job(session, export_id, tenant_org))
+
+
+@router.get("/{export_id}/files/{entity}", dependencies=[Depends(require_roles('org_admin'))])
+def download_export_file(
+        export_id: int,
+        entity: str,
+        session: Session = Depends(get_session),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Download one exported file (served from disk in chunks)."""
+    job = _get_job(session, export_id, tenant_org)
+    if job.status != ExportStatus.completed or entity not in exports.EXPORT_ENTITIES:
+        raise HTTPException(status_code=404, detail="Export file not found")
+    path = exports.export_file(job, entity)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Export file not found")
+    return FileResponse(path, media_type=exports.MEDIA_TYPES[job.format], filename=path.name)
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session, select
 
 from app.db.database import get_session
@@ -8,6 +8,9 @@ from app.core.security import require_roles
 from app.schemas.models import User, MedicalRecord, Animal, Shelter, Staff, Organization
 from app.core.deps import get_accessible_shelter_ids, ensure_animal_access
 from app.schemas.schema_medicalRecord import MedicalRecordCreate, MedicalRecordRead, MedicalRecordUpdate
+from app.core.streaming import StreamFormat, stream_query
+from app.core.config import settings
+from app.core.projection import parse_fields, partial_model, project, projected_response
 
 router = APIRouter()
 
@@ -39,11 +42,18 @@ def create_medical_record(
 @router.get("/", response_model=List[MedicalRecordRead],dependencies=[Depends(require_roles("org_admin", "staff"))],
 )
 def read_medical_records(session: Session = Depends(get_session), current_user: User = Depends(get_current_user),tenant_org: Organization = Depends(get_tenant_organization),
+        stream: StreamFormat | None = Query(None, description="Stream the full result as 'json' or 'ndjson'"),
+        fields: str | None = Query(None, description="Comma separated fields to return, e.g. 'id,name'")
 ):
     """List all medical records accessible to the user."""
     accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
 
     query = select(MedicalRecord).join(Animal).where(Animal.shelter_id.in_(accessible_shelters))
+    names = parse_fields(fields, MedicalRecordRead)
+    if stream:
+        return stream_query(project(query, MedicalRecord, names).order_by(MedicalRecord.id), partial_model(MedicalRecordRead, names), stream)
+    if names or settings.FAST_JSON_RESPONSES:
+        return projected_response(session, query, MedicalRecord, MedicalRecordRead, names)
     return session.exec(query).all()
 
 # READ ONE
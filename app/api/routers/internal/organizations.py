@@ -6,6 +6,7 @@ from app.schemas.schema_organization import OrganizationCreate, OrganizationRead
 from app.db.database import get_session
 from app.core.deps import get_current_user
 from app.schemas.models import User, Organization
+from app.db.loading import ORGANIZATION_DELETE_CASCADE
 
 router = APIRouter()
 # TODO: Restrict this endpoint to admin users only
@@ -76,7 +77,7 @@ def delete_organization(
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user)
 ):
-    org_db = session.get(Organization, organization_id)
+    org_db = session.get(Organization, organization_id, options=ORGANIZATION_DELETE_CASCADE)
     if not org_db:
         raise HTTPException(status_code=404, detail="Organization not found")
     session.delete(org_db)
@@ -5,7 +5,8 @@ from sqlmodel import Session, select
 from app.core.security import require_roles
 from app.db.database import get_session
 from app.core.deps import get_current_user, get_tenant_organization
-from app.schemas.models import User, Shelter, Organization
+from app.schemas.models import User, Shelter, Organization, Staff
+from app.db.loading import SHELTER_DELETE_CASCADE
 from app.schemas.schema_shelter import ShelterCreate, ShelterRead, ShelterUpdate
 
 router = APIRouter()
@@ -45,7 +46,7 @@ def read_shelters(
     query = select(Shelter).where(Shelter.organization_id == tenant_org.id)
     #staff can only see their own shelter
     if current_user.role == 'staff':
-        query = query.join(Shelter.staff_memberships).where(Shelter.staff_memberships.any(user_id= current_user.id))
+        query = query.where(Shelter.staff_memberships.any(user_id= current_user.id))
 
     shelters = session.exec(query).all()
     return shelters
@@ -63,7 +64,9 @@ def read_shelter(
         raise HTTPException(status_code=404, detail="Shelter not found.")
     # If user is staff, ensure they belong to this shelter
     if current_user.role == 'staff':
-        is_staff_member = any(member.user_id == current_user.id for member in shelter.staff_memberships)
+        is_staff_member = session.exec(
+            select(Staff.id).where(Staff.shelter_id == shelter.id, Staff.user_id == current_user.id)
+        ).first()
         if not is_staff_member:
             raise HTTPException(status_code=403, detail="Access forbidden")
 
@@ -99,7 +102,7 @@ def delete_shelter(
     current_user: User = Depends(get_current_user),
     tenant_org: Organization = Depends(get_tenant_organization)
 ):
-    shelter = session.get(Shelter, shelter_id)
+    shelter = session.get(Shelter, shelter_id, options=SHELTER_DELETE_CASCADE)
     if not shelter or shelter.organization_id != tenant_org.id:
         raise HTTPException(status_code=404, detail="Shelter not found.")
 
@@ -8,6 +8,7 @@ from app.schemas.schema_staff import StaffRead, StaffCreate, StaffUpdate
 from app.core.security import require_roles
 from app.core.deps import get_tenant_organization, get_current_user
 from app.db.database import get_session
+from app.db.loading import STAFF_WITH_SHELTER
 
 router = APIRouter()
 
@@ -65,7 +66,7 @@ def read_staff(staff_id: int,
                tenant_org: Organization = Depends(get_tenant_organization),
                current_user: User = Depends(get_current_user)
                ):
-    staff = session.get(Staff, staff_id)
+    staff = session.get(Staff, staff_id, options=STAFF_WITH_SHELTER)
     if not staff:
         raise HTTPException(status_code=404, detail="Staff not found")
     # check org ownership
@@ -104,7 +105,7 @@ def delete_staff(
         current_user: User = Depends(get_current_user),
         tenant_org: Organization = Depends(get_tenant_organization)
 ):
-    staff_db = session.get(Staff, staff_id)
+    staff_db = session.get(Staff, staff_id, options=STAFF_WITH_SHELTER)
     if not staff_db:
         raise HTTPException(status_code=404, detail="Staff not found")
     if staff_db.shelter.organization_id != tenant_org.id:
@@ -0,0 +1,120 @@
+import base64
+import heapq
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_, true
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.deps import get_current_user, get_tenant_organization, get_accessible_shelter_ids
+from app.core.security import require_roles
+from app.db.database import get_session
+from app.schemas.models import User, Organization, Animal, MedicalRecord, Vaccination, Tombstone
+from app.schemas.schema_animal import AnimalRead
+from app.schemas.schema_medicalRecord import MedicalRecordRead
+from app.schemas.schema_vaccination import VaccinationRead
+
+router = APIRouter()
+
+# (entity, model, read schema) in feed order, the position is the tie breaker for equal timestamps
+SYNC_SOURCES = [
+    ("animal", Animal, AnimalRead),
+    ("medical_record", MedicalRecord, MedicalRecordRead),
+    ("vaccination", Vaccination, VaccinationRead),
+]
+TOMBSTONE_RANK = len(SYNC_SOURCES)
+
+
+def encode_token(ts: datetime, rank: int, row_id: int) -> str:
+    payload = json.dumps({"ts": ts.isoformat(), "rank": rank, "id": row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_token(token: str) -> tuple[datetime, int, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return datetime.fromisoformat(payload["ts"]), int(payload["rank"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def after_cursor(ts_col, id_col, rank: int, cursor):
+    """Keyset condition for (ts, rank, id) > cursor, 'rank' being constant for one source."""
+    if cursor is None:
+        return true()
+    cursor_ts, cursor_rank, cursor_id = cursor
+    if rank > cursor_rank:
+        return ts_col >= cursor_ts
+    if rank == cursor_rank:
+        return or_(ts_col > cursor_ts, and_(ts_col == cursor_ts, id_col > cursor_id))
+    return ts_col > cursor_ts
+
+
+@router.get("/", dependencies=[Depends(require_roles('org_admin', 'staff'))])
+def sync_changes(
+        since: str | None = Query(None, description="Token returned by the previous sync, omit for a full sync"),
+        limit: int = Query(500, ge=1, le=5000),
+        session: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """
+    Return animals, medical records and vaccinations changed after 'since', plus tombstones
+    for deleted rows, as one feed ordered by change time. Keep calling with 'next_token'
+    while 'has_more' is true.
+    """
+    cursor = decode_token(since) if since else None
+    accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
+    # updated_at is assigned at flush: a row stamped before the cursor can still be committed by a request
+    # running until its deadline, so the feed stops short of the longest a write transaction can stay open
+    lag = max(settings.SYNC_SAFETY_LAG_SECONDS, settings.REQUEST_TIMEOUT_SECONDS)
+    upper_bound = datetime.now(timezone.utc) - timedelta(seconds=lag)
+
+    pages = []
+    for rank, (entity, model, read_model) in enumerate(SYNC_SOURCES):
+        query = select(model)
+        if model is not Animal:
+            query = query.join(Animal)
+        query = (
+            query.where(Animal.shelter_id.in_(accessible_shelters))
+            .where(model.updated_at <= upper_bound)
+            .where(after_cursor(model.updated_at, model.id, rank, cursor))
+            .order_by(model.updated_at, model.id)
+            .limit(limit + 1)
+        )
+        pages.append([
+            (row.updated_at, rank, row.id,
+             {"entity": entity, "op": "upsert", "id": row.id, "updated_at": row.updated_at,
+              "data": read_model.model_validate(row)})
+            for row in session.exec(query).all()
+        ])
+
+    tombstones = select(Tombstone).where(Tombstone.organization_id == tenant_org.id)
+    if current_user.role == "staff":
+        tombstones = tombstones.where(Tombstone.shelter_id.in_(accessible_shelters))
+    tombstones = (
+        tombstones.where(Tombstone.deleted_at <= upper_bound)
+        .where(after_cursor(Tombstone.deleted_at, Tombstone.id, TOMBSTONE_RANK, cursor))
+        .order_by(Tombstone.deleted_at, Tombstone.id)
+        .limit(limit + 1)
+    )
+    pages.append([
+        (t.deleted_at, TOMBSTONE_RANK, t.id,
+         {"entity": t.entity, "op": "delete", "id": t.entity_id, "updated_at": t.deleted_at, "data": None})
+        for t in session.exec(tombstones).all()
+    ])
+
+    merged = list(heapq.merge(*pages, key=lambda item: item[:3]))
+    page = merged[:limit]
+    if page:
+        last_ts, last_rank, last_id, _ = page[-1]
+        next_token = encode_token(last_ts, last_rank, last_id)
+    else:
+        next_token = since
+    return {
+        "changes": [item[3] for item in page],
+        "next_token": next_token,
+        "has_more": len(merged) > limit,
+    }
@@ -6,6 +6,7 @@ from app.db.database import  get_session
 from app.core.deps import get_current_user
 from app.schemas.schema_user import UserCreate, UserRead, UserUpdate
 from app.core.security import get_password_hash
+from app.db.loading import USER_DELETE_CASCADE
 
 router = APIRouter()
 #create user signup
@@ -80,7 +81,7 @@ def delete_user(
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user)
 ):
-    user_db = session.get(User, user_id)
+    user_db = session.get(User, user_id, options=USER_DELETE_CASCADE)
     if not user_db:
         raise HTTPException(status_code=404, detail="user not found")
 
@@ -1,6 +1,6 @@
 from http.client import HTTPException
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.params import Depends
 from sqlmodel import Session, select
 
@@ -8,7 +8,12 @@ from app.core.security import require_roles
 from app.db.database import get_session
 from app.schemas.models import User, Organization,Vaccination, Animal
 from app.core.deps import get_accessible_shelter_ids, get_current_user, get_tenant_organization
-from app.schemas.schema_vaccination import VaccinationRead, VaccinationCreate, VaccinationUpdate
+from app.schemas.schema_vaccination import VaccinationRead, VaccinationCreate, VaccinationUpdate, VaccinationDueReport
+from app.core.streaming import StreamFormat, stream_query
+from app.core.config import settings
+from app.core.projection import parse_fields, partial_model, project, projected_response
+from app.db.rollups import utc_today
+from app.db.vaccination_due import due_vaccinations
 
 router = APIRouter()
 
@@ -48,13 +53,51 @@ def create_vaccination(
 def list_vaccination(
         session: Session = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        tenant_org: Organization = Depends(get_tenant_organization)
+        tenant_org: Organization = Depends(get_tenant_organization),
+        stream: StreamFormat | None = Query(None, description="Stream the full result as 'json' or 'ndjson'"),
+        fields: str | None = Query(None, description="Comma separated fields to return, e.g. 'id,name'")
 ):
     """List vaccination records """
     accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
     query = select(Vaccination).join(Animal).where(Animal.shelter_id.in_(accessible_shelters))
+    names = parse_fields(fields, VaccinationRead)
+    if stream:
+        return stream_query(project(query, Vaccination, names).order_by(Vaccination.id), partial_model(VaccinationRead, names), stream)
+    if names or settings.FAST_JSON_RESPONSES:
+        return projected_response(session, query, Vaccination, VaccinationRead, names)
     return session.exec(query).all()
 
+@router.get('/due', response_model=VaccinationDueReport, dependencies=[Depends(require_roles('org_admin','staff'))])
+def list_due_vaccinations(
+        within_days: int = Query(settings.VACCINATION_DUE_DAYS, ge=0, le=365, description="Look-ahead in days"),
+        session: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        tenant_org: Organization = Depends(get_tenant_organization)
+):
+    """Overdue vaccinations and those expiring within 'within_days', per accessible shelter (latest per vaccine type)"""
+    accessible_shelters = get_accessible_shelter_ids(session, current_user, tenant_org)
+    today = utc_today()
+    rows, precomputed = due_vaccinations(session, accessible_shelters, today, within_days)
+
+    shelters = {}
+    for shelter_id, vaccination_id, animal_id, animal_name, vaccine_type, vaccination_date, valid_until in rows:
+        shelters.setdefault(shelter_id, []).append({
+            "vaccination_id": vaccination_id,
+            "animal_id": animal_id,
+            "animal_name": animal_name,
+            "vaccine_type": vaccine_type,
+            "vaccination_date": vaccination_date,
+            "valid_until": valid_until,
+            "days_left": (valid_until - today).days,
+            "status": "overdue" if valid_until < today else "due",
+        })
+    return {
+        "as_of": today,
+        "within_days": within_days,
+        "precomputed": precomputed,
+        "shelters": [{"shelter_id": shelter_id, "vaccinations": items} for shelter_id, items in shelters.items()],
+    }
+
 @router.get('/{vaccination_id}', response_model=VaccinationRead, dependencies=[Depends(require_roles('org_admin','staff'))])
 def read_vaccination(
         vaccination_id: int,
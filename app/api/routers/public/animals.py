@@ -6,7 +6,10 @@ from sqlmodel import Session, select
 from app.schemas.schema_animal import AnimalRead
 from app.schemas.models import Animal, Vaccination, MedicalRecord
 from app.core.deps import get_session
+from app.core.config import settings
+from app.core.projection import parse_fields, projected_response
 from app.schemas.schema_animal import AnimalPublicProfile
+from app.db.loading import ANIMAL_WITH_SHELTER
 
 
 router = APIRouter()
@@ -33,6 +36,7 @@ def list_public_animals(
         sterilized: bool | None = Query(None),
         skip: int = 0,
         limit: int = 10,
+        fields: str | None = Query(None, description="Comma separated fields to return, e.g. 'id,name'"),
 ):
     """publicly accessible list of animals with search & pagination """
     query  = select(Animal).where(Animal.status == 'Available')
@@ -43,6 +47,9 @@ def list_public_animals(
     elif sterilized:
         query = query.where(Animal.is_neutered == sterilized )
     query = query.offset(skip).limit(limit)
+    names = parse_fields(fields, AnimalRead)
+    if names or settings.FAST_JSON_RESPONSES:
+        return projected_response(session, query, Animal, AnimalRead, names)
     return session.exec(query).all()
 
 @router.get('/{animal_id}', response_model=AnimalPublicProfile)
@@ -50,11 +57,10 @@ def read_animal_profile(
         animal_id: int,
         session: Session = Depends(get_session)
 ):
-    animal = session.get(Animal, animal_id)
+    # shelter is joined in, the latest vaccinations/records are queried below with a limit
+    animal = session.get(Animal, animal_id, options=ANIMAL_WITH_SHELTER)
     if not animal:
         raise HTTPException(status_code=404, detail="Animal not found")
-        # Load related data
-    session.refresh(animal, attribute_names=["shelter", "medical_records", "vaccinations"])
 
     vaccinations_db = session.exec(select(Vaccination).where(Vaccination.animal_id == animal_id).order_by(Vaccination.vaccination_date.desc()).limit(5)).all()
     medicalrecords_db = session.exec(select(MedicalRecord).where(MedicalRecord.animal_id == animal_id).order_by(MedicalRecord.exam_date.desc()).limit(2)).all()
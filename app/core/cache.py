@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.db.upsert import dialect_insert
+from app.schemas.models import AnalyticsGeneration
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = Counter(
+    "pawbase_analytics_cache_requests_total", "Analytics cache lookups by result (hit, stale, miss).", ("result",))
+
+
+def read_generation(session: Session, organization_id: int) -> int:
+    return session.execute(
+        select(AnalyticsGeneration.generation).where(AnalyticsGeneration.organization_id == organization_id)
+    ).scalar() or 0
+
+
+def bump_generations(session: Session, organization_ids):
+    """Invalidate the organizations' cached results in every process once the writing transaction commits."""
+    # a fixed order keeps two transactions bumping the same organizations from deadlocking
+    for organization_id in sorted(organization_ids):
+        stmt = dialect_insert(session, AnalyticsGeneration).values(organization_id=organization_id, generation=1)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["organization_id"], set_={"generation": AnalyticsGeneration.generation + 1}))
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "generation")
+
+    def __init__(self, value, ttl: float, generation: tuple):
+        self.value = value
+        self.expires_at = time.monotonic() + ttl
+        self.generation = generation
+
+
+class ResultCache:
+    """
+    Per-process cache of computed results, keyed by organization id and a parameter key.
+
+    A write to an organization bumps its generation, which makes all of its entries stale: the
+    local one at once, and with 'shared_generation' the entries of the other worker processes
+    too, once they read it again (at most every 'shared_generation_ttl' seconds per organization). Stale entries (invalidated or past the TTL)
+    are still served while one background recomputation runs; a missing entry is computed by
+    the first caller and concurrent callers for the same key wait for that result instead of
+    running the queries again (single flight).
+    """
+
+    def __init__(self, ttl: float, max_entries: int, workers: int = 2,
+                 shared_generation: Callable[[Session, int], int] | None = None, shared_generation_ttl: float = 0.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_generation = shared_generation
+        self.shared_generation_ttl = shared_generation_ttl
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        # organization id -> (shared generation, monotonic time it is re-read after)
+        self._shared: dict[int, tuple[int, float]] = {}
+        self._in_flight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cache-refresh")
+
+    def invalidate(self, organization_id: int):
+        with self._lock:
+            self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+            # this process wrote: its bump of the shared generation is committed, read it again
+            self._shared.pop(organization_id, None)
+
+    def _generation(self, session: Session, organization_id: int) -> tuple:
+        return self._local_generation(organization_id), self._shared_generation(session, organization_id)
+
+    def _local_generation(self, organization_id: int) -> int:
+        with self._lock:
+            return self._generations.get(organization_id, 0)
+
+    def _shared_generation(self, session: Session, organization_id: int) -> int:
+        if self.shared_generation is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            shared, read_after = self._shared.get(organization_id, (0, now))
+        if read_after > now:
+            return shared
+        shared = self.shared_generation(session, organization_id)
+        with self._lock:
+            self._shared[organization_id] = (shared, now + self.shared_generation_ttl)
+        return shared
+
+    def in_flight(self, key: Hashable) -> Future | None:
+        """The pending single_flight() computation of key, if any."""
+        with self._lock:
+            return self._in_flight.get(("single_flight", key))
+
+    def single_flight(self, key: Hashable, compute: Callable[[], object]):
+        """
+        compute(), unless the same key is being computed already: then wait for that result instead.
+        Nothing is cached, for results stored elsewhere (analytics snapshots).
+        """
+        flight_key = ("single_flight", key)
+        with self._lock:
+            waiting = self._in_flight.get(flight_key)
+            if waiting is None:
+                future = self._in_flight[flight_key] = Future()
+        if waiting is not None:
+            return waiting.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight.pop(flight_key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._in_flight.pop(flight_key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._shared.clear()
+
+    def get_or_compute(self, organization_id: int, key: Hashable, compute: Callable[[Session], object], session: Session):
+        """
+        Cached result of compute(session) for (organization_id, key). Background refreshes run
+        compute with a session of their own, so it must not depend on the caller's session state.
+        """
+        if self.ttl <= 0:
+            return compute(session)
+        cache_key = (organization_id, key)
+        generation = self._generation(session, organization_id)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                if entry.generation == generation and entry.expires_at > time.monotonic():
+                    CACHE_REQUESTS.inc("hit")
+                    return entry.value
+                CACHE_REQUESTS.inc("stale")
+                if cache_key not in self._in_flight:
+                    future = self._in_flight[cache_key] = Future()
+                    self._executor.submit(self._refresh, cache_key, compute, future)
+                return entry.value
+            CACHE_REQUESTS.inc("miss")
+            waiting = self._in_flight.get(cache_key)
+            if waiting is None:
+                future = self._in_flight[cache_key] = Future()
+        if waiting is not None:
+            return waiting.result()
+        return self._compute(cache_key, compute, future, session)
+
+    def _compute(self, cache_key: tuple, compute, future: Future, session: Session):
+        try:
+            # read the generation before computing: a write landing meanwhile leaves the result stale
+            generation = self._generation(session, cache_key[0])
+            value = compute(session)
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._entries[cache_key] = _Entry(value, self.ttl, generation)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._in_flight.pop(cache_key, None)
+        future.set_result(value)
+        return value
+
+    def _refresh(self, cache_key: tuple, compute, future: Future):
+        from app.db.database import engine
+
+        try:
+            with Session(engine) as session:
+                self._compute(cache_key, compute, future, session)
+        except Exception:
+            logger.exception("Analytics cache refresh failed", extra={"organization_id": cache_key[0]})
+
+
+analytics_cache = ResultCache(settings.ANALYTICS_CACHE_TTL_SECONDS, settings.ANALYTICS_CACHE_MAX_ENTRIES,
+                              shared_generation=read_generation,
+                              shared_generation_ttl=settings.ANALYTICS_CACHE_GENERATION_POLL_SECONDS)
@@ -0,0 +1,173 @@
+import gzip
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import collectors
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only
+    brotli = None
+
+# bodies of these types are already compressed, compressing again only burns CPU
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "application/x-gzip")
+
+
+class CompressionStats:
+    """Process wide counters for the compression middleware."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def record(self, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.cpu_seconds += cpu_seconds
+
+    def record_skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "compressed_responses": self.compressed,
+                "skipped_responses": self.skipped,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "cpu_seconds": round(self.cpu_seconds, 6),
+            }
+
+
+compression_stats = CompressionStats()
+
+
+def compression_metrics() -> list[str]:
+    stats = compression_stats.snapshot()
+    lines = []
+    for key, name in (("bytes_in", "input_bytes"), ("bytes_out", "output_bytes"), ("cpu_seconds", "cpu_seconds"),
+                      ("compressed_responses", "responses")):
+        lines.append(f"# TYPE pawbase_compression_{name}_total counter")
+        lines.append(f"pawbase_compression_{name}_total {stats[key]}")
+    return lines
+
+
+collectors.append(compression_metrics)
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def choose_encoding(accept_encoding: str, use_brotli: bool) -> str | None:
+    """The accepted coding with the highest q-value, brotli first on ties; q=0 refuses a coding, '*' covers unlisted ones."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if coding:
+            qualities[coding] = _quality(params)
+    candidates = ("br", "gzip") if use_brotli and brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress single-body responses with brotli (when installed and accepted) or gzip.
+    Responses below 'minimum_size', already encoded or compressed content types and
+    streaming bodies are passed through untouched. Bodies of 'threadpool_size' bytes or more
+    are compressed in the threadpool so they don't block the event loop.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, use_brotli: bool = True, threadpool_size: int = 65536):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.threadpool_size = threadpool_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.use_brotli = use_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.use_brotli)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if self._should_skip(headers, body, message.get("more_body", False)):
+                compression_stats.record_skip()
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= self.threadpool_size:
+                compressed = await run_in_threadpool(self._compress, body, encoding)
+            else:
+                compressed = self._compress(body, encoding)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_skip(self, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if more_body:
+            # streaming response (e.g. ?stream=ndjson), chunks are sent as they come
+            return True
+        if "content-encoding" in headers or len(body) < self.minimum_size:
+            return True
+        return headers.get("content-type", "").startswith(SKIP_CONTENT_TYPES)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        started = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level)
+        compression_stats.record(len(body), len(compressed), time.thread_time() - started)
+        return compressed
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,6 +11,118 @@ class Settings(BaseSettings):
     # tokenUrl used by OAuth2 docs UI; match the router you will use
     TOKEN_URL: str = "/api/internal/auth/login"
 
+    # streaming exports: rows fetched per server-side cursor batch and bytes per written chunk
+    STREAM_BATCH_SIZE: int = 1000
+    STREAM_CHUNK_BYTES: int = 64 * 1024
+
+    # list endpoints build rows straight from selected columns and skip response_model validation
+    FAST_JSON_RESPONSES: bool = False
+
+    # response compression (brotli is used only when the package is installed); bodies of
+    # COMPRESSION_THREADPOOL_SIZE bytes or more are compressed off the event loop
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI: bool = True
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_THREADPOOL_SIZE: int = 65536
+
+    # delta sync skips changes younger than this: updated_at is set at flush, and the transaction may commit up
+    # to a request deadline later; never lower than REQUEST_TIMEOUT_SECONDS, raise it for longer running jobs
+    SYNC_SAFETY_LAG_SECONDS: int = 35
+
+    # raise on implicit relationship lazy loads instead of querying (enable in tests)
+    STRICT_LAZY_LOADING: bool = False
+
+    # identical statements repeated this many times in one request are reported as a likely N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # /api/internal/admin diagnostics (SQL, compression, profiles) span all tenants: they need an
+    # X-Operator-Token header matching OPERATOR_TOKEN, and are disabled while it is unset
+    OPERATOR_TOKEN: str | None = None
+
+    # on-demand profiling: a sampled fraction of requests, or requests sending PROFILING_HEADER=PROFILING_TOKEN
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "X-Debug-Profile"
+    PROFILING_TOKEN: str | None = None
+    PROFILING_INTERVAL_MS: float = 2.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 200
+
+    # structured logging: "json" or "text" lines written to stdout by a background thread
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000
+    # fraction of noisy records kept (successful request logs, SQL echo); errors and slow requests are always logged
+    LOG_SAMPLE_RATE: float = 0.1
+    LOG_SLOW_REQUEST_MS: float = 1000.0
+    # log every SQL statement (sampled like other noisy records)
+    SQL_ECHO: bool = False
+
+    # tracing: fraction of requests traced, exporter ("file", "log" or "package.module:Class") and its file
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_EXPORTER: str = "file"
+    TRACE_FILE: str = "traces.jsonl"
+
+    # per-request deadline, applied to PostgreSQL as a statement_timeout (0 disables)
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    # load shedding: requests in flight (running or queued) before new ones get 503 + Retry-After,
+    # public routes are shed at PUBLIC_SHED_FRACTION of the limit (0 disables shedding)
+    MAX_IN_FLIGHT_REQUESTS: int = 200
+    PUBLIC_SHED_FRACTION: float = 0.8
+    SHED_RETRY_AFTER_SECONDS: int = 1
+
+    # schema handling at startup: "create_all" (development), "verify" (fail unless the database is at
+    # the Alembic head revision, one query instead of reflecting every table) or "skip"
+    DB_STARTUP_MODE: Literal["create_all", "verify", "skip"] = "create_all"
+    # open pool connections and build lazy caches in a background thread once the app is up
+    STARTUP_WARMUP: bool = True
+
+    # analytics results cached per organization and parameters (0 disables); entries past the TTL or
+    # invalidated by a write are served stale while a single background recomputation runs
+    ANALYTICS_CACHE_TTL_SECONDS: float = 30.0
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 1000
+    # writes in other worker processes are noticed within this many seconds (their generation is re-read)
+    ANALYTICS_CACHE_GENERATION_POLL_SECONDS: float = 1.0
+    # a day's requests are rolled up this long after UTC midnight: requests stamped before midnight
+    # by transactions still open at midnight (up to a request deadline) have committed by then
+    ROLLUP_CLOSE_LAG_SECONDS: int = 35
+
+    # vaccination due report: default look-ahead in days, also the horizon of the precomputed daily list
+    VACCINATION_DUE_DAYS: int = 30
+
+    # columnar exports (needs the optional pyarrow package): output directory, rows per row group / record
+    # batch (bounds export memory) and exports running at once; a running job touches its heartbeat every
+    # EXPORT_HEARTBEAT_SECONDS and is failed once it is EXPORT_STALE_SECONDS old (its process died),
+    # finished jobs and their files are deleted after the retention
+    EXPORT_DIR: str = "exports"
+    EXPORT_BATCH_SIZE: int = 10000
+    EXPORT_WORKERS: int = 1
+    EXPORT_HEARTBEAT_SECONDS: float = 30.0
+    EXPORT_STALE_SECONDS: float = 300.0
+    EXPORT_RETENTION_DAYS: int = 7
+
+    # analytics endpoints serve snapshots precomputed by a background worker. The worker refreshes snapshots
+    # that writes marked dirty (checked every PRECOMPUTE_POLL_SECONDS) or older than PRECOMPUTE_INTERVAL_SECONDS,
+    # in a thread or in PRECOMPUTE_PROCESSES worker processes. Run it in one process only: as its own process
+    # (python -m scripts.precompute_worker), or PRECOMPUTE_WORKER=true on a single API process. Without it,
+    # reads recompute dirty snapshots inline
+    ANALYTICS_SNAPSHOTS: bool = True
+    PRECOMPUTE_WORKER: bool = False
+    PRECOMPUTE_INTERVAL_SECONDS: float = 300.0
+    PRECOMPUTE_POLL_SECONDS: float = 5.0
+    PRECOMPUTE_PROCESSES: int = 0
+    # daily jobs (vaccination due list, expired idempotency keys, export retention and stale exports): every
+    # API process checks for them, the first to claim the UTC day in the database runs them
+    DAILY_JOBS: bool = True
+
+    # POSTs creating animals, adoption requests, vaccinations and medical records honour an Idempotency-Key header:
+    # the response is stored for IDEMPOTENCY_TTL_SECONDS and replayed to retries; a first request that has not
+    # finished after IDEMPOTENCY_LOCK_SECONDS is considered abandoned and its key can be reused
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+
     class Config:
         env_file = ".env"
 
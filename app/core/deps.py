@@ -1,16 +1,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from jose.exceptions import JWTError
 from typing import List
 from sqlmodel import Session, select
 from app.core.config import settings
 from app.core.jwt import decode_access_token
+from app.core.tracing import traced
 from app.db.database import get_session
 from app.schemas.models import User, Organization, Staff, Shelter, Animal
 from app.schemas.schema_auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=settings.TOKEN_URL)
 
+@traced()
 def get_current_user(token:str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
     """
     Dependency that returns the current authenticated User SQLModel object .
@@ -36,6 +38,7 @@ def get_current_user(token:str = Depends(oauth2_scheme), session: Session = Depe
     return user
 
 #filter tenant
+@traced()
 def get_tenant_organization(current_user: User = Depends(get_current_user) ,
                             session: Session = Depends(get_session)) -> Organization:
     # Organization admin -> directly linked to org
@@ -51,6 +54,7 @@ def get_tenant_organization(current_user: User = Depends(get_current_user) ,
 
     raise HTTPException(status_code=403, detail="User not linked to any organization")
 
+@traced()
 def get_accessible_shelter_ids(
 session: Session,
 current_user: User,
@@ -71,6 +75,7 @@ tenant_org: Organization,
 
     raise HTTPException(status_code=403, detail="User not authorized")
 
+@traced()
 def ensure_animal_access(
         session: Session,
         current_user: User,
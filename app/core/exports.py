@@ -0,0 +1,256 @@
+import logging
+import os
+import shutil
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.types import TypeDecorator
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.database import engine
+from app.schemas.enums import ExportStatus
+from app.schemas.models import AdoptionRequest, Animal, ExportJob, MedicalRecord, Shelter, Vaccination
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, exports are unavailable without it
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# exported entities: file name -> model; animals are filtered by shelter, the rest through their animal
+EXPORT_ENTITIES = {
+    "animals": Animal,
+    "adoption_requests": AdoptionRequest,
+    "vaccinations": Vaccination,
+    "medical_records": MedicalRecord,
+}
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+
+_executor = ThreadPoolExecutor(max_workers=settings.EXPORT_WORKERS, thread_name_prefix="export")
+# recorded on the jobs this process runs
+EXPORT_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def export_dir(job: ExportJob) -> Path:
+    return Path(settings.EXPORT_DIR) / str(job.organization_id) / str(job.id)
+
+
+def export_file(job: ExportJob, entity: str) -> Path:
+    return export_dir(job) / f"{entity}.{FILE_EXTENSIONS[job.format]}"
+
+
+def _arrow_type(column):
+    # SQLModel wraps strings and datetimes in type decorators; enums are str subclasses
+    sa_type = column.type.impl_instance if isinstance(column.type, TypeDecorator) else column.type
+    python_type = sa_type.python_type
+    for kind, arrow_type in (
+        (bool, pa.bool_()),
+        (int, pa.int64()),
+        (float, pa.float64()),
+        (datetime, pa.timestamp("us", tz="UTC")),
+        (date, pa.date32()),
+    ):
+        if issubclass(python_type, kind) and not issubclass(python_type, Enum):
+            return arrow_type
+    return pa.string()
+
+
+def _entity_query(model, organization_id: int):
+    shelters = select(Shelter.id).where(Shelter.organization_id == organization_id)
+    query = select(*model.__table__.columns)
+    if model is Animal:
+        query = query.where(Animal.shelter_id.in_(shelters))
+    else:
+        query = query.join(Animal, Animal.id == model.animal_id).where(Animal.shelter_id.in_(shelters))
+    return query.order_by(model.id)
+
+
+def _record_batch(schema, rows):
+    columns = []
+    for values, field in zip(zip(*rows), schema):
+        if pa.types.is_string(field.type):
+            values = [v.value if isinstance(v, Enum) else v for v in values]
+        columns.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_entity(session: Session, job: ExportJob, entity: str) -> int:
+    """
+    Stream one entity of the organization into its file: rows come from a server-side cursor
+    EXPORT_BATCH_SIZE at a time and every batch becomes one Parquet row group / Arrow record
+    batch, so memory is bounded by the batch size. Written to a temporary name, then renamed.
+    """
+    model = EXPORT_ENTITIES[entity]
+    schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in model.__table__.columns])
+    path = export_file(job, entity)
+    partial = path.with_suffix(path.suffix + ".partial")
+    if job.format == "parquet":
+        writer = pq.ParquetWriter(partial, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(partial, schema)
+    rows = 0
+    try:
+        result = session.execute(
+            _entity_query(model, job.organization_id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            writer.write_batch(_record_batch(schema, partition))
+            rows += len(partition)
+    finally:
+        writer.close()
+    os.replace(partial, path)
+    return rows
+
+
+class Heartbeat:
+    """
+    Touch a running job's heartbeat_at every EXPORT_HEARTBEAT_SECONDS from a thread and a session
+    of its own (the export's session is busy streaming), until the export is done.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"export-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self):
+        while not self.stopped.wait(settings.EXPORT_HEARTBEAT_SECONDS):
+            try:
+                with Session(engine) as session:
+                    session.execute(
+                        update(ExportJob)
+                        .where(ExportJob.id == self.job_id, ExportJob.owner == EXPORT_OWNER,
+                               ExportJob.status == ExportStatus.running)
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    session.commit()
+            except Exception:
+                logger.exception("Export heartbeat failed", extra={"export_id": self.job_id})
+
+
+def run_export(job_id: int):
+    """Export job body, run on the export pool with its own session (no request deadline applies)."""
+    with Session(engine) as session:
+        # claim the job: a queued job requeued by several restarting processes runs once
+        claimed = session.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == ExportStatus.queued)
+            .values(status=ExportStatus.running, owner=EXPORT_OWNER, heartbeat_at=datetime.now(timezone.utc))
+        ).rowcount
+        session.commit()
+        if not claimed:
+            return
+        job = session.get(ExportJob, job_id)
+        directory = export_dir(job)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with Heartbeat(job_id):
+                rows = sum(write_entity(session, job, entity) for entity in EXPORT_ENTITIES)
+        except Exception as exc:
+            logger.exception("Export failed", extra={"export_id": job_id})
+            session.rollback()
+            shutil.rmtree(directory, ignore_errors=True)
+            job.status, job.error = ExportStatus.failed, repr(exc)
+        else:
+            session.refresh(job)
+            if job.status != ExportStatus.running:
+                # failed as stale meanwhile (heartbeats missed), its files are no longer listed
+                logger.warning("Export finished after it was failed", extra={"export_id": job_id})
+                shutil.rmtree(directory, ignore_errors=True)
+                return
+            job.status, job.rows = ExportStatus.completed, rows
+        job.finished_at = datetime.now(timezone.utc)
+        session.commit()
+
+
+def submit_export(job_id: int):
+    _executor.submit(run_export, job_id)
+
+
+def fail_stale_exports(session: Session) -> int:
+    """
+    Running jobs whose heartbeat stopped EXPORT_STALE_SECONDS ago belong to a process that died
+    (jobs live on an in-process pool): mark them failed and remove their partial files. Jobs of
+    live processes, this one or other replicas, keep beating and are left alone.
+    """
+    now = datetime.now(timezone.utc)
+    stale = session.execute(
+        select(ExportJob).where(
+            ExportJob.status == ExportStatus.running,
+            or_(ExportJob.heartbeat_at.is_(None),
+                ExportJob.heartbeat_at < now - timedelta(seconds=settings.EXPORT_STALE_SECONDS)),
+        ).with_for_update(skip_locked=True)
+    ).scalars().all()
+    for job in stale:
+        shutil.rmtree(export_dir(job), ignore_errors=True)
+        job.status, job.error, job.finished_at = ExportStatus.failed, "Interrupted: the exporting process stopped", now
+    return len(stale)
+
+
+def recover_exports():
+    """At startup: fail the jobs a dead process left running and queue the ones it never started again."""
+    with Session(engine) as session:
+        failed = fail_stale_exports(session)
+        queued = session.execute(select(ExportJob.id).where(ExportJob.status == ExportStatus.queued)).scalars().all()
+        if pa is None:
+            session.execute(
+                update(ExportJob).where(ExportJob.id.in_(queued))
+                .values(status=ExportStatus.failed, error="pyarrow is not installed",
+                        finished_at=datetime.now(timezone.utc))
+            )
+            queued = []
+        session.commit()
+    for job_id in queued:
+        submit_export(job_id)
+    if failed or queued:
+        logger.info("Exports recovered", extra={"failed": failed, "requeued": len(queued)})
+
+
+def purge_exports(session: Session) -> int:
+    """
+    Delete jobs finished more than EXPORT_RETENTION_DAYS ago with their files, and directories
+    left without a job (deleted organizations). Returns the number of jobs deleted.
+    """
+    root = Path(settings.EXPORT_DIR)
+    # listed before reading the jobs: a directory created meanwhile belongs to a job already committed
+    directories = [path for path in root.glob("*/*") if path.is_dir()] if root.is_dir() else []
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EXPORT_RETENTION_DAYS)
+    expired = session.execute(select(ExportJob).where(ExportJob.finished_at < cutoff)).scalars().all()
+    for job in expired:
+        shutil.rmtree(export_dir(job), ignore_errors=True)
+    if expired:
+        session.execute(delete(ExportJob).where(ExportJob.id.in_([job.id for job in expired])))
+
+    known = {(str(organization_id), str(job_id)) for organization_id, job_id in
+             session.execute(select(ExportJob.organization_id, ExportJob.id)).all()}
+    for directory in directories:
+        if (directory.parent.name, directory.name) not in known:
+            shutil.rmtree(directory, ignore_errors=True)
+    return len(expired)
+
+
+def export_files(job: ExportJob) -> list[tuple[str, int]]:
+    """(entity, size in bytes) of a completed job's files."""
+    if job.status != ExportStatus.completed:
+        return []
+    return [
+        (entity, export_file(job, entity).stat().st_size)
+        for entity in EXPORT_ENTITIES if export_file(job, entity).exists()
+    ]
@@ -0,0 +1,222 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from jose.exceptions import JWTError
+from sqlalchemy import and_, delete, or_, update
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.jwt import decode_access_token
+from app.core.metrics import Counter
+from app.db.upsert import dialect_insert
+from app.schemas.models import IdempotencyKey, utc_now
+
+# create endpoints retried by clients on flaky connections
+IDEMPOTENT_PATHS = (
+    "/api/internal/adoptionRequests",
+    "/api/internals/animals",
+    "/api/internal/vaccinations",
+    "/api/internal/medicalRecords",
+)
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_REQUESTS = Counter(
+    "pawbase_idempotency_requests_total", "POSTs carrying an Idempotency-Key, by outcome.", ("result",))
+
+
+def request_hash(scope: Scope, body: bytes) -> bytes:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b"")):
+        digest.update(part + b"\n")
+    digest.update(body)
+    return digest.digest()
+
+
+def _user_id(headers: Headers) -> int | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return int(decode_access_token(token)["sub"])
+    except (JWTError, KeyError, ValueError):
+        return None
+
+
+def claim_key(user_id: int, key: str, hashed: bytes, lock_timeout: float) -> tuple[str | None, IdempotencyKey | None]:
+    """
+    Insert the key as in progress. (claim token, None) when this request claimed it, otherwise
+    (None, the stored row), completed or still running in another request. Expired keys and claims
+    abandoned for longer than 'lock_timeout' are deleted first, so they can be claimed again.
+    The random token identifies the claim: a request whose claim was taken over must not store or release.
+    """
+    from app.db.database import engine
+
+    with Session(engine) as session:
+        for _ in range(2):
+            now = utc_now()
+            token = secrets.token_hex(16)
+            session.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                or_(IdempotencyKey.expires_at <= now,
+                    and_(IdempotencyKey.status_code.is_(None),
+                         IdempotencyKey.created_at < now - timedelta(seconds=lock_timeout))),
+            ))
+            # the primary key decides between concurrent duplicates: the loser inserts nothing
+            claimed = session.execute(
+                dialect_insert(session, IdempotencyKey)
+                .values(user_id=user_id, key=key, request_hash=hashed, claim_token=token, created_at=now,
+                        expires_at=now + timedelta(seconds=lock_timeout))
+                .on_conflict_do_nothing(index_elements=["user_id", "key"])
+                .returning(IdempotencyKey.key)
+            ).scalar()
+            session.commit()
+            if claimed is not None:
+                return token, None
+            existing = session.get(IdempotencyKey, (user_id, key))
+            if existing is not None:
+                return None, existing
+        # purged between the insert and the read twice in a row: treat as still running
+        return None, IdempotencyKey(user_id=user_id, key=key, request_hash=hashed, claim_token="", expires_at=now)
+
+
+def _claimed(user_id: int, key: str, token: str):
+    # the in-progress row this request inserted, not one a later request claimed after it was abandoned
+    return (IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+            IdempotencyKey.claim_token == token, IdempotencyKey.status_code.is_(None))
+
+
+def store_response(user_id: int, key: str, token: str, status_code: int, headers: list[list[str]], body: bytes,
+                   ttl: float):
+    from app.db.database import engine
+
+    with Session(engine) as session:
+        session.execute(
+            update(IdempotencyKey)
+            .where(*_claimed(user_id, key, token))
+            .values(status_code=status_code, headers=headers, body=body,
+                    expires_at=utc_now() + timedelta(seconds=ttl))
+        )
+        session.commit()
+
+
+def release_key(user_id: int, key: str, token: str):
+    """Drop an in-progress claim whose request failed, so a retry runs the handler again."""
+    from app.db.database import engine
+
+    with Session(engine) as session:
+        session.execute(delete(IdempotencyKey).where(*_claimed(user_id, key, token)))
+        session.commit()
+
+
+def purge_expired_keys(session: Session) -> int:
+    return session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utc_now())).rowcount
+
+
+class IdempotencyMiddleware:
+    """
+    Honour an Idempotency-Key header on the create endpoints: the first request claims the key
+    (per user) and its response is stored for 'ttl' seconds; retries with the same key and the
+    same request get the stored response back without running the handler. A retry arriving
+    while the first request still runs gets 409, a different request under the same key 422.
+    Server errors are not stored, the key is released so the retry runs again.
+    """
+
+    def __init__(self, app: ASGIApp, ttl: float, lock_timeout: float):
+        self.app = app
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") not in IDEMPOTENT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"}, status_code=400)
+            await response(scope, receive, send)
+            return
+        # keys are scoped per user; without valid credentials the handler answers 401 anyway
+        user_id = _user_id(headers)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        hashed = request_hash(scope, body)
+
+        token, existing = await run_in_threadpool(claim_key, user_id, key, hashed, self.lock_timeout)
+        if existing is not None:
+            await self._answer_duplicate(existing, hashed, scope, receive, send)
+            return
+
+        await self._run_and_store(scope, body, receive, send, user_id, key, token)
+
+    async def _answer_duplicate(self, existing: IdempotencyKey, hashed: bytes, scope: Scope, receive: Receive, send: Send):
+        if existing.request_hash != hashed:
+            IDEMPOTENCY_REQUESTS.inc("mismatch")
+            response = JSONResponse({"detail": "Idempotency-Key was already used for a different request"}, status_code=422)
+        elif existing.status_code is None:
+            IDEMPOTENCY_REQUESTS.inc("in_progress")
+            response = JSONResponse({"detail": "A request with this Idempotency-Key is still being processed"},
+                                    status_code=409, headers={"Retry-After": "1"})
+        else:
+            IDEMPOTENCY_REQUESTS.inc("replayed")
+            response = Response(existing.body, status_code=existing.status_code)
+            # every stored header (Location, ETag, ...); Response sets content-length from the body already
+            response.raw_headers += [(name.encode("latin-1"), value.encode("latin-1"))
+                                     for name, value in existing.headers]
+            response.raw_headers.append((b"idempotent-replayed", b"true"))
+        await response(scope, receive, send)
+
+    async def _run_and_store(self, scope: Scope, body: bytes, receive: Receive, send: Send, user_id: int, key: str,
+                             token: str):
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Message | None = None
+        response_body = []
+
+        async def capture_send(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await run_in_threadpool(release_key, user_id, key, token)
+            IDEMPOTENCY_REQUESTS.inc("failed")
+            raise
+        if start is None or start["status"] >= 500:
+            await run_in_threadpool(release_key, user_id, key, token)
+            IDEMPOTENCY_REQUESTS.inc("failed")
+            return
+        headers = [[name.decode("latin-1"), value.decode("latin-1")]
+                   for name, value in start.get("headers", []) if name.lower() != b"content-length"]
+        await run_in_threadpool(store_response, user_id, key, token, start["status"], headers,
+                                b"".join(response_body), self.ttl)
+        IDEMPOTENCY_REQUESTS.inc("stored")
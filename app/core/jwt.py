@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
 from app.core.config import settings
 
+# jose pulls in the cryptography x509 backends, it is imported on first use (or by the startup warm-up)
+
 
 def create_access_token(subject:str | int, expires_delta: timedelta | None = None):
     """
@@ -12,6 +13,7 @@ def create_access_token(subject:str | int, expires_delta: timedelta | None = Non
     expire = datetime.now(timezone.utc) + expires_delta
     #creating the payload
     to_encode = {"exp": expire, "sub": str(subject)}
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM )
     return encoded_jwt
 
@@ -19,6 +21,7 @@ def decode_access_token(token: str) ->dict:
     """
     Decode token and return the payload.
     """
+    from jose import jwt
     payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     return payload
 
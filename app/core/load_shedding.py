@@ -0,0 +1,68 @@
+import time
+from contextvars import ContextVar
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import Counter
+
+# monotonic time by which the current request must be done, None outside requests
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+# staff routes keep the whole capacity, public ones are shed first
+INTERNAL_PREFIXES = ("/api/internal",)
+# probes and scrapes are never shed
+EXEMPT_PATHS = ("/health", "/metrics")
+
+REQUESTS_SHED = Counter("pawbase_http_requests_shed_total", "Requests rejected with 503 by load shedding.", ("priority",))
+
+
+class DeadlineExceeded(HTTPException):
+    """The request ran out of time before (or while) talking to the database."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(status_code=503, detail="Request deadline exceeded", headers={"Retry-After": str(retry_after)})
+
+
+def remaining_seconds() -> float | None:
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class LoadSheddingMiddleware:
+    """
+    Give every request a deadline and reject new work with 503 + Retry-After once too many
+    requests are in flight (running or queued for the threadpool). Public routes are shed
+    at 'public_fraction' of the limit so staff routes keep working under a public traffic spike.
+    """
+
+    def __init__(self, app: ASGIApp, max_in_flight: int, public_fraction: float, timeout: float, retry_after: int):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.public_limit = max(1, int(max_in_flight * public_fraction))
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        internal = scope["path"].startswith(INTERNAL_PREFIXES)
+        limit = self.max_in_flight if internal else self.public_limit
+        if self.max_in_flight and self.in_flight >= limit:
+            REQUESTS_SHED.inc("internal" if internal else "public")
+            response = JSONResponse({"detail": "Server overloaded, retry later"}, status_code=503,
+                                    headers={"Retry-After": str(self.retry_after)})
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        token = request_deadline.set(time.monotonic() + self.timeout) if self.timeout else None
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            if token is not None:
+                request_deadline.reset(token)
@@ -0,0 +1,160 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.routes import route_template
+
+logger = logging.getLogger("pawbase.access")
+
+# id of the request being served, attached to every log record emitted while serving it
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# records from these loggers are sampled at LOG_SAMPLE_RATE (plus records logged with extra={"sampled": True})
+NOISY_LOGGERS = ("sqlalchemy.engine",)
+# LogRecord attributes that are not user supplied 'extra' fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+
+LOGS_DROPPED = Counter("pawbase_log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request id and any 'extra' fields."""
+    converter = time.gmtime
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a 'rate' fraction of noisy records, so log volume stays flat as traffic grows."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or not (getattr(record, "sampled", False) or record.name.startswith(NOISY_LOGGERS)):
+            return True
+        return random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hand records to the writer thread. The calling thread only resolves the message and
+    captures the request id (context variables are not visible from the writer thread);
+    when the queue is full the record is dropped instead of blocking the request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOGS_DROPPED.inc()
+
+
+def setup_logging():
+    """Route all logging (app, uvicorn, SQLAlchemy) through one queue to a background JSON writer."""
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+    # uvicorn configures its own handlers, send its records through ours; requests are logged by RequestLogMiddleware
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    # SQL echo goes through the queue too instead of create_engine(echo=True)'s synchronous stream handler
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.SQL_ECHO else logging.WARNING)
+
+    _listener = QueueListener(handler.queue, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class RequestLogMiddleware:
+    """
+    Assign each request an id (kept from an incoming X-Request-ID header), echo it in the response
+    and log one structured record per request. Successful fast requests are sampled; errors and
+    requests slower than LOG_SLOW_REQUEST_MS are always logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        token = request_id.set(rid)
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, rid)
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            stats = scope.get("query_stats")
+            level = logging.ERROR if status_code >= 500 else logging.INFO
+            logger.log(level, "request", extra={
+                "method": scope["method"],
+                "route": route_template(scope),
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration_ms, 2),
+                "db_ms": round(stats.seconds * 1000, 2) if stats else None,
+                "db_queries": stats.count if stats else None,
+                "sampled": status_code < 500 and duration_ms < settings.LOG_SLOW_REQUEST_MS,
+            })
+            request_id.reset(token)
@@ -0,0 +1,296 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Callable
+
+from sqlalchemy import delete, or_, select, tuple_, update
+from sqlmodel import Session
+
+from app.core.cache import analytics_cache
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+from app.db.length_of_stay import length_of_stay_report
+from app.db.shelter_stats import basic_analytics
+from app.db.upsert import dialect_insert
+from app.schemas.models import AnalyticsSnapshot, DailyJobRun
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_REFRESHES = Counter(
+    "pawbase_analytics_snapshot_refreshes_total", "Analytics snapshots recomputed, by snapshot and outcome.", ("name", "result"))
+REFRESH_DURATION = Histogram("pawbase_analytics_snapshot_refresh_seconds", "Duration of one precompute pass.")
+
+# snapshot name -> compute(session, organization_id) returning a JSON serializable payload;
+# must be importable top-level callables (or partials of them) to run in worker processes
+SNAPSHOTS: dict[str, Callable[[Session, int], dict]] = {
+    "basic": basic_analytics,
+    "length_of_stay": partial(length_of_stay_report, group=None),
+    "length_of_stay:shelter": partial(length_of_stay_report, group="shelter"),
+    "length_of_stay:species": partial(length_of_stay_report, group="species"),
+    "length_of_stay:breed": partial(length_of_stay_report, group="breed"),
+}
+
+
+def register_snapshot(name: str, compute: Callable[[Session, int], dict]):
+    SNAPSHOTS[name] = compute
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def store_snapshot(session: Session, organization_id: int, name: str, payload: dict, computed_at: datetime):
+    stmt = dialect_insert(session, AnalyticsSnapshot).values(
+        organization_id=organization_id, name=name, payload=payload, computed_at=computed_at, dirty=False)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["organization_id", "name"],
+        set_={"payload": stmt.excluded.payload, "computed_at": stmt.excluded.computed_at},
+    ))
+
+
+def read_snapshot(session: Session, organization_id: int, name: str) -> dict:
+    """
+    The snapshot's payload plus 'computed_at'. A snapshot that is missing, marked dirty by a write
+    or left far behind (no process runs the worker) is recomputed inline, once for concurrent
+    readers, so a read never serves data older than the last committed write.
+    """
+    key = ("snapshot", organization_id, name)
+    # a refresh in progress has cleared the flag already: wait for it rather than read the old payload
+    refreshing = analytics_cache.in_flight(key)
+    if refreshing is not None:
+        return refreshing.result()
+    snapshot = session.get(AnalyticsSnapshot, (organization_id, name))
+    if snapshot is not None and not snapshot.dirty and snapshot.computed_at.replace(tzinfo=timezone.utc) > \
+            _now() - timedelta(seconds=2 * settings.PRECOMPUTE_INTERVAL_SECONDS):
+        return {**snapshot.payload, "computed_at": snapshot.computed_at}
+    return analytics_cache.single_flight(key, partial(refresh_snapshot, name, organization_id))
+
+
+def refresh_snapshot(name: str, organization_id: int) -> dict:
+    """Recompute and store one snapshot in a session of its own; the payload plus 'computed_at'."""
+    from app.db.database import engine
+
+    with Session(engine) as session:
+        # clear the flag first: writes landing while computing mark the snapshot dirty again
+        session.execute(
+            update(AnalyticsSnapshot)
+            .where(AnalyticsSnapshot.organization_id == organization_id, AnalyticsSnapshot.name == name)
+            .values(dirty=False)
+        )
+        session.commit()
+        computed_at = _now()
+        payload = SNAPSHOTS[name](session, organization_id)
+        store_snapshot(session, organization_id, name, payload, computed_at)
+        session.commit()
+    SNAPSHOT_REFRESHES.inc(name, "inline")
+    return {**payload, "computed_at": computed_at}
+
+
+def mark_dirty(session: Session, organization_ids):
+    """Flag the organizations' snapshots for recomputation, in the writing transaction."""
+    session.execute(
+        update(AnalyticsSnapshot)
+        .where(AnalyticsSnapshot.organization_id.in_(organization_ids), AnalyticsSnapshot.dirty.is_(False))
+        .values(dirty=True)
+    )
+
+
+def compute_snapshot(name: str, organization_id: int) -> dict:
+    """Worker entry point, also run in worker processes: a session of its own."""
+    from app.db.database import engine
+
+    with Session(engine) as session:
+        return SNAPSHOTS[name](session, organization_id)
+
+
+def claim_daily_run(session: Session, name: str, today) -> bool:
+    """
+    True in the one process that gets to run job 'name' today. The claimed row stays locked until
+    the caller's transaction ends: concurrent claimers wait, and a rolled back run can be retried.
+    """
+    stmt = dialect_insert(session, DailyJobRun).values(name=name, run_on=today)
+    return session.execute(
+        stmt.on_conflict_do_update(index_elements=["name"], set_={"run_on": stmt.excluded.run_on},
+                                   where=DailyJobRun.run_on < stmt.excluded.run_on)
+        .returning(DailyJobRun.name)
+    ).scalar() is not None
+
+
+def run_daily_jobs(session: Session, today) -> bool:
+    """
+    The daily jobs (vaccination due list, expired idempotency keys, export retention), once per
+    UTC day across all processes. False when another process already ran them today.
+    """
+    from app.core.exports import fail_stale_exports, purge_exports
+    from app.core.idempotency import purge_expired_keys
+    from app.db.vaccination_due import precompute_due
+
+    if not claim_daily_run(session, "daily", today):
+        session.rollback()
+        return False
+    started = time.perf_counter()
+    count = precompute_due(session, today)
+    purged = purge_expired_keys(session)
+    fail_stale_exports(session)
+    exports_purged = purge_exports(session)
+    session.commit()
+    logger.info("Daily jobs done", extra={"vaccinations": count, "idempotency_keys_purged": purged,
+                                          "exports_purged": exports_purged,
+                                          "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
+    return True
+
+
+class DailyJobs:
+    """
+    Background thread checking every 'poll' seconds whether today's daily jobs ran. Started by
+    every API process (and the precompute worker): the first to claim the day runs them.
+    """
+
+    def __init__(self, poll: float = 60.0):
+        self.poll = poll
+        self.done_on = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="daily-jobs", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.run_if_due()
+            except Exception:
+                logger.exception("Daily jobs failed")
+            if self.stopped.wait(self.poll):
+                return
+
+    def run_if_due(self, session: Session | None = None) -> bool:
+        """Run the daily jobs unless this process saw them done today; True when it ran them."""
+        from app.db.database import engine
+        from app.db.rollups import utc_today
+
+        today = utc_today()
+        if self.done_on == today:
+            return False
+        if session is None:
+            with Session(engine) as session:
+                ran = run_daily_jobs(session, today)
+        else:
+            ran = run_daily_jobs(session, today)
+        self.done_on = today
+        return ran
+
+
+class PrecomputeWorker:
+    """
+    Background scheduler: every 'poll' seconds, recompute the snapshots marked dirty by writes
+    or older than 'interval', in this thread or on a process pool, and run the daily jobs when
+    no other process ran them today.
+    """
+
+    def __init__(self, interval: float, poll: float, processes: int = 0):
+        self.interval = interval
+        self.poll = poll
+        # spawn: forking a process that holds pooled connections and threads is unsafe
+        self.pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) if processes else None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="analytics-precompute", daemon=True)
+        self.daily_jobs = DailyJobs()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.poll):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Analytics precompute pass failed")
+
+    def run_once(self) -> int:
+        from app.db.database import engine
+
+        with REFRESH_DURATION.time(), Session(engine) as session:
+            self.daily_jobs.run_if_due(session)
+            due = session.execute(
+                select(AnalyticsSnapshot.organization_id, AnalyticsSnapshot.name).where(or_(
+                    AnalyticsSnapshot.dirty.is_(True),
+                    AnalyticsSnapshot.computed_at < _now() - timedelta(seconds=self.interval),
+                ))
+            ).all()
+            due = [(organization_id, name) for organization_id, name in due if name in SNAPSHOTS]
+            if not due:
+                return 0
+            # clear the flags first: writes landing while computing mark the snapshot dirty again
+            session.execute(
+                update(AnalyticsSnapshot)
+                .where(tuple_(AnalyticsSnapshot.organization_id, AnalyticsSnapshot.name).in_(due))
+                .values(dirty=False)
+            )
+            session.commit()
+
+            started = _now()
+            if self.pool is not None:
+                results = [self.pool.submit(compute_snapshot, name, organization_id) for organization_id, name in due]
+            else:
+                results = [partial(compute_snapshot, name, organization_id) for organization_id, name in due]
+            refreshed = 0
+            for (organization_id, name), result in zip(due, results):
+                try:
+                    payload = result.result() if self.pool is not None else result()
+                except Exception:
+                    logger.exception("Analytics snapshot failed", extra={"snapshot": name})
+                    SNAPSHOT_REFRESHES.inc(name, "error")
+                    continue
+                SNAPSHOT_REFRESHES.inc(name, "ok")
+                store_snapshot(session, organization_id, name, payload, started)
+                session.commit()
+                refreshed += 1
+            return refreshed
+
+
+def delete_snapshots(session: Session, organization_id: int):
+    session.execute(delete(AnalyticsSnapshot).where(AnalyticsSnapshot.organization_id == organization_id))
+
+
+worker: PrecomputeWorker | None = None
+
+
+def start_worker() -> PrecomputeWorker:
+    global worker
+    worker = PrecomputeWorker(settings.PRECOMPUTE_INTERVAL_SECONDS, settings.PRECOMPUTE_POLL_SECONDS,
+                              settings.PRECOMPUTE_PROCESSES)
+    worker.start()
+    return worker
+
+
+def stop_worker():
+    if worker is not None:
+        worker.stop()
+
+
+daily_jobs: DailyJobs | None = None
+
+
+def start_daily_jobs() -> DailyJobs:
+    global daily_jobs
+    daily_jobs = DailyJobs()
+    daily_jobs.start()
+    return daily_jobs
+
+
+def stop_daily_jobs():
+    if daily_jobs is not None:
+        daily_jobs.stop()
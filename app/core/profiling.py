@@ -0,0 +1,139 @@
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.routes import route_template
+
+# frames from these files count as "our code"; stacks without any of them are idle threads
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+PROFILE_SUFFIX = ".collapsed"
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+class StackSampler(threading.Thread):
+    """
+    Sample the stacks of all threads every 'interval' seconds while a request runs.
+    Sync handlers run in threadpool workers, where a cProfile started by the middleware
+    would not see them, so the profile is built from sampled stacks instead.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True, name="pawbase-profiler")
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = self._collapse(frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+    @staticmethod
+    def _collapse(frame) -> str | None:
+        names = []
+        in_project = False
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(PROJECT_ROOT) and "site-packages" not in code.co_filename:
+                in_project = True
+            names.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        if not in_project:
+            return None
+        return ";".join(reversed(names))
+
+
+def write_profile(method: str, route: str, samples: Counter, elapsed: float) -> Path:
+    """Write collapsed stacks ('frame;frame;frame count', flamegraph.pl compatible) and prune old files."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    # the random part keeps two profiles of one route written within the same second apart
+    path = directory / (f"{time.strftime('%Y%m%dT%H%M%S')}_{int(elapsed * 1000)}ms_{method}_{slug}_"
+                        f"{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}")
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in samples.most_common()))
+
+    profiles = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+    for old in profiles[: max(0, len(profiles) - settings.PROFILING_MAX_FILES)]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def list_profiles() -> list[dict]:
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [
+        {"name": p.name, "size": p.stat().st_size, "created_at": p.stat().st_mtime}
+        for p in profiles
+    ]
+
+
+def get_profile_path(name: str) -> Path | None:
+    """Resolve a profile name from list_profiles(), refusing anything outside the profile directory."""
+    directory = profile_dir().resolve()
+    path = (directory / name).resolve()
+    if path.parent != directory or path.suffix != PROFILE_SUFFIX or not path.is_file():
+        return None
+    return path
+
+
+class ProfilingMiddleware:
+    """
+    Profile a random PROFILING_SAMPLE_RATE fraction of requests, plus any request whose
+    PROFILING_HEADER matches PROFILING_TOKEN, and write one collapsed-stack file per request.
+    Concurrent requests running project code at the same time show up in the same samples,
+    so profile under light traffic or with the debug header for a clean picture.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if settings.PROFILING_TOKEN:
+            supplied = Headers(scope=scope).get(settings.PROFILING_HEADER)
+            if supplied and hmac.compare_digest(supplied, settings.PROFILING_TOKEN):
+                return True
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            samples = sampler.stop()
+            if samples:
+                # file I/O and pruning off the event loop
+                await run_in_threadpool(write_profile, scope["method"], route_template(scope), samples,
+                                        time.perf_counter() - started)
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Optional, Sequence, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlmodel import Session, SQLModel
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+
+
+def parse_fields(fields: Optional[str], read_model: Type[SQLModel]) -> Optional[tuple[str, ...]]:
+    """
+    Parse a 'fields=id,name' query value into a tuple of field names of 'read_model'.
+    Returns None when no projection was requested, raises 400 on unknown fields.
+    """
+    if not fields:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in read_model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names or None
+
+
+@lru_cache(maxsize=128)
+def partial_model(read_model: Type[SQLModel], names: Optional[tuple[str, ...]]) -> Type[BaseModel]:
+    """Return a model with only the selected fields of 'read_model' (or 'read_model' itself)."""
+    if names is None:
+        return read_model
+    definitions = {name: (read_model.model_fields[name].annotation, ...) for name in names}
+    return create_model(f"{read_model.__name__}Fields", **definitions)
+
+
+@lru_cache(maxsize=128)
+def _list_adapter(row_model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[row_model])
+
+
+def project(query, model: Type[SQLModel], names: Optional[Sequence[str]]):
+    """Turn an entity select() into a column-only select() of the requested fields."""
+    if names is None:
+        return query
+    return query.with_only_columns(*(getattr(model, name) for name in names))
+
+
+def projected_response(
+        session: Session,
+        query,
+        model: Type[SQLModel],
+        read_model: Type[SQLModel],
+        names: Optional[tuple[str, ...]],
+) -> Response:
+    """
+    Select only the 'names' columns of 'model' (all 'read_model' fields when None) and serialize the plain rows.
+    No ORM instances are built, so there is no identity-map or response_model overhead.
+    With FAST_JSON_RESPONSES the rows are trusted database data and are encoded without validation.
+    """
+    rows = session.execute(project(query, model, names or tuple(read_model.model_fields))).mappings().all()
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse([dict(row) for row in rows])
+    adapter = _list_adapter(partial_model(read_model, names))
+    return Response(content=adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
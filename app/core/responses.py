@@ -0,0 +1,35 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any):
+    # stdlib fallback for the types orjson handles natively
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode plain python data (dicts, lists, dates, enums) to JSON bytes."""
+    if orjson is not None:
+        # OPT_UTC_Z keeps UTC datetimes formatted like pydantic ('...Z')
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson when available.
+    Only used for already trusted plain data: routes with a response_model keep FastAPI's
+    default class, which serializes straight through pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
@@ -0,0 +1,26 @@
+from starlette.types import Scope
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route ('/api/internals/animals/{animal_id}'), never the raw path,
+    so per-route stats stay bounded. Only available once the router has handled the request.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    # included routers keep their own relative paths; the router prefixes are the part of the
+    # request path in front of the rendered route path
+    try:
+        rendered = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope.get("path", "")
+    if rendered and path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template
+
+
+def route_key(scope: Scope) -> str:
+    return f"{scope.get('method', '')} {route_template(scope)}"
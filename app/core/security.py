@@ -1,7 +1,13 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
 from app.schemas.models import User
 from pwdlib import PasswordHash
 
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
+from app.core.tracing import span, traced
+
 from app.core.deps import get_current_user
 
 # Create a reusable password hasher using recommended settings (Argon2id)
@@ -9,16 +15,26 @@ password_hasher = PasswordHash.recommended()
 
 def get_password_hash(password: str) -> str:
     """Return a securely hashed version of the given password."""
-    return password_hasher.hash(password)
+    with PASSWORD_HASH_DURATION.time("hash"), span("password.hash"):
+        return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a user's password by comparing it to the stored hash."""
-    return password_hasher.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_DURATION.time("verify"), span("password.verify"):
+        return password_hasher.verify(plain_password, hashed_password)
 
 #add helper to require roles
 def require_roles(*roles):
+    @traced("require_roles")
     def wrapper(current_user: User = Depends(get_current_user)):
         if current_user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User role {current_user.role} not authorized for this operation")
         return current_user
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def require_operator(x_operator_token: str | None = Header(None, description="OPERATOR_TOKEN")):
+    """Process wide diagnostics cover every organization's traffic: operators only, never a tenant's org_admin."""
+    if not settings.OPERATOR_TOKEN or not x_operator_token \
+            or not hmac.compare_digest(x_operator_token, settings.OPERATOR_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operator token required")
@@ -0,0 +1,71 @@
+import time
+
+# main.py imports this module before anything else, so this is (close to) the start of the app import
+IMPORT_STARTED = time.perf_counter()
+
+import logging  # noqa: E402
+import threading  # noqa: E402
+
+from starlette.types import ASGIApp, Receive, Scope, Send  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import Gauge  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+STARTUP_SECONDS = Gauge("pawbase_startup_seconds", "Seconds from importing the app to the first served request.")
+WARMUP_SECONDS = Gauge("pawbase_startup_warmup_seconds", "Duration of the background startup warm-up.")
+
+
+def prepare_database():
+    """Create, verify or leave the schema alone depending on DB_STARTUP_MODE."""
+    from app.db.database import init_db, verify_db_revision
+
+    if settings.DB_STARTUP_MODE == "create_all":
+        init_db()
+    elif settings.DB_STARTUP_MODE == "verify":
+        verify_db_revision()
+
+
+def warm_up():
+    """
+    Do the work the first requests would otherwise pay for: opening the pool's connections,
+    mapper configuration and deferred imports. The OpenAPI schema is left alone, building it
+    competes with real requests for the GIL and only /docs needs it.
+    """
+    started = time.perf_counter()
+    try:
+        from sqlalchemy.orm import configure_mappers
+        from app.db.database import engine
+
+        size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+        connections = [engine.connect() for _ in range(size)]
+        for connection in connections:
+            connection.close()
+        configure_mappers()
+        import jose.jwt  # noqa: F401  deferred by app.core.jwt
+    except Exception as exc:  # warm-up is best effort, requests still work without it
+        logger.warning("Startup warm-up failed: %r", exc)
+    WARMUP_SECONDS.set(value=time.perf_counter() - started)
+
+
+def start_warm_up() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+class StartupTimerMiddleware:
+    """Record the time from import to the first completed HTTP response, once."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.app(scope, receive, send)
+        if not self.done and scope["type"] == "http":
+            self.done = True
+            elapsed = time.perf_counter() - IMPORT_STARTED
+            STARTUP_SECONDS.set(value=elapsed)
+            logger.info("First request served", extra={"startup_seconds": round(elapsed, 3)})
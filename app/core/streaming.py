@@ -0,0 +1,56 @@
+from typing import Iterator, Literal, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.load_shedding import request_deadline
+from app.db.database import engine
+
+StreamFormat = Literal["json", "ndjson"]
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_query_chunks(query, read_model: Type[BaseModel], fmt: StreamFormat) -> Iterator[bytes]:
+    """
+    Run 'query' on a server-side cursor and yield encoded chunks.
+    Rows are fetched 'STREAM_BATCH_SIZE' at a time and the output buffer is flushed
+    once it reaches 'STREAM_CHUNK_BYTES', so peak memory is bounded by those two
+    settings and never by the number of rows.
+    """
+    # entity queries yield ORM objects, column-only (projected) queries yield row mappings
+    descriptions = query.column_descriptions
+    entity = len(descriptions) == 1 and isinstance(descriptions[0]["expr"], type)
+    separator = b"," if fmt == "json" else b"\n"
+    buffer = bytearray(b"[" if fmt == "json" else b"")
+    first = True
+    # exports may legitimately outlive the request deadline, no statement_timeout for this session
+    request_deadline.set(None)
+    # the request session is closed once the handler returns, the stream owns its own
+    with Session(engine) as session:
+        result = session.execute(query.execution_options(yield_per=settings.STREAM_BATCH_SIZE))
+        rows = result.scalars() if entity else result.mappings()
+        for row in rows:
+            if fmt == "json" and not first:
+                buffer += separator
+            buffer += read_model.model_validate(row).model_dump_json().encode()
+            if fmt == "ndjson":
+                buffer += separator
+            first = False
+            if len(buffer) >= settings.STREAM_CHUNK_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+    if fmt == "json":
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
+
+
+def stream_query(query, read_model: Type[BaseModel], fmt: StreamFormat) -> StreamingResponse:
+    """Wrap 'iter_query_chunks' in a StreamingResponse for the given format."""
+    return StreamingResponse(iter_query_chunks(query, read_model, fmt), media_type=MEDIA_TYPES[fmt])
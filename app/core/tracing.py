@@ -0,0 +1,271 @@
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.log import request_id
+from app.core.routes import route_template
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class Span:
+    """One timed operation inside a trace; 'start'/'end' are perf_counter() values."""
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: str | None, attributes: dict):
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+
+class Trace:
+    """Spans of one sampled request. Spans finished in threadpool threads are appended to the same list."""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.started_at = time.time()
+        self.spans: list[Span] = []
+
+    def to_dict(self) -> dict:
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "timestamp": self.started_at,
+            "duration_ms": round((root.end - root.start) * 1000, 3),
+            "spans": [
+                {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "name": span.name,
+                    "start_ms": round((span.start - root.start) * 1000, 3),
+                    "duration_ms": round(((span.end or root.end) - span.start) * 1000, 3),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def start_span(name: str, **attributes) -> Span | None:
+    """Open a child of the current span; None when the request is not sampled."""
+    trace = current_trace.get()
+    if trace is None:
+        return None
+    parent = current_span.get()
+    span = Span(name, parent.span_id if parent else None, attributes)
+    trace.spans.append(span)
+    return span
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the block as a child of the current span (no-op for unsampled requests)."""
+    opened = start_span(name, **attributes)
+    if opened is None:
+        yield None
+        return
+    token = current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as exc:
+        opened.error = repr(exc)
+        raise
+    finally:
+        opened.end = time.perf_counter()
+        current_span.reset(token)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator giving every call of a (sync) function, e.g. a FastAPI dependency, its own span.
+    Generator dependencies get one span for the code before their yield and one ('<name>.teardown')
+    for the code after it.
+    """
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if current_trace.get() is None:
+                    return (yield from func(*args, **kwargs))
+                generator = func(*args, **kwargs)
+                with span(span_name):
+                    value = next(generator)
+                try:
+                    yield value
+                except BaseException as exc:
+                    with span(f"{span_name}.teardown"):
+                        try:
+                            generator.throw(exc)
+                        except StopIteration:  # the dependency handled the exception
+                            return
+                else:
+                    with span(f"{span_name}.teardown"):
+                        next(generator, None)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_engine(engine):
+    """A span per SQL statement of a sampled request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.trace_span = start_span("sql", statement=statement[:500])
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        opened = getattr(context, "trace_span", None)
+        if opened is not None:
+            opened.end = time.perf_counter()
+            opened.attributes["rows"] = cursor.rowcount
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        opened = getattr(exception_context.execution_context, "trace_span", None)
+        if opened is not None:
+            opened.end = time.perf_counter()
+            opened.error = repr(exception_context.original_exception)
+
+
+# ---- exporters ----
+
+class SpanExporter(ABC):
+    """Receives finished traces on the exporter thread. Subclass and point TRACE_EXPORTER at it."""
+
+    @abstractmethod
+    def export(self, trace: dict):
+        ...
+
+
+class FileExporter(SpanExporter):
+    """Append one JSON object per trace to TRACE_FILE."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.TRACE_FILE
+
+    def export(self, trace: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(trace, default=str) + "\n")
+
+
+class LogExporter(SpanExporter):
+    """Send traces through the application log."""
+
+    def export(self, trace: dict):
+        logger.info("trace", extra={"trace": trace})
+
+
+EXPORTERS = {"file": FileExporter, "log": LogExporter}
+
+
+def load_exporter(name: str) -> SpanExporter:
+    """'file', 'log' or a 'package.module:ClassName' implementing SpanExporter."""
+    if name in EXPORTERS:
+        return EXPORTERS[name]()
+    module, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module), attribute)()
+
+
+class ExportWorker:
+    """Exports traces off the request path; a full queue drops traces instead of blocking."""
+
+    def __init__(self, exporter: SpanExporter, max_queue: int = 1000):
+        self.exporter = exporter
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self.thread.start()
+
+    def submit(self, trace: Trace):
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        while True:
+            trace = self.queue.get()
+            try:
+                self.exporter.export(trace.to_dict())
+            except Exception:
+                logger.exception("Trace export failed")
+
+
+class TracingMiddleware:
+    """
+    Open a root span for a TRACE_SAMPLE_RATE fraction of requests; dependency, SQL and
+    password hashing spans attach to it. Sampled responses carry the trace id.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, exporter: SpanExporter):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.worker = ExportWorker(exporter)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        trace = Trace()
+        root = Span(scope["method"], None, {"path": scope["path"], "request_id": request_id.get()})
+        trace.spans.append(root)
+        trace_token, span_token = current_trace.set(trace), current_span.set(root)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                root.attributes["status"] = message["status"]
+                MutableHeaders(scope=message).append(TRACE_ID_HEADER, trace.trace_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            root.error = repr(exc)
+            raise
+        finally:
+            root.end = time.perf_counter()
+            root.name = f"{scope['method']} {route_template(scope)}"
+            current_span.reset(span_token)
+            current_trace.reset(trace_token)
+            self.worker.submit(trace)
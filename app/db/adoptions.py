@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.rollups import apply_day_delta, utc_today
+from app.db.shelter_stats import StatsDelta, apply_stats_delta
+from app.schemas.enums import RequestStatus
+from app.schemas.models import AdoptionRequest, Animal, utc_now
+
+
+def reject_open_requests(session: Session, animal: Animal, approved_request_id: int) -> int:
+    """
+    Reject the animal's other open requests in one UPDATE, in the approving transaction.
+    Bulk UPDATEs bypass the flush listeners, so the shelter counters and the closed days'
+    rollup rows are adjusted here. Returns the number of rejected requests.
+    """
+    request_dates = session.execute(
+        update(AdoptionRequest)
+        .where(
+            AdoptionRequest.animal_id == animal.id,
+            AdoptionRequest.id != approved_request_id,
+            AdoptionRequest.status == RequestStatus.submitted,
+        )
+        .values(status=RequestStatus.rejected, decided_at=utc_now(), version=AdoptionRequest.version + 1)
+        .returning(AdoptionRequest.request_date)
+        .execution_options(synchronize_session="fetch")
+    ).scalars().all()
+    if not request_dates:
+        return 0
+
+    stats = StatsDelta()
+    stats.request(animal.shelter_id, animal.breed_name, RequestStatus.submitted, -len(request_dates))
+    stats.request(animal.shelter_id, animal.breed_name, RequestStatus.rejected, len(request_dates))
+    apply_stats_delta(session, stats, set())
+
+    today = utc_today()
+    days = defaultdict(lambda: defaultdict(int))
+    for request_date in request_dates:
+        if request_date.date() < today:
+            days[(animal.shelter_id, request_date.date(), animal.species_name)]["rejected_requests"] += 1
+    apply_day_delta(session, days)
+    return len(request_dates)
@@ -0,0 +1,101 @@
+from datetime import date
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.db.length_of_stay import days_between
+from app.db.rollups import _as_date, _bucket_column, _day_start, bucket_start
+from app.schemas.enums import RequestStatus
+from app.schemas.models import AdoptionRequest, Animal, Shelter
+
+
+def _rate(count: int, animals: int) -> float:
+    return round(count / animals * 100, 2) if animals else 0.0
+
+
+def _funnel(cohort, window: list):
+    """Per cohort: animals, animals with requests, approved animals, animals still waiting on an open request."""
+    # one row per animal first, so several requests for one animal count once
+    per_animal = (
+        select(
+            cohort.label("cohort"),
+            func.count(AdoptionRequest.id).label("requests"),
+            func.max(case((AdoptionRequest.status == RequestStatus.approved, 1), else_=0)).label("approved"),
+            func.max(case((AdoptionRequest.status == RequestStatus.submitted, 1), else_=0)).label("open"),
+        )
+        .select_from(Animal)
+        .outerjoin(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
+        .where(*window)
+        .group_by(Animal.id)
+        .subquery("per_animal")
+    )
+    return select(
+        per_animal.c.cohort,
+        func.count(),
+        func.count(case((per_animal.c.requests > 0, 1))),
+        func.count(case((per_animal.c.approved == 1, 1))),
+        func.count(case((and_(per_animal.c.open == 1, per_animal.c.approved == 0), 1))),
+    ).group_by(per_animal.c.cohort)
+
+
+def _median_decision_hours(dialect: str, cohort, window: list):
+    """Per cohort: median hours from request to approval or rejection, over the decided requests."""
+    hours = days_between(dialect, AdoptionRequest.request_date, AdoptionRequest.decided_at) * 24
+    decided = (
+        select(cohort.label("cohort"), hours.label("hours"))
+        .select_from(Animal)
+        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
+        .where(*window, AdoptionRequest.decided_at.is_not(None))
+    ).subquery("decided")
+    if dialect == "postgresql":
+        return select(decided.c.cohort, func.percentile_cont(0.5).within_group(decided.c.hours)).group_by(decided.c.cohort)
+    # nearest-rank median, as for length of stay
+    ranked = select(
+        decided.c.cohort, decided.c.hours,
+        func.row_number().over(partition_by=decided.c.cohort, order_by=decided.c.hours).label("rank"),
+        func.count().over(partition_by=decided.c.cohort).label("n"),
+    ).subquery("ranked")
+    return select(
+        ranked.c.cohort, func.min(case((ranked.c.rank >= 0.5 * ranked.c.n, ranked.c.hours)))
+    ).group_by(ranked.c.cohort)
+
+
+def cohort_funnel(session: Session, organization_id: int, before: date | None, limit: int) -> dict:
+    """
+    Adoption funnel per monthly intake cohort (animals by created_at month), newest first: how
+    many animals received requests, were approved or are still waiting on an open request, and
+    the median request-to-decision time. One page of 'limit' cohorts older than 'before'; every
+    figure is aggregated in the database, over the page's animals only.
+    """
+    cohort = _bucket_column(session, Animal.created_at, "month")
+    window = [Animal.shelter_id.in_(select(Shelter.id).where(Shelter.organization_id == organization_id))]
+    if before is not None:
+        window.append(Animal.created_at < _day_start(bucket_start(before, "month")))
+
+    months = [_as_date(month) for month in session.execute(
+        select(cohort).where(*window).group_by(cohort).order_by(cohort.desc()).limit(limit + 1)
+    ).scalars()]
+    page, more = months[:limit], len(months) > limit
+    if not page:
+        return {"cohorts": [], "next_before": None}
+    window.append(Animal.created_at >= _day_start(page[-1]))
+
+    dialect = session.get_bind().dialect.name
+    medians = {_as_date(month): hours for month, hours in session.execute(_median_decision_hours(dialect, cohort, window))}
+    cohorts = []
+    for month, animals, requested, approved, waiting in sorted(
+            session.execute(_funnel(cohort, window)).all(), key=lambda row: _as_date(row[0]), reverse=True):
+        month = _as_date(month)
+        median = medians.get(month)
+        cohorts.append({
+            "cohort": month,
+            "animals": animals,
+            "requested": requested,
+            "approved": approved,
+            "waiting": waiting,
+            "requested_rate": _rate(requested, animals),
+            "approved_rate": _rate(approved, animals),
+            "waiting_rate": _rate(waiting, animals),
+            "median_decision_hours": round(float(median), 1) if median is not None else None,
+        })
+    return {"cohorts": cohorts, "next_before": page[-1] if more else None}
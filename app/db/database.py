@@ -1,9 +1,38 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlmodel import SQLModel, create_engine, Session
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.deadlines import propagate_deadlines
+from app.core.tracing import trace_engine, traced
+from app.core.metrics import collectors as metrics_collectors
 
 #create the database engine
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True,  echo=True)
+#SQL statements are logged through app.core.log when SQL_ECHO is set, echo=True would write synchronously
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+#count statements and DB time per request (Server-Timing, /internal/admin/sql)
+instrument_engine(engine)
+#statement timeouts hit inside a request become 503 responses
+propagate_deadlines(engine)
+#a span per statement for sampled requests
+trace_engine(engine)
+
+def pool_metrics() -> list[str]:
+    """Connection pool gauges for /metrics, read at scrape time."""
+    pool = engine.pool
+    lines = []
+    for name, attr in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+        if hasattr(pool, attr):
+            lines.append(f"# TYPE pawbase_db_pool_{name} gauge")
+            lines.append(f"pawbase_db_pool_{name} {getattr(pool, attr)()}")
+    return lines
 
+metrics_collectors.append(pool_metrics)
+
+@traced()
 def get_session():
     with Session(engine) as session:
         yield session
@@ -11,3 +40,37 @@ def get_session():
 def init_db():
     from app.schemas import models
     SQLModel.metadata.create_all(engine)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "versions"
+_REVISION = re.compile(r"^revision(?::[^=]+)?=\s*['\"](\w+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision(?::[^=]+)?=(.*)$", re.M)
+
+def migration_heads() -> set[str]:
+    """Head revisions of migrations/versions, read from the files (importing Alembic costs ~130ms)."""
+    revisions, parents = set(), set()
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        source = path.read_text()
+        if match := _REVISION.search(source):
+            revisions.add(match.group(1))
+        if match := _DOWN_REVISION.search(source):
+            parents.update(re.findall(r"['\"](\w+)['\"]", match.group(1)))
+    return revisions - parents
+
+def verify_db_revision():
+    """
+    Fail fast unless the database is at the Alembic head revision.
+    One query against alembic_version instead of create_all reflecting every table.
+    """
+    expected = migration_heads()
+    with engine.connect() as connection:
+        try:
+            current = set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+        except DBAPIError:  # no alembic_version table: never migrated
+            current = set()
+    if current != expected:
+        raise RuntimeError(
+            f"database is at revision {sorted(current) or 'none'}, expected {sorted(expected)}: run 'alembic upgrade head'"
+        )
+
+# session listeners (sync tombstones, strict lazy loading, shelter counters, daily rollups, analytics cache invalidation)
+from app.db import events, invalidation, loading, rollups, shelter_stats  # noqa: E402,F401
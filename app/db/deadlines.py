@@ -0,0 +1,33 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.load_shedding import DeadlineExceeded, remaining_seconds
+
+# SQLSTATE query_canceled, raised by PostgreSQL when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+@event.listens_for(Session, "after_begin")
+def apply_request_deadline(session, transaction, connection):
+    """
+    Bound every statement of the transaction by the time the request has left, so a slow database
+    fails requests quickly instead of letting them pile up. Requests whose deadline passed
+    while queued for the threadpool fail here, before touching the database.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise DeadlineExceeded(settings.SHED_RETRY_AFTER_SECONDS)
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}")
+
+
+def propagate_deadlines(engine):
+    """Turn statement timeouts hit inside a request into 503 DeadlineExceeded responses."""
+
+    @event.listens_for(engine, "handle_error")
+    def statement_timeout(context):
+        if remaining_seconds() is not None and getattr(context.original_exception, "pgcode", None) == QUERY_CANCELED:
+            raise DeadlineExceeded(settings.SHED_RETRY_AFTER_SECONDS) from context.original_exception
@@ -0,0 +1,61 @@
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.schemas.models import Animal, MedicalRecord, Shelter, Tombstone, Vaccination, utc_now
+
+# entity name used in tombstones and in the /internal/sync feed
+SYNC_ENTITIES = {
+    Animal: "animal",
+    MedicalRecord: "medical_record",
+    Vaccination: "vaccination",
+}
+
+
+def _shelter_id(session: Session, obj) -> int | None:
+    if isinstance(obj, Animal):
+        return obj.shelter_id
+    animal = session.get(Animal, obj.animal_id)
+    return animal.shelter_id if animal else None
+
+
+def _tombstone(session: Session, entity: str, entity_id: int, shelter_id: int | None) -> Tombstone | None:
+    shelter = session.get(Shelter, shelter_id) if shelter_id is not None else None
+    if shelter is None:
+        return None
+    return Tombstone(entity=entity, entity_id=entity_id, shelter_id=shelter_id, organization_id=shelter.organization_id)
+
+
+@event.listens_for(Session, "before_flush")
+def record_tombstones(session: Session, flush_context, instances):
+    """
+    Write a tombstone for every deleted animal / vaccination / medical record.
+    ORM delete cascades are resolved before the flush, so children deleted together
+    with their animal (or shelter) are covered too.
+    """
+    tombstones = []
+    with session.no_autoflush:
+        for obj in session.deleted:
+            entity = SYNC_ENTITIES.get(type(obj))
+            if entity and obj.id is not None:
+                tombstones.append(_tombstone(session, entity, obj.id, _shelter_id(session, obj)))
+
+        # an animal moved to another shelter disappears for the old shelter's staff, with its records;
+        # the records are touched so the new shelter's clients download them
+        for obj in session.dirty:
+            if isinstance(obj, Animal):
+                history = inspect(obj).attrs.shelter_id.history
+                if history.deleted and history.added and history.deleted[0] != history.added[0]:
+                    old_shelter_id = history.deleted[0]
+                    tombstones.append(_tombstone(session, "animal", obj.id, old_shelter_id))
+                    for model in (MedicalRecord, Vaccination):
+                        child_ids = session.execute(
+                            update(model)
+                            .where(model.animal_id == obj.id)
+                            .values(updated_at=utc_now())
+                            .returning(model.id)
+                            .execution_options(synchronize_session="fetch")
+                        ).scalars().all()
+                        tombstones.extend(_tombstone(session, SYNC_ENTITIES[model], child_id, old_shelter_id)
+                                          for child_id in child_ids)
+
+    session.add_all(t for t in tombstones if t is not None)
@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.routes import route_key
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """SQL statements executed while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        # parameters are bound separately, so the statement text is the query shape;
+        # only reads count towards N+1, the unit of work repeats INSERTs legitimately
+        if statement.lstrip()[:6].upper() == "SELECT":
+            self.shapes[statement] += 1
+
+    def repeated_shapes(self) -> list[tuple[str, int]]:
+        """Identical SELECTs run at least SQL_N_PLUS_ONE_THRESHOLD times, likely an N+1."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= settings.SQL_N_PLUS_ONE_THRESHOLD]
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def instrument_engine(engine: Engine):
+    """Time every cursor execution and add it to the current request's QueryStats."""
+
+    # the start time lives on the execution context: a failed statement never reaches
+    # after_cursor_execute, nothing is left behind for the next statement to pick up
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+
+class RouteQueryStats:
+    """Aggregated SQL stats per route template, process wide."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, dict] = {}
+
+    def record(self, route: str, stats: QueryStats, suspected_n_plus_one: bool):
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_seconds": 0.0, "max_queries": 0, "n_plus_one_requests": 0,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["db_seconds"] += stats.seconds
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["n_plus_one_requests"] += suspected_n_plus_one
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            routes = [(route, dict(entry)) for route, entry in self._routes.items()]
+        return sorted(
+            (
+                {
+                    "route": route,
+                    **entry,
+                    "db_seconds": round(entry["db_seconds"], 6),
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "avg_db_ms": round(entry["db_seconds"] * 1000 / entry["requests"], 3),
+                }
+                for route, entry in routes
+            ),
+            key=lambda entry: entry["db_seconds"],
+            reverse=True,
+        )
+
+
+route_query_stats = RouteQueryStats()
+
+
+class QueryStatsMiddleware:
+    """
+    Collect SQL stats per request, report them in a 'Server-Timing' header
+    ('db;dur=<ms>;desc="<n> queries"') and aggregate them per route.
+    Repeated identical statements are logged as a likely N+1. Streaming responses
+    (e.g. ?stream=ndjson) run their queries after the headers are sent and get no
+    header; their queries are still counted in the route stats and the request log.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        # read back by the request log once the response is done
+        scope["query_stats"] = stats
+
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # held back until the first body chunk tells whether the response streams
+                start_message = message
+                return
+            if start_message is not None:
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    headers = MutableHeaders(scope=start_message)
+                    timing = f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'
+                    if stats.repeated_shapes():
+                        timing += ', n-plus-one;desc="repeated statements"'
+                    headers.append("Server-Timing", timing)
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            route = route_key(scope)
+            repeated = stats.repeated_shapes()
+            for shape, n in repeated:
+                logger.warning("Possible N+1 on %s: statement ran %d times: %s", route, n, shape[:200])
+            route_query_stats.record(route, stats, bool(repeated))
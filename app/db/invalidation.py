@@ -0,0 +1,70 @@
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import analytics_cache, bump_generations
+from app.core.config import settings
+from app.core.precompute import mark_dirty
+from app.db.shelter_stats import _before
+from app.schemas.models import AdoptionRequest, Animal, Shelter
+
+_DIRTY_KEY = "analytics_dirty_organizations"
+
+
+@event.listens_for(Session, "after_flush")
+def collect_dirty_organizations(session: Session, flush_context):
+    """Remember the organizations whose animals, adoption requests or shelters this flush wrote."""
+    shelter_ids, animal_ids, organization_ids = set(), set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Animal):
+            shelter_ids.update((obj.shelter_id, _before(obj, "shelter_id")))
+        elif isinstance(obj, AdoptionRequest):
+            animal_ids.update((obj.animal_id, _before(obj, "animal_id")))
+        elif isinstance(obj, Shelter):
+            organization_ids.update((obj.organization_id, _before(obj, "organization_id")))
+    shelter_ids.discard(None)
+    animal_ids.discard(None)
+    if shelter_ids or animal_ids:
+        organization_ids.update(session.execute(
+            select(Shelter.organization_id).distinct().where(or_(
+                Shelter.id.in_(shelter_ids),
+                Shelter.id.in_(select(Animal.shelter_id).where(Animal.id.in_(animal_ids))),
+            ))
+        ).scalars())
+    organization_ids.discard(None)
+    if organization_ids:
+        session.info.setdefault(_DIRTY_KEY, set()).update(organization_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def publish_dirty_organizations(session: Session):
+    """
+    Bump the cache generation and flag the snapshots of the organizations written by the
+    transaction, once, right before it commits: the generation rows stay locked only for the
+    commit instead of from the first write on, and later flushes add no round trips.
+    """
+    if session.in_nested_transaction():
+        return
+    # commit flushes after this hook: flush first so the pending writes are collected too
+    session.flush()
+    organization_ids = session.info.get(_DIRTY_KEY)
+    if not organization_ids:
+        return
+    if settings.ANALYTICS_CACHE_TTL_SECONDS > 0:
+        bump_generations(session, organization_ids)
+    if settings.ANALYTICS_SNAPSHOTS:
+        mark_dirty(session, organization_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_analytics(session: Session):
+    """
+    Invalidate this process's entries once the writes are visible, so a refresh cannot cache the
+    pre-commit state; other processes see the committed generation bump on their next lookup.
+    """
+    for organization_id in session.info.pop(_DIRTY_KEY, ()):
+        analytics_cache.invalidate(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_dirty_organizations(session: Session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,127 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.schemas.enums import RequestStatus
+from app.schemas.models import AdoptionRequest, Animal, Shelter
+
+GROUP_COLUMNS = {
+    "shelter": Animal.shelter_id,
+    "species": Animal.species_name,
+    "breed": Animal.breed_name,
+}
+# histogram bucket lower bounds in days; the last bucket is open ended
+HISTOGRAM_EDGES = (0, 7, 14, 30, 60, 90, 180, 365)
+
+
+def days_between(dialect: str, start, end):
+    """Fractional days from timestamp column 'start' to 'end'."""
+    if dialect == "postgresql":
+        return func.extract("epoch", end - start) / 86400
+    return func.julianday(end) - func.julianday(start)
+
+
+def _adopted_at():
+    # requests approved before decided_at existed fall back to their submission time
+    return func.coalesce(AdoptionRequest.decided_at, AdoptionRequest.request_date)
+
+
+def _stay_days(dialect: str):
+    """Days between the animal's intake (created_at) and the approval of its adoption request."""
+    return days_between(dialect, Animal.created_at, _adopted_at())
+
+
+def _stays(dialect: str, organization_id: int, group: str | None):
+    """One row per adopted animal of the organization: its group key and length of stay."""
+    # an animal with several approved requests counts once, from its first approval
+    first_approval = func.row_number().over(partition_by=Animal.id, order_by=_adopted_at())
+    columns = [GROUP_COLUMNS[group].label("group_key")] if group else []
+    adopted = (
+        select(*columns, _stay_days(dialect).label("days"), first_approval.label("approval_rank"))
+        .select_from(Animal)
+        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
+        .join(Shelter, Shelter.id == Animal.shelter_id)
+        .where(Shelter.organization_id == organization_id)
+        .where(AdoptionRequest.status == RequestStatus.approved)
+        .subquery("adopted")
+    )
+    keys = [adopted.c.group_key] if group else []
+    return select(*keys, adopted.c.days).where(adopted.c.approval_rank == 1).subquery("stays")
+
+
+def _summary(dialect: str, stays, keys: list):
+    days = stays.c.days
+    if dialect == "postgresql":
+        return select(
+            *keys, func.count(), func.avg(days),
+            func.percentile_cont(0.5).within_group(days), func.percentile_cont(0.9).within_group(days),
+        ).group_by(*keys)
+    # SQLite has no percentile functions: nearest-rank percentiles from row_number() over the sorted stays
+    ranked = select(
+        *keys, days,
+        func.row_number().over(partition_by=keys or None, order_by=days).label("rank"),
+        func.count().over(partition_by=keys or None).label("n"),
+    ).subquery("ranked")
+    ranked_keys = [ranked.c.group_key] if keys else []
+    return select(
+        *ranked_keys, func.count(), func.avg(ranked.c.days),
+        func.min(case((ranked.c.rank >= 0.5 * ranked.c.n, ranked.c.days))),
+        func.min(case((ranked.c.rank >= 0.9 * ranked.c.n, ranked.c.days))),
+    ).group_by(*ranked_keys)
+
+
+def _histogram_bucket(days):
+    return case(
+        *((days < upper, index) for index, upper in enumerate(HISTOGRAM_EDGES[1:])),
+        else_=len(HISTOGRAM_EDGES) - 1,
+    )
+
+
+def length_of_stay(session: Session, organization_id: int, group: str | None) -> list[dict]:
+    """
+    Length of stay of adopted animals (intake to the first approval of an adoption request) per 'group'
+    ("shelter", "species", "breed" or None for the whole organization): count, mean, p50, p90
+    and a histogram over HISTOGRAM_EDGES, all aggregated in the database.
+    """
+    dialect = session.get_bind().dialect.name
+    stays = _stays(dialect, organization_id, group)
+    keys = [stays.c.group_key] if group else []
+
+    bucket = _histogram_bucket(stays.c.days)
+    histograms: dict = {}
+    for *key, index, count in session.execute(select(*keys, bucket, func.count()).group_by(*keys, bucket)):
+        histograms.setdefault(tuple(key), {})[index] = count
+
+    # largest groups first
+    summaries = sorted(session.execute(_summary(dialect, stays, keys)).all(), key=lambda row: (-row[-4], str(row[0])))
+    results = []
+    for *key, adopted, mean, p50, p90 in summaries:
+        if not adopted:  # the ungrouped aggregate returns a row even without adoptions
+            continue
+        counts = histograms.get(tuple(key), {})
+        entry = {GROUP_COLUMNS[group].key: key[0]} if group else {}
+        entry.update(
+            adopted=adopted,
+            mean_days=round(float(mean), 1),
+            p50_days=round(float(p50), 1),
+            p90_days=round(float(p90), 1),
+            histogram=[
+                {
+                    "min_days": lower,
+                    "max_days": HISTOGRAM_EDGES[index + 1] if index + 1 < len(HISTOGRAM_EDGES) else None,
+                    "count": counts.get(index, 0),
+                }
+                for index, lower in enumerate(HISTOGRAM_EDGES)
+            ],
+        )
+        results.append(entry)
+    return results
+
+
+def length_of_stay_report(session: Session, organization_id: int, group: str | None) -> dict:
+    """length_of_stay() as served by the analytics endpoint, shelters named."""
+    groups = length_of_stay(session, organization_id, group)
+    if group == "shelter":
+        names = dict(session.execute(select(Shelter.id, Shelter.name).where(Shelter.organization_id == organization_id)).all())
+        for entry in groups:
+            entry["shelter_name"] = names.get(entry["shelter_id"])
+    return {"group_by": group, "groups": groups}
@@ -0,0 +1,49 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, ORMExecuteState, joinedload, raiseload, selectinload
+
+from app.core.config import settings
+from app.schemas.models import Animal, Organization, Shelter, Staff, User
+
+# Explicit loading strategies, passed per query as 'options='.
+# Delete cascades walk every child collection; loading them with selectinload up front
+# costs one query per relationship level instead of one per parent row.
+
+STAFF_WITH_SHELTER = [joinedload(Staff.shelter)]
+
+ANIMAL_WITH_SHELTER = [joinedload(Animal.shelter)]
+
+ANIMAL_DELETE_CASCADE = [
+    selectinload(Animal.medical_records),
+    selectinload(Animal.vaccinations),
+    selectinload(Animal.adoption_requests),
+]
+
+SHELTER_DELETE_CASCADE = [
+    selectinload(Shelter.staff_memberships),
+    *(selectinload(Shelter.animals).options(option) for option in ANIMAL_DELETE_CASCADE),
+]
+
+ORGANIZATION_DELETE_CASCADE = [
+    selectinload(Organization.shelters).options(*SHELTER_DELETE_CASCADE),
+]
+
+# deleting a user cascades to staff links and nulls the staff/adopter FKs on records
+USER_DELETE_CASCADE = [
+    selectinload(User.staff_users),
+    selectinload(User.medical_records),
+    selectinload(User.vaccinations),
+    joinedload(User.managed_organization),
+]
+
+
+@event.listens_for(Session, "do_orm_execute")
+def strict_lazy_loading(orm_execute_state: ORMExecuteState):
+    """
+    With STRICT_LAZY_LOADING every ORM select gets raiseload('*'): touching a relationship
+    that was not loaded explicitly raises instead of silently emitting a query (N+1).
+    Meant for tests and local development.
+    """
+    if not settings.STRICT_LAZY_LOADING:
+        return
+    if orm_execute_state.is_select and not (orm_execute_state.is_relationship_load or orm_execute_state.is_column_load):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*", sql_only=True))
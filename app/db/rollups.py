@@ -0,0 +1,251 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import Date, case, cast, delete, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.shelter_stats import _before, _enum
+from app.db.upsert import dialect_insert
+from app.schemas.enums import RequestStatus
+from app.schemas.models import AdoptionDailyStats, AdoptionRequest, AnalyticsRollupState, Animal, Shelter
+
+INTERVALS = ("day", "week", "month")
+COUNTERS = ("total_requests", "approved_requests", "rejected_requests")
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _as_date(value) -> date:
+    # SQLite hands back date() results as ISO strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def bucket_start(day: date, interval: str) -> date:
+    """First day of the bucket containing 'day' (weeks start on Monday)."""
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _bucket_column(session: Session, column, interval: str):
+    if interval == "day":
+        return column
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc(interval, column), Date)
+    if interval == "week":
+        return func.date(column, "-6 days", "weekday 1")
+    return func.date(column, "start of month")
+
+
+def _request_counts():
+    return (
+        func.count(),
+        func.count(case((AdoptionRequest.status == RequestStatus.approved, 1))),
+        func.count(case((AdoptionRequest.status == RequestStatus.rejected, 1))),
+    )
+
+
+def roll_up_days(session: Session, organization_id: int, start: date, end: date):
+    """(Re)materialize the organization's daily rows for request days in [start, end)."""
+    shelters = select(Shelter.id).where(Shelter.organization_id == organization_id)
+    session.execute(
+        delete(AdoptionDailyStats)
+        .where(AdoptionDailyStats.shelter_id.in_(shelters))
+        .where(AdoptionDailyStats.day >= start, AdoptionDailyStats.day < end)
+    )
+    day = func.date(AdoptionRequest.request_date)
+    rows = (
+        select(Animal.shelter_id, day, Animal.species_name, *_request_counts())
+        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
+        .where(Animal.shelter_id.in_(shelters))
+        .where(AdoptionRequest.request_date >= _day_start(start), AdoptionRequest.request_date < _day_start(end))
+        .group_by(Animal.shelter_id, day, Animal.species_name)
+    )
+    session.execute(
+        AdoptionDailyStats.__table__.insert().from_select(["shelter_id", "day", "species_name", *COUNTERS], rows)
+    )
+
+
+def closable_until() -> date:
+    """First day that cannot be closed yet: today, or yesterday during the first ROLLUP_CLOSE_LAG_SECONDS of a day."""
+    return (datetime.now(timezone.utc) - timedelta(seconds=settings.ROLLUP_CLOSE_LAG_SECONDS)).date()
+
+
+def close_days(session: Session, organization_id: int) -> date:
+    """
+    Materialize every closable day not rolled up yet and return the first open day. A day is
+    aggregated once; afterwards only late changes to its requests touch it (see track_late_changes).
+    The state row lock serializes concurrent dashboards closing the same days; the caller commits.
+    """
+    open_from = closable_until()
+    session.execute(
+        dialect_insert(session, AnalyticsRollupState).values(organization_id=organization_id)
+        .on_conflict_do_nothing(index_elements=["organization_id"])
+    )
+    state = session.execute(
+        select(AnalyticsRollupState).where(AnalyticsRollupState.organization_id == organization_id).with_for_update()
+    ).scalar_one()
+    if state.closed_until is None or state.closed_until < open_from:
+        start = state.closed_until
+        if start is None:
+            first = session.execute(
+                select(func.min(AdoptionRequest.request_date))
+                .join(Animal, Animal.id == AdoptionRequest.animal_id)
+                .join(Shelter, Shelter.id == Animal.shelter_id)
+                .where(Shelter.organization_id == organization_id)
+            ).scalar()
+            start = min(first.date(), open_from) if first else open_from
+        roll_up_days(session, organization_id, start, open_from)
+        state.closed_until = open_from
+    session.flush()
+    return state.closed_until
+
+
+def _accumulate(totals: dict, period: date, row, key_count: int):
+    counts = totals[(period, *row[:key_count])]
+    for i, n in enumerate(row[key_count:]):
+        counts[i] += n
+
+
+def adoption_timeseries(session: Session, organization_id: int, interval: str, start: date, end: date,
+                        by_shelter: bool, by_species: bool) -> list[dict]:
+    """
+    Request volume and outcomes per bucket over [start, end]: closed days come from the daily
+    rollup rows, the open ones (today, and yesterday just after midnight) are aggregated live
+    from adoptionrequest. Closes days on the way, the caller commits.
+    """
+    open_from = close_days(session, organization_id)
+    keys = []
+    if by_shelter:
+        keys.append("shelter_id")
+    if by_species:
+        keys.append("species_name")
+    totals = defaultdict(lambda: [0, 0, 0])
+
+    if start < open_from:
+        bucket = _bucket_column(session, AdoptionDailyStats.day, interval)
+        columns = [getattr(AdoptionDailyStats, key) for key in keys]
+        rows = session.execute(
+            select(bucket, *columns, *(func.sum(getattr(AdoptionDailyStats, c)) for c in COUNTERS))
+            .join(Shelter, Shelter.id == AdoptionDailyStats.shelter_id)
+            .where(Shelter.organization_id == organization_id)
+            .where(AdoptionDailyStats.day >= start, AdoptionDailyStats.day <= min(end, open_from - timedelta(days=1)))
+            .group_by(bucket, *columns)
+        )
+        for bucket_day, *row in rows:
+            _accumulate(totals, _as_date(bucket_day), row, len(keys))
+
+    live_start = max(start, open_from)
+    if live_start <= end:
+        day = func.date(AdoptionRequest.request_date)
+        columns = [getattr(Animal, key) for key in keys]
+        rows = session.execute(
+            select(day, *columns, *_request_counts())
+            .select_from(Animal)
+            .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id)
+            .join(Shelter, Shelter.id == Animal.shelter_id)
+            .where(Shelter.organization_id == organization_id)
+            .where(AdoptionRequest.request_date >= _day_start(live_start),
+                   AdoptionRequest.request_date < _day_start(end + timedelta(days=1)))
+            .group_by(day, *columns)
+        )
+        for request_day, *row in rows:
+            _accumulate(totals, bucket_start(_as_date(request_day), interval), row, len(keys))
+
+    series = []
+    for key, (total, approved, rejected) in sorted(totals.items()):
+        if not total:
+            continue
+        entry = {"period_start": key[0], **dict(zip(keys, key[1:]))}
+        entry.update(
+            total_requests=total,
+            approved_requests=approved,
+            rejected_requests=rejected,
+            success_rate=round(approved / total * 100, 2),
+        )
+        series.append(entry)
+    return series
+
+
+def rebuild_rollups(session: Session, organization_id: int | None = None):
+    """Drop the daily rows (one organization or all); the next time-series query rolls every closed day up again."""
+    shelters = select(Shelter.id)
+    states = delete(AnalyticsRollupState)
+    if organization_id is not None:
+        shelters = shelters.where(Shelter.organization_id == organization_id)
+        states = states.where(AnalyticsRollupState.organization_id == organization_id)
+    session.execute(delete(AdoptionDailyStats).where(AdoptionDailyStats.shelter_id.in_(shelters)))
+    session.execute(states)
+
+
+def apply_day_delta(session: Session, delta: dict, skip_shelters: set[int] = frozenset()):
+    """Upsert counter increments {(shelter_id, day, species_name): {column: n}} into the daily rows."""
+    for (shelter_id, day, species_name), counters in delta.items():
+        counters = {column: n for column, n in counters.items() if n}
+        if not counters or shelter_id in skip_shelters:
+            continue
+        stmt = dialect_insert(session, AdoptionDailyStats).values(
+            shelter_id=shelter_id, day=day, species_name=species_name, **counters)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["shelter_id", "day", "species_name"],
+            set_={column: getattr(AdoptionDailyStats, column) + getattr(stmt.excluded, column) for column in counters},
+        ))
+
+
+@event.listens_for(Session, "after_flush")
+def track_late_changes(session: Session, flush_context):
+    """
+    Requests dated before today (decided late, deleted, or back-dated by imports) adjust the
+    already closed day's row in the same transaction instead of invalidating it. Rows for days
+    not rolled up yet are replaced wholesale when they are, so the increments are harmless there.
+    Requests dated today are left to the roll-up, which runs ROLLUP_CLOSE_LAG_SECONDS after
+    midnight, once transactions flushed before midnight have committed.
+    Animals moving shelter or species are not followed; POST /analytics/rebuild reconciles.
+    """
+    today = utc_today()
+    delta = defaultdict(lambda: defaultdict(int))
+    animals = {}  # strong references, the identity map alone would let them be collected between lookups
+
+    def count(request_date, animal_id, status, sign):
+        if request_date is None or request_date.date() >= today:
+            return
+        if animal_id not in animals:
+            animals[animal_id] = session.get(Animal, animal_id)
+        animal = animals[animal_id]
+        if animal is None:
+            return
+        key = (animal.shelter_id, request_date.date(), animal.species_name)
+        delta[key]["total_requests"] += sign
+        status = _enum(RequestStatus, status)
+        if status == RequestStatus.approved:
+            delta[key]["approved_requests"] += sign
+        elif status == RequestStatus.rejected:
+            delta[key]["rejected_requests"] += sign
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, AdoptionRequest):
+                count(obj.request_date, obj.animal_id, obj.status, 1)
+        for obj in session.deleted:
+            if isinstance(obj, AdoptionRequest):
+                count(_before(obj, "request_date"), _before(obj, "animal_id"), _before(obj, "status"), -1)
+        for obj in session.dirty:
+            if isinstance(obj, AdoptionRequest) and session.is_modified(obj):
+                old_date, old_animal_id, old_status = (_before(obj, a) for a in ("request_date", "animal_id", "status"))
+                if (old_date, old_animal_id, _enum(RequestStatus, old_status)) == \
+                        (obj.request_date, obj.animal_id, _enum(RequestStatus, obj.status)):
+                    continue
+                count(old_date, old_animal_id, old_status, -1)
+                count(obj.request_date, obj.animal_id, obj.status, 1)
+
+        deleted_shelters = {obj.id for obj in session.deleted if isinstance(obj, Shelter)}
+        apply_day_delta(session, delta, deleted_shelters)
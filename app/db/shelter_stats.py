@@ -0,0 +1,244 @@
+from collections import defaultdict
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.schemas.enums import AdoptionStatus, RequestStatus
+from app.schemas.models import AdoptionRequest, Animal, Shelter, ShelterBreedStats, ShelterStats
+
+_DELETED_ANIMALS_KEY = "shelter_stats_deleted_animals"
+
+REQUEST_COUNTERS = {
+    RequestStatus.submitted: "pending_requests",
+    RequestStatus.approved: "approved_requests",
+    RequestStatus.rejected: "rejected_requests",
+}
+ANIMAL_COUNTERS = {
+    AdoptionStatus.available: "animals_available",
+    AdoptionStatus.pending: "animals_pending",
+    AdoptionStatus.adopted: "animals_adopted",
+    AdoptionStatus.quarantine: "animals_quarantine",
+}
+
+
+def _enum(enum_class, value):
+    # objects built in code may still hold the plain value ("Approved") or member name ("approved")
+    if value is None or isinstance(value, enum_class):
+        return value
+    try:
+        return enum_class(value)
+    except ValueError:
+        return enum_class[value]
+
+
+def _before(obj, attr):
+    """Value of 'attr' before the flush (the current value when unchanged)."""
+    history = inspect(obj).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(obj, attr)
+
+
+class StatsDelta:
+    """Counter changes of one flush, per shelter and per (shelter, breed)."""
+
+    def __init__(self):
+        self.shelters = defaultdict(lambda: defaultdict(int))
+        self.breeds = defaultdict(int)
+
+    def request(self, shelter_id, breed_name, status, sign):
+        status = _enum(RequestStatus, status)
+        self.shelters[shelter_id]["total_requests"] += sign
+        self.shelters[shelter_id][REQUEST_COUNTERS[status]] += sign
+        if status == RequestStatus.approved:
+            self.breeds[(shelter_id, breed_name)] += sign
+
+    def animal(self, shelter_id, status, sign):
+        self.shelters[shelter_id][ANIMAL_COUNTERS[_enum(AdoptionStatus, status)]] += sign
+
+
+def apply_stats_delta(session: Session, delta: StatsDelta, skip_shelters: set[int]):
+    """Upsert the increments: one row lock per touched shelter, safe under concurrent writers."""
+    for shelter_id, counters in delta.shelters.items():
+        counters = {column: n for column, n in counters.items() if n}
+        if not counters or shelter_id in skip_shelters:
+            continue
+        stmt = dialect_insert(session, ShelterStats).values(shelter_id=shelter_id, **counters)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["shelter_id"],
+            set_={column: getattr(ShelterStats, column) + getattr(stmt.excluded, column) for column in counters},
+        ))
+    for (shelter_id, breed_name), n in delta.breeds.items():
+        if not n or shelter_id in skip_shelters:
+            continue
+        stmt = dialect_insert(session, ShelterBreedStats).values(shelter_id=shelter_id, breed_name=breed_name, approved_requests=n)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["shelter_id", "breed_name"],
+            set_={"approved_requests": ShelterBreedStats.approved_requests + stmt.excluded.approved_requests},
+        ))
+
+
+def _moved_animal_requests(session: Session, animal: Animal, delta: StatsDelta, old_shelter, old_breed):
+    """An animal changing shelter or breed takes its adoption requests' counts along."""
+    rows = session.execute(
+        select(AdoptionRequest.status, func.count()).where(AdoptionRequest.animal_id == animal.id)
+        .group_by(AdoptionRequest.status)
+    ).all()
+    for status, n in rows:
+        delta.request(old_shelter, old_breed, status, -n)
+        delta.request(animal.shelter_id, animal.breed_name, status, n)
+
+
+def _deleted_request_animal(session: Session, request: AdoptionRequest, deleted_animals: dict) -> tuple | None:
+    """
+    (shelter_id, breed_name) of the deleted request's animal before the flush. An animal deleted in
+    this transaction is already gone from the database: take it from the deletions recorded so far,
+    or from the request's loaded relationship.
+    """
+    animal_id = _before(request, "animal_id")
+    if animal_id in deleted_animals:
+        return deleted_animals[animal_id]
+    animal = inspect(request).dict.get("animal")
+    if animal is None or animal.id != animal_id:
+        animal = session.get(Animal, animal_id)
+    return None if animal is None else (_before(animal, "shelter_id"), _before(animal, "breed_name"))
+
+
+@event.listens_for(Session, "after_flush")
+def maintain_shelter_stats(session: Session, flush_context):
+    """
+    Keep ShelterStats / ShelterBreedStats in step with the animals and adoption requests written
+    by this flush, inside the same transaction. Attribute history still holds the pre-flush
+    values here, so updates subtract the old state and add the new one.
+    """
+    delta = StatsDelta()
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Animal):
+                delta.animal(obj.shelter_id, obj.status, 1)
+            elif isinstance(obj, AdoptionRequest):
+                animal = session.get(Animal, obj.animal_id)
+                delta.request(animal.shelter_id, animal.breed_name, obj.status, 1)
+
+        # kept until the transaction ends: a request may be deleted in a later flush than its animal
+        deleted_animals = session.info.setdefault(_DELETED_ANIMALS_KEY, {})
+        for obj in session.deleted:
+            if isinstance(obj, Animal):
+                delta.animal(_before(obj, "shelter_id"), _before(obj, "status"), -1)
+                deleted_animals[obj.id] = (_before(obj, "shelter_id"), _before(obj, "breed_name"))
+        for obj in session.deleted:
+            if isinstance(obj, AdoptionRequest):
+                animal = _deleted_request_animal(session, obj, deleted_animals)
+                if animal is not None:
+                    delta.request(*animal, _before(obj, "status"), -1)
+
+        for obj in session.dirty:
+            if isinstance(obj, Animal) and session.is_modified(obj):
+                old_shelter, old_status, old_breed = (_before(obj, a) for a in ("shelter_id", "status", "breed_name"))
+                if (old_shelter, _enum(AdoptionStatus, old_status)) != (obj.shelter_id, _enum(AdoptionStatus, obj.status)):
+                    delta.animal(old_shelter, old_status, -1)
+                    delta.animal(obj.shelter_id, obj.status, 1)
+                if (old_shelter, old_breed) != (obj.shelter_id, obj.breed_name):
+                    _moved_animal_requests(session, obj, delta, old_shelter, old_breed)
+            elif isinstance(obj, AdoptionRequest) and session.is_modified(obj):
+                old_animal_id, old_status = _before(obj, "animal_id"), _before(obj, "status")
+                if (old_animal_id, _enum(RequestStatus, old_status)) == (obj.animal_id, _enum(RequestStatus, obj.status)):
+                    continue
+                old_animal = session.get(Animal, old_animal_id)
+                animal = session.get(Animal, obj.animal_id)
+                delta.request(old_animal.shelter_id, old_animal.breed_name, old_status, -1)
+                delta.request(animal.shelter_id, animal.breed_name, obj.status, 1)
+
+        # shelters deleted in this flush lose their counter rows through the FK cascade
+        deleted_shelters = {obj.id for obj in session.deleted if isinstance(obj, Shelter)}
+        if delta.shelters or delta.breeds:
+            apply_stats_delta(session, delta, deleted_shelters)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def forget_deleted_animals(session: Session):
+    session.info.pop(_DELETED_ANIMALS_KEY, None)
+
+
+def rebuild_shelter_stats(session: Session, organization_id: int | None = None):
+    """
+    Reconciliation: recompute the counters from animals and adoption requests, for one
+    organization or everything. Runs in the caller's transaction; commit to publish.
+    """
+    shelters = select(Shelter.id)
+    if organization_id is not None:
+        shelters = shelters.where(Shelter.organization_id == organization_id)
+    shelter_ids = session.execute(shelters).scalars().all()
+
+    delta = StatsDelta()
+    for shelter_id in shelter_ids:
+        delta.shelters[shelter_id]  # every shelter gets a row, even without animals
+    scope = Animal.shelter_id.in_(shelters)
+    for shelter_id, status, n in session.execute(
+        select(Animal.shelter_id, Animal.status, func.count()).where(scope).group_by(Animal.shelter_id, Animal.status)
+    ):
+        delta.animal(shelter_id, status, n)
+    for shelter_id, breed_name, status, n in session.execute(
+        select(Animal.shelter_id, Animal.breed_name, AdoptionRequest.status, func.count())
+        .join(AdoptionRequest, AdoptionRequest.animal_id == Animal.id).where(scope)
+        .group_by(Animal.shelter_id, Animal.breed_name, AdoptionRequest.status)
+    ):
+        delta.request(shelter_id, breed_name, status, n)
+
+    session.execute(delete(ShelterStats).where(ShelterStats.shelter_id.in_(shelters)))
+    session.execute(delete(ShelterBreedStats).where(ShelterBreedStats.shelter_id.in_(shelters)))
+    session.add_all(ShelterStats(shelter_id=shelter_id, **counters) for shelter_id, counters in delta.shelters.items())
+    session.add_all(
+        ShelterBreedStats(shelter_id=shelter_id, breed_name=breed_name, approved_requests=n)
+        for (shelter_id, breed_name), n in delta.breeds.items() if n
+    )
+    session.flush()
+
+
+def basic_analytics(session: Session, organization_id: int) -> dict:
+    """Success rate per shelter and top 3 adopted breeds of one organization."""
+    # Adoption success rate per shelter, from the counters kept by the write paths (O(shelters))
+    adoption_success_query = (
+        select(Shelter.name, ShelterStats)
+        .join(ShelterStats, ShelterStats.shelter_id == Shelter.id)
+        .where(Shelter.organization_id == organization_id)
+        .where(ShelterStats.total_requests > 0)
+        .order_by(Shelter.id)
+    )
+
+    success_rate_per_shelter = [
+        {
+            "shelter_name": name,
+            "total_requests": stats.total_requests,
+            "approved_requests": stats.approved_requests,
+            "rejected_requests": stats.rejected_requests,
+            "pending_requests": stats.pending_requests,
+            "success_rate": round((stats.approved_requests / stats.total_requests) * 100, 2),
+            "animals_by_status": {
+                status.value: getattr(stats, column) for status, column in ANIMAL_COUNTERS.items()
+            },
+        }
+        for name, stats in session.execute(adoption_success_query).all()
+    ]
+
+    # Top 3 adopted breeds
+    adopted_count = func.sum(ShelterBreedStats.approved_requests)
+    top_breeds_query = (
+        select(ShelterBreedStats.breed_name, adopted_count)
+        .join(Shelter, Shelter.id == ShelterBreedStats.shelter_id)
+        .where(Shelter.organization_id == organization_id)
+        .group_by(ShelterBreedStats.breed_name)
+        .having(adopted_count > 0)
+        .order_by(adopted_count.desc())
+        .limit(3)
+    )
+
+    top_breeds = [
+        {"breed": breed, "adopted_count": count}
+        for breed, count in session.execute(top_breeds_query).all()
+    ]
+
+    return {
+        "adoption_success_per_shelter": success_rate_per_shelter,
+        "top_adopted_breeds": top_breeds
+    }
@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+from sqlalchemy import Date, and_, delete, exists, func, literal, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.db.rollups import _day_start
+from app.schemas.models import Animal, Vaccination, VaccinationDue
+
+_COLUMNS = (
+    Animal.shelter_id,
+    Vaccination.id,
+    Vaccination.animal_id,
+    Animal.name,
+    Vaccination.vaccine_type,
+    Vaccination.vaccination_date,
+    Vaccination.valid_until,
+)
+
+
+def _latest_expiring(horizon: date, shelter_ids=None, changed_since=None):
+    """
+    Ids of the latest vaccination per (animal, vaccine type) among animals with a vaccination
+    expiring by 'horizon' (or, with 'changed_since', one written since then). The valid_until
+    and updated_at indexes narrow the animals before the window runs, ix_vaccination_animal_type_date
+    serves the partitions in order.
+    """
+    rank = func.row_number().over(
+        partition_by=(Vaccination.animal_id, Vaccination.vaccine_type),
+        order_by=(Vaccination.vaccination_date.desc(), Vaccination.id.desc()),
+    )
+    if changed_since is None:
+        animals = select(Vaccination.animal_id).where(Vaccination.valid_until <= horizon)
+    else:
+        animals = select(Vaccination.animal_id).where(Vaccination.updated_at >= changed_since)
+    ranked = (
+        select(Vaccination.id, Vaccination.valid_until, rank.label("rank"))
+        .where(Vaccination.animal_id.in_(animals))
+    )
+    if shelter_ids is not None:
+        ranked = ranked.join(Animal, Animal.id == Vaccination.animal_id).where(Animal.shelter_id.in_(shelter_ids))
+    ranked = ranked.subquery("ranked")
+    return select(ranked.c.id).where(ranked.c.rank == 1, ranked.c.valid_until <= horizon)
+
+
+def _superseded():
+    """A newer vaccination of the same type exists for the animal (renewed since the list was computed)."""
+    newer = aliased(Vaccination)
+    return exists().where(
+        newer.animal_id == Vaccination.animal_id,
+        newer.vaccine_type == Vaccination.vaccine_type,
+        or_(
+            newer.vaccination_date > Vaccination.vaccination_date,
+            and_(newer.vaccination_date == Vaccination.vaccination_date, newer.id > Vaccination.id),
+        ),
+    )
+
+
+def due_vaccinations(session: Session, shelter_ids: list[int], today: date, within_days: int) -> tuple[list, bool]:
+    """
+    Latest vaccination per animal and vaccine type expiring within 'within_days' (or already
+    expired) for the given shelters, ordered by shelter and expiry. Served from today's
+    precomputed list when it covers the range; its entries are re-checked against the current
+    rows, so renewed, edited or deleted vaccinations drop out, and the animals whose vaccinations
+    were written today are evaluated live, so new or renewed ones that are due show up.
+    Returns (rows, precomputed).
+    """
+    horizon = today + timedelta(days=within_days)
+    query = (
+        select(*_COLUMNS)
+        .join(Animal, Animal.id == Vaccination.animal_id)
+        .where(Animal.shelter_id.in_(shelter_ids), Vaccination.valid_until <= horizon)
+        .order_by(Animal.shelter_id, Vaccination.valid_until, Vaccination.id)
+    )
+    precomputed = within_days <= settings.VACCINATION_DUE_DAYS and session.execute(
+        select(VaccinationDue.as_of).where(VaccinationDue.as_of == today).limit(1)
+    ).first() is not None
+    if precomputed:
+        listed = select(VaccinationDue.vaccination_id).where(VaccinationDue.as_of == today)
+        # the list may have been computed at any time today: a change since midnight is evaluated live
+        changed = _latest_expiring(horizon, shelter_ids, changed_since=_day_start(today))
+        query = query.where(or_(
+            and_(Vaccination.id.in_(listed), ~_superseded()),
+            Vaccination.id.in_(changed),
+        ))
+    else:
+        query = query.where(Vaccination.id.in_(_latest_expiring(horizon, shelter_ids)))
+    return session.execute(query).all(), precomputed
+
+
+def precompute_due(session: Session, today: date) -> int:
+    """Replace the daily due list with today's (all organizations, VACCINATION_DUE_DAYS ahead)."""
+    horizon = today + timedelta(days=settings.VACCINATION_DUE_DAYS)
+    session.execute(delete(VaccinationDue))
+    latest = _latest_expiring(horizon).subquery("latest")
+    result = session.execute(
+        VaccinationDue.__table__.insert().from_select(
+            ["as_of", "vaccination_id"], select(literal(today, Date), latest.c.id)
+        )
+    )
+    return result.rowcount
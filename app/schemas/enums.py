@@ -16,4 +16,10 @@ class AdoptionStatus(str, PyEnum):
 class RequestStatus(str, PyEnum):
     submitted = "Submitted"
     approved = "Approved"
-    rejected = "Rejected"
\ No newline at end of file
+    rejected = "Rejected"
+
+class ExportStatus(str, PyEnum):
+    queued = "Queued"
+    running = "Running"
+    completed = "Completed"
+    failed = "Failed"
@@ -1,9 +1,9 @@
 from datetime import date, datetime, timezone
 from typing import Optional
-from app.schemas.enums import AdoptionStatus, RequestStatus, UserRole
+from app.schemas.enums import AdoptionStatus, ExportStatus, RequestStatus, UserRole
 from pydantic import EmailStr
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column
+from sqlalchemy import JSON, Column, Index, Integer
 from sqlalchemy.dialects.postgresql import ENUM
 from app.schemas.schema_shelter import ShelterBase
 from app.schemas.schema_user import UserBase
@@ -15,6 +15,18 @@ from app.schemas.schema_AdoptionRequest import AdoptionRequestBase
 def enum_column(enum_class):
     return Column(ENUM(enum_class, name=enum_class.__name__.lower()), nullable=False)
 
+def utc_now():
+    return datetime.now(timezone.utc)
+
+#helper for optimistic locking: the ORM adds "AND version = <loaded>" to its UPDATEs and raises StaleDataError
+#when another transaction changed the row first; pass the same column as __mapper_args__["version_id_col"]
+def version_column():
+    return Column("version", Integer, nullable=False, server_default="1")
+
+#helper for updated_at columns, refreshed by SQLAlchemy on every UPDATE (used by delta sync)
+def updated_at_field():
+    return Field(default_factory=utc_now, index=True, sa_column_kwargs={"onupdate": utc_now})
+
 class Organization(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
@@ -58,11 +70,19 @@ class Staff(SQLModel, table=True):
     user: User = Relationship(back_populates="staff_users")
     shelter : Shelter = Relationship(back_populates="staff_memberships")
 
+_animal_version = version_column()
+
 class Animal(AnimalBase, table=True):
     id:Optional[int] = Field(default=None, primary_key=True)
     shelter_id:int = Field(foreign_key="shelter.id")
     status: AdoptionStatus = Field(sa_column=enum_column(AdoptionStatus))
-    created_at: datetime = Field(default_factory=lambda :datetime.now(timezone.utc))
+    # intake time, also the cohort of the funnel analytics
+    created_at: datetime = Field(default_factory=lambda :datetime.now(timezone.utc), index=True)
+    updated_at: datetime = updated_at_field()
+    # concurrent approvals of two requests for the animal: the second one's UPDATE matches no row
+    version: int = Field(default=1, sa_column=_animal_version)
+
+    __mapper_args__ = {"version_id_col": _animal_version}
 
     shelter: Shelter = Relationship(back_populates="animals")
     medical_records: list["MedicalRecord"] = Relationship(back_populates="animal", cascade_delete=True)
@@ -76,44 +96,131 @@ class MedicalRecord(SQLModel, table=True):
     vet_notes: Optional[str] = None
     exam_date: date
     condition: Optional[str] = None
+    updated_at: datetime = updated_at_field()
 
     animal: Animal = Relationship(back_populates="medical_records")
     staff_user: Optional[User] = Relationship(back_populates="medical_records")
 
 class Vaccination(SQLModel, table=True):
+    # latest vaccination per animal and vaccine type (due report window) without sorting the table
+    __table_args__ = (Index("ix_vaccination_animal_type_date", "animal_id", "vaccine_type", "vaccination_date"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     animal_id: int = Field(foreign_key="animal.id")
     staff_user_id: Optional[int] = Field(default=None, foreign_key="user.id", ondelete="SET NULL")
     vaccine_type: str
     vaccination_date: date
-    valid_until: date
+    valid_until: date = Field(index=True)
     notes: Optional[str] = None
+    updated_at: datetime = updated_at_field()
 
     animal: Animal = Relationship(back_populates="vaccinations")
     staff_user: Optional["User"] = Relationship(back_populates="vaccinations")
 
+_adoption_request_version = version_column()
+
 class AdoptionRequest(AdoptionRequestBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    animal_id: int = Field(foreign_key="animal.id")
+    animal_id: int = Field(foreign_key="animal.id", index=True)
     adopter_user_id: Optional[int] = Field(foreign_key="user.id", ondelete="SET NULL")
     status: RequestStatus = Field(sa_column=enum_column(RequestStatus))
-    request_date: datetime = Field(default_factory=lambda : datetime.now(timezone.utc))
+    request_date: datetime = Field(default_factory=lambda : datetime.now(timezone.utc), index=True)
+    # set when the request is approved or rejected
+    decided_at: Optional[datetime] = None
+    # ETag / If-Match of the request endpoints
+    version: int = Field(default=1, sa_column=_adoption_request_version)
+
+    __mapper_args__ = {"version_id_col": _adoption_request_version}
 
     animal: Animal = Relationship(back_populates="adoption_requests")
     adopter_user: Optional["User"] = Relationship()
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+class Tombstone(SQLModel, table=True):
+    """Deleted (or moved out of a shelter) rows, so offline clients can drop them on sync."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity: str
+    entity_id: int
+    organization_id: int = Field(index=True)
+    shelter_id: int = Field(index=True)
+    deleted_at: datetime = Field(default_factory=utc_now, index=True)
+
+class ShelterStats(SQLModel, table=True):
+    """Per-shelter counters kept current by the animal / adoption request write paths (app/db/shelter_stats.py)."""
+    shelter_id: int = Field(foreign_key="shelter.id", primary_key=True, ondelete="CASCADE")
+    total_requests: int = 0
+    approved_requests: int = 0
+    rejected_requests: int = 0
+    pending_requests: int = 0
+    animals_available: int = 0
+    animals_pending: int = 0
+    animals_adopted: int = 0
+    animals_quarantine: int = 0
+
+class ShelterBreedStats(SQLModel, table=True):
+    """Approved adoption requests per shelter and breed (top adopted breeds)."""
+    shelter_id: int = Field(foreign_key="shelter.id", primary_key=True, ondelete="CASCADE")
+    breed_name: str = Field(primary_key=True)
+    approved_requests: int = 0
+
+class AdoptionDailyStats(SQLModel, table=True):
+    """Adoption requests per shelter, request day (UTC) and species; closed days are rolled up once (app/db/rollups.py)."""
+    shelter_id: int = Field(foreign_key="shelter.id", primary_key=True, ondelete="CASCADE")
+    day: date = Field(primary_key=True)
+    species_name: str = Field(primary_key=True)
+    total_requests: int = 0
+    approved_requests: int = 0
+    rejected_requests: int = 0
+
+class AnalyticsRollupState(SQLModel, table=True):
+    """Days before 'closed_until' are materialized in AdoptionDailyStats for the organization."""
+    organization_id: int = Field(foreign_key="organization.id", primary_key=True, ondelete="CASCADE")
+    closed_until: Optional[date] = None
+
+class VaccinationDue(SQLModel, table=True):
+    """Daily due list written by scripts/precompute_vaccinations_due.py: latest vaccinations expiring soon."""
+    as_of: date = Field(primary_key=True)
+    vaccination_id: int = Field(foreign_key="vaccination.id", primary_key=True, ondelete="CASCADE")
+
+class ExportJob(SQLModel, table=True):
+    """Columnar export of one organization's data; files are written under EXPORT_DIR (app/core/exports.py)."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    organization_id: int = Field(foreign_key="organization.id", index=True, ondelete="CASCADE")
+    requested_by_user_id: Optional[int] = Field(default=None, foreign_key="user.id", ondelete="SET NULL")
+    format: str
+    status: ExportStatus = Field(sa_column=enum_column(ExportStatus))
+    rows: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=utc_now)
+    finished_at: Optional[datetime] = None
+    # process running the job ("host:pid") and its last sign of life, see fail_stale_exports
+    owner: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+
+class AnalyticsGeneration(SQLModel, table=True):
+    """Bumped by every write to an organization's analytics inputs; cached results of older generations are stale in every process."""
+    organization_id: int = Field(foreign_key="organization.id", primary_key=True, ondelete="CASCADE")
+    generation: int = 0
+
+class AnalyticsSnapshot(SQLModel, table=True):
+    """Precomputed analytics payload per organization (app/core/precompute.py); 'dirty' is set by writes."""
+    organization_id: int = Field(foreign_key="organization.id", primary_key=True, ondelete="CASCADE")
+    name: str = Field(primary_key=True)
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
+    computed_at: datetime
+    dirty: bool = False
+
+class DailyJobRun(SQLModel, table=True):
+    """Last UTC day a daily job ran: the process that moves 'run_on' to today runs it (app/core/precompute.py)."""
+    name: str = Field(primary_key=True)
+    run_on: date
+
+class IdempotencyKey(SQLModel, table=True):
+    """Outcome of a POST sent with an Idempotency-Key header, replayed on retries until it expires (app/core/idempotency.py)."""
+    user_id: int = Field(primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    request_hash: bytes  # sha256 of method, path, query and body
+    claim_token: str = Field(max_length=32)  # random per claim: identifies the request that holds the key
+    status_code: Optional[int] = None  # None while the first request runs
+    headers: Optional[list] = Field(default=None, sa_column=Column(JSON))  # [name, value] pairs of the response
+    body: Optional[bytes] = None
+    created_at: datetime = Field(default_factory=utc_now)
+    expires_at: datetime = Field(index=True)
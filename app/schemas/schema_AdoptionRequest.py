@@ -19,6 +19,8 @@ class AdoptionRequestRead(AdoptionRequestBase):
     id: int
     adopter_user_id: int
     request_date: datetime
+    decided_at: Optional[datetime] = None
+    version: int
 
 class AdoptionRequestUpdate(AdoptionRequestBase):
     animal_id: Optional[int] = None
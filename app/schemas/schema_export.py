@@ -0,0 +1,24 @@
+from sqlmodel import SQLModel
+from typing import Literal, Optional
+from datetime import datetime
+from app.schemas.enums import ExportStatus
+
+ExportFormat = Literal["parquet", "arrow"]
+
+class ExportJobCreate(SQLModel):
+    format: ExportFormat = "parquet"
+
+class ExportFileRead(SQLModel):
+    entity: str
+    size_bytes: int
+    url: str
+
+class ExportJobRead(SQLModel):
+    id: int
+    format: ExportFormat
+    status: ExportStatus
+    rows: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    files: list[ExportFileRead] = []
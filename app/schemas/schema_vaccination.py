@@ -1,6 +1,6 @@
 from sqlmodel import SQLModel
 from datetime import  date
-from typing import Optional
+from typing import Literal, Optional
 
 class VaccinationBase(SQLModel):
     animal_id: int
@@ -22,4 +22,24 @@ class VaccinationUpdate(VaccinationBase):
     vaccination_date: Optional[date] = None
     vaccine_type : Optional[str] = None
     valid_until : Optional[date] = None
-    notes : Optional[str] = None
\ No newline at end of file
+    notes : Optional[str] = None
+
+class VaccinationDueItem(SQLModel):
+    vaccination_id: int
+    animal_id: int
+    animal_name: str
+    vaccine_type: str
+    vaccination_date: date
+    valid_until: date
+    days_left: int
+    status: Literal["due", "overdue"]
+
+class VaccinationDueShelter(SQLModel):
+    shelter_id: int
+    vaccinations: list[VaccinationDueItem]
+
+class VaccinationDueReport(SQLModel):
+    as_of: date
+    within_days: int
+    precomputed: bool
+    shelters: list[VaccinationDueShelter]
@@ -0,0 +1,7 @@
+"""
+Reproducible load tests for the PawBase API.
+
+    python -m benchmarks run --scale small --requests 2000 --concurrency 8 --output bench.json
+    python -m benchmarks run --mode http --base-url http://localhost:8000 --duration 60
+    python -m benchmarks compare before.json after.json
+"""
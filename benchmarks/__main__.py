@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import sys
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="PawBase load tests")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="seed a database and run a workload")
+    run.add_argument("--database-url", default="sqlite:///./bench.db",
+                     help="database to seed and benchmark, must be empty unless --reset is given")
+    run.add_argument("--scale", default="small", help="dataset preset: small, medium, large, xlarge, dense")
+    run.add_argument("--seed", type=int, default=42, help="RNG seed for data and request mix")
+    run.add_argument("--skip-seed", action="store_true", help="reuse the existing data")
+    run.add_argument("--reset", action="store_true", help="drop every table of --database-url before seeding")
+    run.add_argument("--seed-workers", type=int, default=1, help="processes generating seed data")
+    run.add_argument("--workload", default="mixed", help="public, staff, login, analytics, cohorts or mixed")
+    run.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    run.add_argument("--base-url", default="http://localhost:8000", help="server for --mode http")
+    run.add_argument("--requests", type=int, default=1000, help="operations to run (ignored with --duration)")
+    run.add_argument("--duration", type=float, default=None, help="run for this many seconds instead")
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--output", default=None, help="write the JSON report here (default: stdout)")
+
+    approvals = commands.add_parser("approvals", help="stress concurrent approvals, exit 1 on a double adoption")
+    approvals.add_argument("--database-url", default="sqlite:///./bench.db",
+                           help="database to use, the server's own with --mode http (a new organization is added)")
+    approvals.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    approvals.add_argument("--base-url", default="http://localhost:8000", help="server for --mode http")
+    approvals.add_argument("--animals", type=int, default=50)
+    approvals.add_argument("--requests-per-animal", type=int, default=8)
+    approvals.add_argument("--concurrency", type=int, default=8)
+
+    compare = commands.add_parser("compare", help="compare two JSON reports")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.add_argument("--threshold", type=float, default=10.0, help="p95 growth in percent counted as regression")
+    return parser.parse_args(argv)
+
+
+def _client_factory(args):
+    if args.mode == "http":
+        import httpx
+
+        def make_client():
+            return httpx.Client(base_url=args.base_url, timeout=30)
+    else:
+        from fastapi.testclient import TestClient
+        from main import app
+
+        def make_client():
+            return TestClient(app)
+    return make_client
+
+
+def run(args):
+    # settings are read on import, point the app at the benchmark database first
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import inspect
+    from sqlmodel import SQLModel
+    from app.db.database import engine
+    from benchmarks.runner import build_report, run_workload
+    from benchmarks.seeding import SCALES, seed_database
+    from benchmarks.workloads import WORKLOADS, build_context
+
+    if os.getenv("ENV", "development") == "production":
+        raise SystemExit("Benchmarks are disabled in production!")
+    if args.scale not in SCALES or args.workload not in WORKLOADS:
+        raise SystemExit(f"unknown scale or workload, choose from {list(SCALES)} / {list(WORKLOADS)}")
+    engine.echo = False
+
+    if not args.skip_seed:
+        from app.schemas import models  # noqa: F401  register tables before drop_all
+        if inspect(engine).get_table_names():
+            if not args.reset:
+                raise SystemExit(f"{engine.url} is not empty: pass --reset to drop its tables, or --skip-seed")
+            SQLModel.metadata.drop_all(engine)
+        print(f"seeding {args.scale} dataset ...", file=sys.stderr)
+        seed_database(engine, args.scale, args.seed, workers=args.seed_workers)
+
+    make_client = _client_factory(args)
+    with make_client() as client:
+        ctx = build_context(engine, client)
+    total_requests = None if args.duration else args.requests
+    print(f"running {args.workload} workload ({args.mode}, concurrency {args.concurrency}) ...", file=sys.stderr)
+    samples, wall_seconds = run_workload(make_client, ctx, WORKLOADS[args.workload], concurrency=args.concurrency,
+                                         total_requests=total_requests, duration=args.duration, seed=args.seed)
+    report = build_report(samples, wall_seconds, {
+        "mode": args.mode, "workload": args.workload, "scale": args.scale, "seed": args.seed,
+        "concurrency": args.concurrency, "database": engine.dialect.name,
+    })
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def approvals(args):
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlmodel import SQLModel
+    from app.db.database import engine
+    from app.schemas import models  # noqa: F401  register tables before create_all
+    from benchmarks.approvals import run_approvals
+
+    if os.getenv("ENV", "development") == "production":
+        raise SystemExit("Benchmarks are disabled in production!")
+    engine.echo = False
+    SQLModel.metadata.create_all(engine)
+    make_client = _client_factory(args)
+    report = run_approvals(make_client, engine, animals=args.animals, requests_per_animal=args.requests_per_animal,
+                           concurrency=args.concurrency)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["problems"] else 0)
+
+
+def compare(args):
+    from benchmarks.runner import compare_reports
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    lines, regressed = compare_reports(before, after, args.threshold)
+    print("\n".join(lines))
+    sys.exit(1 if regressed else 0)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "run":
+        run(args)
+    elif args.command == "approvals":
+        approvals(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from app.core.jwt import create_access_token
+from app.schemas.enums import AdoptionStatus, RequestStatus, UserRole
+from app.schemas.models import AdoptionRequest, Animal, Organization, Shelter, ShelterStats, User
+
+
+def create_contested_animals(engine, animals: int, requests_per_animal: int) -> tuple[dict, dict[int, list[int]]]:
+    """A fresh organization whose animals each have 'requests_per_animal' open requests; (admin headers, requests per animal)."""
+    tag = uuid.uuid4().hex[:8]
+    with Session(engine) as session:
+        admin = User(email=f"stress-admin-{tag}@example.org", password="-", role=UserRole.org_admin)
+        session.add(admin)
+        session.flush()
+        organization = Organization(name=f"Approval stress {tag}", admin_id=admin.id)
+        session.add(organization)
+        session.flush()
+        shelter = Shelter(name=f"Stress shelter {tag}", organization_id=organization.id)
+        adopters = [User(email=f"stress-adopter-{tag}-{i}@example.org", password="-", role=UserRole.adopter)
+                    for i in range(requests_per_animal)]
+        session.add_all([shelter, *adopters])
+        session.flush()
+        contested = []
+        for i in range(animals):
+            animal = Animal(name=f"Contested {i}", species_name="dog", breed_name="mixed", shelter_id=shelter.id,
+                            status=AdoptionStatus.available, is_neutered=True)
+            session.add(animal)
+            contested.append(animal)
+        session.flush()
+        requests = {
+            animal.id: [AdoptionRequest(animal_id=animal.id, adopter_user_id=adopter.id, status=RequestStatus.submitted)
+                        for adopter in adopters]
+            for animal in contested
+        }
+        session.add_all(request for per_animal in requests.values() for request in per_animal)
+        session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(admin.id)}"}
+        return headers, {animal_id: [request.id for request in per_animal] for animal_id, per_animal in requests.items()}
+
+
+def verify(engine, requests: dict[int, list[int]]) -> list[str]:
+    """Invariants after the run: one approval per animal, the rest rejected, counters matching the rows."""
+    problems = []
+    animal_ids = list(requests)
+    with Session(engine) as session:
+        statuses = session.execute(
+            select(AdoptionRequest.animal_id, AdoptionRequest.status, func.count())
+            .where(AdoptionRequest.animal_id.in_(animal_ids))
+            .group_by(AdoptionRequest.animal_id, AdoptionRequest.status)
+        ).all()
+        per_animal = {animal_id: Counter() for animal_id in animal_ids}
+        for animal_id, status, n in statuses:
+            per_animal[animal_id][RequestStatus(status)] = n
+        for animal_id, counts in per_animal.items():
+            if counts[RequestStatus.approved] != 1:
+                problems.append(f"animal {animal_id}: {counts[RequestStatus.approved]} approved requests")
+            if counts[RequestStatus.submitted]:
+                problems.append(f"animal {animal_id}: {counts[RequestStatus.submitted]} requests still open")
+        not_adopted = session.execute(
+            select(func.count()).where(Animal.id.in_(animal_ids), Animal.status != AdoptionStatus.adopted)
+        ).scalar()
+        if not_adopted:
+            problems.append(f"{not_adopted} animals with an approved request are not adopted")
+        shelter_id = session.get(Animal, animal_ids[0]).shelter_id
+        stats = session.get(ShelterStats, shelter_id)
+        expected = sum(len(ids) for ids in requests.values())
+        counters = (stats.total_requests, stats.approved_requests, stats.rejected_requests, stats.pending_requests)
+        if counters != (expected, len(animal_ids), expected - len(animal_ids), 0):
+            problems.append(f"shelter counters (total, approved, rejected, pending) are {counters}")
+    return problems
+
+
+def run_approvals(make_client, engine, *, animals: int, requests_per_animal: int, concurrency: int) -> dict:
+    """
+    Approve every request of every contested animal at once from 'concurrency' threads and check
+    that exactly one approval per animal won.
+    """
+    headers, requests = create_contested_animals(engine, animals, requests_per_animal)
+    local = threading.local()
+    clients = []
+
+    def approve(request_id: int) -> int:
+        if not hasattr(local, "client"):
+            local.client = make_client()
+            local.client.__enter__()
+            clients.append(local.client)
+        response = local.client.patch(f"/api/internal/adoptionRequests/{request_id}", headers=headers,
+                                      json={"status": RequestStatus.approved.value})
+        return response.status_code
+
+    started = time.perf_counter()
+    # interleave the animals' requests so the competing approvals for one animal run side by side
+    order = [ids[i] for i in range(requests_per_animal) for ids in requests.values()]
+    with ThreadPoolExecutor(concurrency) as pool:
+        codes = Counter(pool.map(approve, order))
+    wall_seconds = time.perf_counter() - started
+    for client in clients:
+        client.__exit__(None, None, None)
+
+    problems = verify(engine, requests)
+    if codes[200] != animals:
+        problems.append(f"{codes[200]} successful approvals for {animals} animals")
+    return {
+        "animals": animals,
+        "requests_per_animal": requests_per_animal,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall_seconds, 3),
+        "responses": {str(code): n for code, n in sorted(codes.items())},
+        "problems": problems,
+    }
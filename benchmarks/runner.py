@@ -0,0 +1,118 @@
+import re
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+import random
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    seconds: float
+    queries: int | None
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def queries_of(response) -> int | None:
+    match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def run_workload(make_client, ctx, operations, *, concurrency: int, total_requests: int | None,
+                 duration: float | None, seed: int) -> tuple[list[Sample], float]:
+    """
+    Drive 'operations' from 'concurrency' threads, each with its own client and seeded RNG,
+    until 'total_requests' requests were sent or 'duration' seconds passed.
+    """
+    weights = [weight for weight, _ in operations]
+    functions = [operation for _, operation in operations]
+    samples: list[Sample] = []
+    lock = threading.Lock()
+    sent = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker(worker_id: int):
+        nonlocal sent
+        rng = random.Random(seed * 1000 + worker_id)
+        with make_client() as client:
+            while True:
+                with lock:
+                    if (total_requests is not None and sent >= total_requests) or (deadline and time.perf_counter() >= deadline):
+                        return
+                    sent += 1
+                operation = rng.choices(functions, weights)[0]
+                for endpoint, response in operation(client, ctx, rng):
+                    sample = Sample(endpoint, response.status_code, response.elapsed.total_seconds(), queries_of(response))
+                    with lock:
+                        samples.append(sample)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def _summary(samples: list[Sample], wall_seconds: float) -> dict:
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample.status >= 400),
+        "rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(samples: list[Sample], wall_seconds: float, meta: dict) -> dict:
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    return {
+        "meta": {**meta, "git_revision": git_revision(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                 "wall_seconds": round(wall_seconds, 3)},
+        "total": _summary(samples, wall_seconds),
+        "endpoints": {endpoint: _summary(items, wall_seconds) for endpoint, items in sorted(by_endpoint.items())},
+    }
+
+
+def compare_reports(before: dict, after: dict, threshold_pct: float) -> tuple[list[str], bool]:
+    """Format per-endpoint p50/p95/rps deltas; regressed when p95 grew more than 'threshold_pct'."""
+    lines = [f"{'endpoint':<52} {'p50 ms':>16} {'p95 ms':>16} {'rps':>16} {'queries':>12}"]
+    regressed = False
+    for endpoint in sorted(set(before["endpoints"]) & set(after["endpoints"])):
+        old, new = before["endpoints"][endpoint], after["endpoints"][endpoint]
+        change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        flag = ""
+        if change > threshold_pct:
+            regressed = True
+            flag = "  REGRESSION"
+        lines.append(
+            f"{endpoint:<52} {old['p50_ms']:>7.1f}->{new['p50_ms']:<7.1f} {old['p95_ms']:>7.1f}->{new['p95_ms']:<7.1f}"
+            f" {old['rps']:>7.1f}->{new['rps']:<7.1f} {str(old['queries_per_request']):>5}->{str(new['queries_per_request']):<5}{flag}"
+        )
+    return lines, regressed
@@ -0,0 +1,21 @@
+# dataset sizes per scale preset
+SCALES = {
+    "small": {"orgs": 2, "shelters_per_org": 2, "staff_per_shelter": 2, "animals_per_shelter": 25, "adopters": 20, "requests": 200},
+    "medium": {"orgs": 5, "shelters_per_org": 4, "staff_per_shelter": 3, "animals_per_shelter": 250, "adopters": 200, "requests": 5000},
+    "large": {"orgs": 10, "shelters_per_org": 10, "staff_per_shelter": 5, "animals_per_shelter": 1000, "adopters": 2000, "requests": 100000},
+    "xlarge": {"orgs": 50, "shelters_per_org": 20, "staff_per_shelter": 5, "animals_per_shelter": 1000, "adopters": 250000, "requests": 1000000},
+    # one organization holding a million requests, for the per-organization analytics (cohorts workload)
+    "dense": {"orgs": 1, "shelters_per_org": 20, "staff_per_shelter": 3, "animals_per_shelter": 10000, "adopters": 50000, "requests": 1000000},
+}
+
+
+def seed_database(engine, scale: str, seed: int, workers: int = 1):
+    """Create the schema (as the app does at startup) and fill it deterministically with the seed script's bulk loader."""
+    from app.core.startup import prepare_database
+    from scripts.seed import bulk_seed, scaled_plan
+
+    prepare_database()
+
+    sizes = dict(SCALES[scale])
+    animals = sizes["orgs"] * sizes["shelters_per_org"] * sizes.pop("animals_per_shelter")
+    bulk_seed(engine, scaled_plan(animals, seed=seed, **sizes), workers=workers)
@@ -0,0 +1,141 @@
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlmodel import Session, select
+
+from app.schemas.models import Animal, Organization, Staff, User
+
+# password shared by every user created by scripts/seed.py
+SEED_PASSWORD = "password123"
+
+
+@dataclass
+class Context:
+    """Tokens and ids the workloads pick from, loaded once from the seeded database."""
+    admin_headers: list[dict] = field(default_factory=list)
+    staff_headers: list[dict] = field(default_factory=list)
+    login_emails: list[str] = field(default_factory=list)
+    animal_ids: list[int] = field(default_factory=list)
+    staff_animal_ids: dict[int, list[int]] = field(default_factory=dict)
+    breeds: list[str] = field(default_factory=list)
+
+
+def login(client, email: str):
+    return client.post("/api/internal/auth/login", data={"username": email, "password": SEED_PASSWORD})
+
+
+def build_context(engine, client, users_per_role: int = 3) -> Context:
+    """Log a few admins and staff members in through the API and collect ids for the workloads."""
+    ctx = Context()
+    with Session(engine) as session:
+        admins = session.exec(select(User).join(Organization, Organization.admin_id == User.id).limit(users_per_role)).all()
+        staff_rows = session.exec(select(User, Staff.shelter_id).join(Staff, Staff.user_id == User.id).limit(users_per_role)).all()
+        ctx.login_emails = [u.email for u in session.exec(select(User).limit(50)).all()]
+        ctx.animal_ids = list(session.exec(select(Animal.id).limit(5000)).all())
+        ctx.breeds = sorted(set(session.exec(select(Animal.breed_name).distinct()).all()))
+        shelter_animals = {}
+        for user, shelter_id in staff_rows:
+            shelter_animals[user.email] = list(session.exec(select(Animal.id).where(Animal.shelter_id == shelter_id).limit(500)).all())
+    for user in admins:
+        ctx.admin_headers.append(_auth_headers(client, user.email))
+    for user, _ in staff_rows:
+        headers = _auth_headers(client, user.email)
+        ctx.staff_headers.append(headers)
+        ctx.staff_animal_ids[len(ctx.staff_headers) - 1] = shelter_animals[user.email]
+    if not ctx.admin_headers or not ctx.staff_headers or not ctx.animal_ids:
+        raise SystemExit("benchmark database has no admins, staff or animals, seed it first")
+    return ctx
+
+
+def _auth_headers(client, email: str) -> dict:
+    response = login(client, email)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+# ---- operations: each returns a list of (endpoint label, response) ----
+
+def public_list(client, ctx: Context, rng: random.Random):
+    params = rng.choice([
+        {},
+        {"skip": rng.randint(0, 100), "limit": 20},
+        {"breed": rng.choice(ctx.breeds)},
+        {"fields": "id,name,breed_name,species_name"},
+    ])
+    return [("GET /api/public/animals/", client.get("/api/public/animals/", params=params))]
+
+
+def public_profile(client, ctx: Context, rng: random.Random):
+    animal_id = rng.choice(ctx.animal_ids)
+    return [("GET /api/public/animals/{animal_id}", client.get(f"/api/public/animals/{animal_id}"))]
+
+
+def staff_lists(client, ctx: Context, rng: random.Random):
+    headers = rng.choice(ctx.staff_headers)
+    path = rng.choice(["/api/internals/animals/", "/api/internal/vaccinations/", "/api/internal/medicalRecords/",
+                       "/api/internal/adoptionRequests/"])
+    return [(f"GET {path}", client.get(path, headers=headers))]
+
+
+def staff_vaccination_crud(client, ctx: Context, rng: random.Random):
+    index = rng.randrange(len(ctx.staff_headers))
+    headers = ctx.staff_headers[index]
+    animal_ids = ctx.staff_animal_ids[index]
+    if not animal_ids:
+        return []
+    today = date.today()
+    created = client.post("/api/internal/vaccinations/", headers=headers, json={
+        "animal_id": rng.choice(animal_ids), "vaccine_type": "Rabies",
+        "vaccination_date": today.isoformat(), "valid_until": (today + timedelta(days=365)).isoformat(),
+    })
+    results = [("POST /api/internal/vaccinations/", created)]
+    if created.status_code == 201:
+        vaccination_id = created.json()["id"]
+        results.append(("PATCH /api/internal/vaccinations/{vaccination_id}",
+                        client.patch(f"/api/internal/vaccinations/{vaccination_id}", headers=headers, json={"notes": "bench"})))
+        results.append(("GET /api/internal/vaccinations/{vaccination_id}",
+                        client.get(f"/api/internal/vaccinations/{vaccination_id}", headers=headers)))
+    return results
+
+
+def staff_animal_update(client, ctx: Context, rng: random.Random):
+    index = rng.randrange(len(ctx.staff_headers))
+    animal_ids = ctx.staff_animal_ids[index]
+    if not animal_ids:
+        return []
+    animal_id = rng.choice(animal_ids)
+    return [("PATCH /api/internals/animals/{animal_id}",
+             client.patch(f"/api/internals/animals/{animal_id}", headers=ctx.staff_headers[index],
+                          json={"weight": round(rng.uniform(1, 50), 1)}))]
+
+
+def user_login(client, ctx: Context, rng: random.Random):
+    return [("POST /api/internal/auth/login", login(client, rng.choice(ctx.login_emails)))]
+
+
+def org_analytics(client, ctx: Context, rng: random.Random):
+    return [("GET /api/internal/analytics/", client.get("/api/internal/analytics/", headers=rng.choice(ctx.admin_headers)))]
+
+
+def org_cohorts(client, ctx: Context, rng: random.Random):
+    # a random page of the funnel, so the result cache does not serve every request
+    before = date.today().replace(day=1) - timedelta(days=30 * rng.randrange(24))
+    return [("GET /api/internal/analytics/cohorts", client.get(
+        "/api/internal/analytics/cohorts", params={"before": before.isoformat(), "limit": rng.choice([6, 12])},
+        headers=rng.choice(ctx.admin_headers)))]
+
+
+# (weight, operation) per workload
+WORKLOADS = {
+    "public": [(70, public_list), (30, public_profile)],
+    "staff": [(60, staff_lists), (25, staff_vaccination_crud), (15, staff_animal_update)],
+    "login": [(100, user_login)],
+    "analytics": [(100, org_analytics)],
+    "cohorts": [(100, org_cohorts)],
+}
+WORKLOADS["mixed"] = [
+    (45, public_list), (20, public_profile),
+    (15, staff_lists), (6, staff_vaccination_crud), (4, staff_animal_update),
+    (5, user_login), (5, org_analytics),
+]
@@ -1,18 +1,46 @@
+# imported first: starts the import-to-first-request clock
+from app.core.startup import StartupTimerMiddleware, prepare_database, start_warm_up
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.db.database import init_db, engine
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.db.database import engine
 from app.api.api_router import api_router
 from fastapi import  Depends, status
 from sqlmodel import Session
 from app.db.database import get_session
 from sqlalchemy import text
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.db.instrumentation import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.log import RequestLogMiddleware, setup_logging
+from app.core.tracing import TracingMiddleware, load_exporter
+from app.core.precompute import start_daily_jobs, start_worker, stop_daily_jobs, stop_worker
+from app.core.exports import recover_exports
+
+setup_logging()
+logger = logging.getLogger("pawbase")
 
 @asynccontextmanager
 async def lifespan(app:FastAPI):
-    print("Starting PawBase API...")
-    init_db()
+    logger.info("Starting PawBase API...")
+    prepare_database()
+    recover_exports()
+    if settings.STARTUP_WARMUP:
+        start_warm_up()
+    if settings.ANALYTICS_SNAPSHOTS and settings.PRECOMPUTE_WORKER:
+        start_worker()  # runs the daily jobs too
+    elif settings.DAILY_JOBS:
+        start_daily_jobs()
     yield
-    print("Shutting down PawBase API...")
+    logger.info("Shutting down PawBase API...")
+    stop_worker()
+    stop_daily_jobs()
     engine.dispose()
 
 
@@ -21,8 +49,48 @@ app = FastAPI(title="PawBase API",
               description="API for the PawBase animal shelter",
               lifespan=lifespan)
 
+# innermost: stores and replays the handlers' uncompressed responses, retries are still shed and counted
+app.add_middleware(IdempotencyMiddleware,
+                   ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+                   lock_timeout=settings.IDEMPOTENCY_LOCK_SECONDS)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware,
+                       minimum_size=settings.COMPRESSION_MIN_SIZE,
+                       gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+                       brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+                       use_brotli=settings.COMPRESSION_BROTLI,
+                       threadpool_size=settings.COMPRESSION_THREADPOOL_SIZE)
+
+# inside metrics so shed requests are counted as 503s
+app.add_middleware(LoadSheddingMiddleware,
+                   max_in_flight=settings.MAX_IN_FLIGHT_REQUESTS,
+                   public_fraction=settings.PUBLIC_SHED_FRACTION,
+                   timeout=settings.REQUEST_TIMEOUT_SECONDS,
+                   retry_after=settings.SHED_RETRY_AFTER_SECONDS)
+# metrics runs inside the query stats middleware so it can read the request's SQL time
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+if settings.TRACE_SAMPLE_RATE > 0:
+    app.add_middleware(TracingMiddleware,
+                       sample_rate=settings.TRACE_SAMPLE_RATE,
+                       exporter=load_exporter(settings.TRACE_EXPORTER))
+# outermost: the request id covers everything logged while serving the request
+app.add_middleware(RequestLogMiddleware)
+app.add_middleware(StartupTimerMiddleware)
+
 app.include_router(api_router, prefix="/api")
 
+
+@app.exception_handler(StaleDataError)
+async def concurrent_update_handler(request, exc):
+    """A versioned row (animal, adoption request) changed since it was read: optimistic lock lost."""
+    return JSONResponse(status_code=status.HTTP_409_CONFLICT,
+                        content={"detail": "The resource was modified concurrently, reload it and retry."})
+
 @app.get("/")
 def read_root():
     return {"message":"Hello to PawBase API!"}
@@ -47,3 +115,9 @@ def get_health_status(session: Session = Depends(get_session)):
         "database": db_status,
         "version": app.version
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+def get_metrics():
+    """Prometheus text exposition: per-route latency, SQL time, pool and password hashing metrics."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,33 @@
+"""Add analyticsgeneration table for cross-process analytics cache invalidation
+
+Revision ID: 2e7b9c4a1f58
+Revises: 8a3d5f1c7e49
+Create Date: 2026-10-20 10:14:33.482190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7b9c4a1f58'
+down_revision: Union[str, Sequence[str], None] = '8a3d5f1c7e49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analyticsgeneration',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analyticsgeneration')
@@ -0,0 +1,33 @@
+"""Add adoptionrequest.decided_at and indexes for cohort analytics
+
+Revision ID: 3b8e6d2c9f14
+Revises: 9f4c1b7e3a62
+Create Date: 2026-10-19 22:31:07.442915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e6d2c9f14'
+down_revision: Union[str, Sequence[str], None] = '9f4c1b7e3a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # no backfill: decisions made before this revision have no time and are left out of the medians
+    op.add_column('adoptionrequest', sa.Column('decided_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_animal_created_at'), 'animal', ['created_at'], unique=False)
+    op.create_index(op.f('ix_adoptionrequest_animal_id'), 'adoptionrequest', ['animal_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_adoptionrequest_animal_id'), table_name='adoptionrequest')
+    op.drop_index(op.f('ix_animal_created_at'), table_name='animal')
+    op.drop_column('adoptionrequest', 'decided_at')
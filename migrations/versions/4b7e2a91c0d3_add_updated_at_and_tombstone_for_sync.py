@@ -0,0 +1,56 @@
+"""Add updated_at to animal, medicalrecord, vaccination and tombstone table for delta sync
+
+Revision ID: 4b7e2a91c0d3
+Revises: d66041875640
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c0d3'
+down_revision: Union[str, Sequence[str], None] = 'd66041875640'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('animal', 'medicalrecord', 'vaccination'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # backfill: animals changed last when created, records have no timestamp so they sync once
+    op.execute('UPDATE animal SET updated_at = created_at')
+    op.execute('UPDATE medicalrecord SET updated_at = now()')
+    op.execute('UPDATE vaccination SET updated_at = now()')
+    for table in ('animal', 'medicalrecord', 'vaccination'):
+        op.alter_column(table, 'updated_at', nullable=False)
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+    op.create_table('tombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('shelter_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tombstone_deleted_at'), 'tombstone', ['deleted_at'], unique=False)
+    op.create_index(op.f('ix_tombstone_organization_id'), 'tombstone', ['organization_id'], unique=False)
+    op.create_index(op.f('ix_tombstone_shelter_id'), 'tombstone', ['shelter_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tombstone_shelter_id'), table_name='tombstone')
+    op.drop_index(op.f('ix_tombstone_organization_id'), table_name='tombstone')
+    op.drop_index(op.f('ix_tombstone_deleted_at'), table_name='tombstone')
+    op.drop_table('tombstone')
+    for table in ('vaccination', 'medicalrecord', 'animal'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
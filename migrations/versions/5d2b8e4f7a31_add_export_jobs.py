@@ -0,0 +1,48 @@
+"""Add exportjob table for columnar exports
+
+Revision ID: 5d2b8e4f7a31
+Revises: a83d5f0c6e17
+Create Date: 2026-10-19 20:05:18.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e4f7a31'
+down_revision: Union[str, Sequence[str], None] = 'a83d5f0c6e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+export_status = postgresql.ENUM('queued', 'running', 'completed', 'failed', name='exportstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exportjob',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by_user_id', sa.Integer(), nullable=True),
+    sa.Column('format', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', export_status, nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['requested_by_user_id'], ['user.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exportjob_organization_id'), 'exportjob', ['organization_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_exportjob_organization_id'), table_name='exportjob')
+    op.drop_table('exportjob')
+    export_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""Add owner and heartbeat_at to exportjob
+
+Revision ID: 7c3e9a2d5b14
+Revises: 2e7b9c4a1f58
+Create Date: 2026-10-21 09:02:17.318844
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a2d5b14'
+down_revision: Union[str, Sequence[str], None] = '2e7b9c4a1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exportjob', sa.Column('owner', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('exportjob', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('exportjob', 'heartbeat_at')
+    op.drop_column('exportjob', 'owner')
@@ -0,0 +1,75 @@
+"""Add shelterstats and shelterbreedstats counter tables for analytics
+
+Revision ID: 7c3e9f1a2b54
+Revises: 4b7e2a91c0d3
+Create Date: 2026-10-19 15:52:07.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9f1a2b54'
+down_revision: Union[str, Sequence[str], None] = '4b7e2a91c0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'total_requests': "TRUE",
+    'approved_requests': "r.status = 'approved'",
+    'rejected_requests': "r.status = 'rejected'",
+    'pending_requests': "r.status = 'submitted'",
+}
+ANIMAL_COUNTERS = {
+    'animals_available': 'available',
+    'animals_pending': 'pending',
+    'animals_adopted': 'adopted',
+    'animals_quarantine': 'quarantine',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('shelterstats',
+    sa.Column('shelter_id', sa.Integer(), nullable=False),
+    *[sa.Column(name, sa.Integer(), nullable=False) for name in (*COUNTERS, *ANIMAL_COUNTERS)],
+    sa.ForeignKeyConstraint(['shelter_id'], ['shelter.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('shelter_id')
+    )
+    op.create_table('shelterbreedstats',
+    sa.Column('shelter_id', sa.Integer(), nullable=False),
+    sa.Column('breed_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('approved_requests', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['shelter_id'], ['shelter.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('shelter_id', 'breed_name')
+    )
+
+    # backfill, afterwards the write paths keep the counters current
+    request_counts = ', '.join(
+        f"(SELECT count(*) FROM adoptionrequest r JOIN animal a ON a.id = r.animal_id "
+        f"WHERE a.shelter_id = s.id AND {condition})"
+        for condition in COUNTERS.values()
+    )
+    animal_counts = ', '.join(
+        f"(SELECT count(*) FROM animal a WHERE a.shelter_id = s.id AND a.status = '{status}')"
+        for status in ANIMAL_COUNTERS.values()
+    )
+    op.execute(
+        f"INSERT INTO shelterstats (shelter_id, {', '.join(COUNTERS)}, {', '.join(ANIMAL_COUNTERS)}) "
+        f"SELECT s.id, {request_counts}, {animal_counts} FROM shelter s"
+    )
+    op.execute(
+        "INSERT INTO shelterbreedstats (shelter_id, breed_name, approved_requests) "
+        "SELECT a.shelter_id, a.breed_name, count(*) FROM adoptionrequest r JOIN animal a ON a.id = r.animal_id "
+        "WHERE r.status = 'approved' GROUP BY a.shelter_id, a.breed_name"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('shelterbreedstats')
+    op.drop_table('shelterstats')
@@ -0,0 +1,33 @@
+"""Add dailyjobrun table to run the daily jobs once per day across processes
+
+Revision ID: 9f4b1d6e2a87
+Revises: 7c3e9a2d5b14
+Create Date: 2026-10-21 11:40:05.902613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b1d6e2a87'
+down_revision: Union[str, Sequence[str], None] = '7c3e9a2d5b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dailyjobrun',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('run_on', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dailyjobrun')
@@ -0,0 +1,37 @@
+"""Add analyticssnapshot table for precomputed analytics
+
+Revision ID: 9f4c1b7e3a62
+Revises: 5d2b8e4f7a31
+Create Date: 2026-10-19 21:12:40.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4c1b7e3a62'
+down_revision: Union[str, Sequence[str], None] = '5d2b8e4f7a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analyticssnapshot',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.Column('dirty', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analyticssnapshot')
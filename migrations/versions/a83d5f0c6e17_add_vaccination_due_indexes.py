@@ -0,0 +1,38 @@
+"""Add vaccination expiry indexes and the daily vaccinationdue list
+
+Revision ID: a83d5f0c6e17
+Revises: e1a4c7d2f905
+Create Date: 2026-10-19 19:12:44.530671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d5f0c6e17'
+down_revision: Union[str, Sequence[str], None] = 'e1a4c7d2f905'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_vaccination_valid_until'), 'vaccination', ['valid_until'], unique=False)
+    op.create_index('ix_vaccination_animal_type_date', 'vaccination', ['animal_id', 'vaccine_type', 'vaccination_date'], unique=False)
+    op.create_table('vaccinationdue',
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('vaccination_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['vaccination_id'], ['vaccination.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('as_of', 'vaccination_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vaccinationdue')
+    op.drop_index('ix_vaccination_animal_type_date', table_name='vaccination')
+    op.drop_index(op.f('ix_vaccination_valid_until'), table_name='vaccination')
@@ -0,0 +1,36 @@
+"""Add claim_token and headers to idempotencykey, replacing content_type
+
+Revision ID: b5e8c2f4a713
+Revises: 9f4b1d6e2a87
+Create Date: 2026-10-21 14:26:51.407338
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8c2f4a713'
+down_revision: Union[str, Sequence[str], None] = '9f4b1d6e2a87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # stored responses are only a retry cache: drop them rather than replay them without their headers
+    op.execute('DELETE FROM idempotencykey')
+    op.add_column('idempotencykey', sa.Column('claim_token', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False))
+    op.add_column('idempotencykey', sa.Column('headers', sa.JSON(), nullable=True))
+    op.drop_column('idempotencykey', 'content_type')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DELETE FROM idempotencykey')
+    op.add_column('idempotencykey', sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.drop_column('idempotencykey', 'headers')
+    op.drop_column('idempotencykey', 'claim_token')
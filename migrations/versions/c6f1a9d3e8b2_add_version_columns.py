@@ -0,0 +1,30 @@
+"""Add version columns to animal and adoptionrequest for optimistic locking
+
+Revision ID: c6f1a9d3e8b2
+Revises: 3b8e6d2c9f14
+Create Date: 2026-10-19 23:18:52.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a9d3e8b2'
+down_revision: Union[str, Sequence[str], None] = '3b8e6d2c9f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('animal', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('adoptionrequest', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('adoptionrequest', 'version')
+    op.drop_column('animal', 'version')
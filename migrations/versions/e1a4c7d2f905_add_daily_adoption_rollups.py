@@ -0,0 +1,48 @@
+"""Add daily adoption rollups for time-series analytics
+
+Revision ID: e1a4c7d2f905
+Revises: 7c3e9f1a2b54
+Create Date: 2026-10-19 18:04:31.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a4c7d2f905'
+down_revision: Union[str, Sequence[str], None] = '7c3e9f1a2b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('adoptiondailystats',
+    sa.Column('shelter_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('species_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('total_requests', sa.Integer(), nullable=False),
+    sa.Column('approved_requests', sa.Integer(), nullable=False),
+    sa.Column('rejected_requests', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['shelter_id'], ['shelter.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('shelter_id', 'day', 'species_name')
+    )
+    # no backfill: closed days are rolled up on the first time-series query
+    op.create_table('analyticsrollupstate',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('closed_until', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organization.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id')
+    )
+    op.create_index(op.f('ix_adoptionrequest_request_date'), 'adoptionrequest', ['request_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_adoptionrequest_request_date'), table_name='adoptionrequest')
+    op.drop_table('analyticsrollupstate')
+    op.drop_table('adoptiondailystats')
@@ -0,0 +1,60 @@
+"""
+Compare full-entity list serialization vs a sparse 'fields=' projection.
+Runs against the database in DATABASE_URL, seed it first with scripts/seed.py.
+
+    python -m scripts.bench_projection [page_size]
+"""
+import sys
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.core.projection import projected_response
+from app.db.database import engine
+from app.schemas.models import Animal, MedicalRecord, Vaccination
+from app.schemas.schema_animal import AnimalRead
+from app.schemas.schema_medicalRecord import MedicalRecordRead
+from app.schemas.schema_vaccination import VaccinationRead
+
+CASES = [
+    (Animal, AnimalRead, ("id", "name", "breed_name")),
+    (MedicalRecord, MedicalRecordRead, ("id", "animal_id", "exam_date")),
+    (Vaccination, VaccinationRead, ("id", "animal_id", "valid_until")),
+]
+
+
+def measure(label, fn, repeat=5):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<44} {size:>10} bytes  peak {peak / 1024:>9.1f} KiB  {elapsed * 1000:>8.2f} ms/page")
+
+
+def main():
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for model, read_model, names in CASES:
+        query = select(model).order_by(model.id).limit(page_size)
+        adapter = TypeAdapter(list[read_model])
+
+        def full():
+            with Session(engine) as session:
+                rows = session.exec(query).all()
+                return len(adapter.dump_json([read_model.model_validate(row) for row in rows]))
+
+        def sparse():
+            with Session(engine) as session:
+                response = projected_response(session, query, model, read_model, names)
+                return len(response.body)
+
+        measure(f"{model.__name__} full entities", full)
+        measure(f"{model.__name__} fields={','.join(names)}", sparse)
+
+
+if __name__ == "__main__":
+    main()
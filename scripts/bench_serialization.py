@@ -0,0 +1,67 @@
+"""
+Serialization microbenchmark over in-memory AnimalRead rows (no database access).
+
+    python -m scripts.bench_serialization [rows]
+"""
+import json
+import sys
+import time
+from datetime import date, datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import encode_json
+from app.schemas.enums import AdoptionStatus
+from app.schemas.models import Animal
+from app.schemas.schema_animal import AnimalRead
+
+
+def build_rows(n):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "shelter_id": i % 50,
+            "name": f"Animal {i}",
+            "breed_name": "labrador",
+            "species_name": "dog",
+            "status": AdoptionStatus.available,
+            "date_of_birth": date(2020, 1, 1),
+            "weight": 12.5,
+            "is_neutered": True,
+            "public_description": "Friendly and calm. " * 10,
+            "created_at": now,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(label, fn, repeat=5):
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = len(fn())
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<52} {elapsed * 1000:>9.1f} ms  {size} bytes")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = build_rows(n)
+    entities = [Animal(**row) for row in rows]
+    adapter = TypeAdapter(list[AnimalRead])
+    print(f"serializing {n} AnimalRead rows")
+
+    # what FastAPI does for a response_model route returning ORM objects
+    measure("response_model: validate ORM + pydantic dump_json", lambda: adapter.dump_json(adapter.validate_python(entities, from_attributes=True)))
+    # custom response class without the pydantic fast path
+    measure("jsonable_encoder + stdlib json", lambda: json.dumps(jsonable_encoder([AnimalRead.model_validate(e) for e in entities])).encode())
+    # trusted ORM data, validation skipped
+    measure("model_construct + model_dump_json", lambda: b"[" + b",".join(AnimalRead.model_construct(**row).model_dump_json().encode() for row in rows) + b"]")
+    # FAST_JSON_RESPONSES: plain rows straight into the encoder
+    measure("selected rows + encode_json (FastJSONResponse)", lambda: encode_json(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Startup benchmark: spawn uvicorn and time process start -> first successful request,
+for each DB_STARTUP_MODE given (default: create_all and verify).
+
+    python -m scripts.bench_startup [runs] [mode ...]
+"""
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(mode):
+    port = free_port()
+    env = {**os.environ, "DB_STARTUP_MODE": mode}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise SystemExit(f"server exited with {server.returncode} in mode {mode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.01)
+        first_request = time.perf_counter() - started
+        metrics = httpx.get(f"http://127.0.0.1:{port}/metrics").text
+        in_app = re.search(r"^pawbase_startup_seconds (\S+)", metrics, re.M)
+        return first_request, float(in_app.group(1)) if in_app else None
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    modes = sys.argv[2:] or ["create_all", "verify"]
+    for mode in modes:
+        results = [measure(mode) for _ in range(runs)]
+        spawn = sorted(r[0] for r in results)
+        in_app = sorted(r[1] for r in results if r[1] is not None)
+        line = f"{mode:<12} spawn -> first request: median {spawn[len(spawn) // 2] * 1000:.0f} ms"
+        if in_app:
+            line += f", import -> first request: median {in_app[len(in_app) // 2] * 1000:.0f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compare peak memory of a materialized list vs the streaming export path.
+Runs against the database in DATABASE_URL, seed it first with scripts/seed.py.
+
+    python -m scripts.bench_streaming
+"""
+import json
+import time
+import tracemalloc
+
+from sqlmodel import Session, select
+
+from app.core.streaming import iter_query_chunks
+from app.db.database import engine
+from app.schemas.models import MedicalRecord, Vaccination
+from app.schemas.schema_medicalRecord import MedicalRecordRead
+from app.schemas.schema_vaccination import VaccinationRead
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {written:>12} bytes  peak {peak / 1024:>10.1f} KiB  {elapsed * 1000:>8.1f} ms")
+
+
+def materialized(model, read_model):
+    def run():
+        with Session(engine) as session:
+            rows = session.exec(select(model).order_by(model.id)).all()
+            body = json.dumps([read_model.model_validate(row).model_dump(mode="json") for row in rows])
+        return len(body)
+    return run
+
+
+def streamed(model, read_model, fmt):
+    def run():
+        return sum(len(chunk) for chunk in iter_query_chunks(select(model).order_by(model.id), read_model, fmt))
+    return run
+
+
+def main():
+    for model, read_model in ((Vaccination, VaccinationRead), (MedicalRecord, MedicalRecordRead)):
+        name = model.__name__
+        measure(f"{name} .all()", materialized(model, read_model))
+        measure(f"{name} stream json", streamed(model, read_model, "json"))
+        measure(f"{name} stream ndjson", streamed(model, read_model, "ndjson"))
+
+
+if __name__ == "__main__":
+    main()
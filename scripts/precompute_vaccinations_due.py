@@ -0,0 +1,25 @@
+"""
+Scheduled job: precompute today's vaccination due list (run daily, e.g. from cron shortly after midnight UTC).
+
+    python -m scripts.precompute_vaccinations_due
+"""
+import time
+from datetime import datetime, timezone
+
+from sqlmodel import Session
+
+from app.db.database import engine
+from app.db.vaccination_due import precompute_due
+
+
+def main():
+    started = time.perf_counter()
+    today = datetime.now(timezone.utc).date()
+    with Session(engine) as session:
+        count = precompute_due(session, today)
+        session.commit()
+    print(f"{count} due vaccinations precomputed for {today} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
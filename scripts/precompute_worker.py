@@ -0,0 +1,28 @@
+"""
+Run the analytics precompute worker on its own, once per deployment (the API processes leave PRECOMPUTE_WORKER off).
+
+    python -m scripts.precompute_worker
+"""
+import logging
+import signal
+import threading
+
+from app.core.log import setup_logging
+from app.core.precompute import start_worker
+
+
+def main():
+    setup_logging()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    worker = start_worker()
+    logging.getLogger("pawbase").info("Analytics precompute worker started")
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Reconciliation job: rebuild the per-shelter analytics counters from animals and adoption requests
+and drop the daily time-series rollups (rolled up again on the next query).
+
+    python -m scripts.rebuild_shelter_stats [organization_id]
+"""
+import sys
+import time
+
+from sqlmodel import Session
+
+from app.db.database import engine
+from app.db.rollups import rebuild_rollups
+from app.db.shelter_stats import rebuild_shelter_stats
+
+
+def main():
+    organization_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    started = time.perf_counter()
+    with Session(engine) as session:
+        rebuild_shelter_stats(session, organization_id)
+        rebuild_rollups(session, organization_id)
+        session.commit()
+    print(f"shelter stats rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
+import argparse
+import csv
+import io
 import os
 import random
-from datetime import timedelta
+import time as timer
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from enum import Enum
+from functools import lru_cache
 from faker import Faker
-from sqlmodel import Session, create_engine
+from sqlalchemy import func, select, text
+from sqlmodel import Session
 from datetime import  datetime, timezone
 from app.schemas.models import (
     Organization,
@@ -15,20 +25,19 @@ from app.schemas.models import (
     AdoptionRequest,
 )
 from app.schemas.enums import UserRole, AdoptionStatus, RequestStatus
-from app.core.security import get_password_hash
-from app.core.config import settings
 
 fake = Faker()
 
-# --- DATABASE SETUP ---
-DATABASE_URL = os.getenv("DATABASE_URL", settings.DATABASE_URL)
-engine = create_engine(DATABASE_URL, echo=True)
-
-# --- ENVIRONMENT CHECK ---
+# the engine and the schema are set up in __main__ only: bulk seeding workers import this module
+# (spawn), they must not open connections of their own
 ENV = os.getenv("ENV", "development")
-if ENV == "production":
-    print("🚫 Seeding is disabled in production!")
-    exit(1)
+
+
+def get_password_hash(password):
+    # imported late: app.core.security pulls in app.db.database, which creates the engine
+    from app.core.security import get_password_hash
+
+    return get_password_hash(password)
 
 
 # ------------------------------
@@ -210,28 +219,323 @@ def create_adoption_requests(session, animals, adopters, n_requests=20):
     for _ in range(n_requests):
         animal = random.choice(animals)
         adopter = random.choice(adopters)
+        status = random.choice(list(RequestStatus))
+        request_date = fake.date_time_this_year(tzinfo=timezone.utc)
         adoption_request = AdoptionRequest(
             animal_id=animal.id,
             adopter_user_id=adopter.id,
-            status=random.choice(list(RequestStatus)),
-            request_date=fake.date_time_this_year(tzinfo=timezone.utc)
+            status=status,
+            request_date=request_date,
+            decided_at=None if status == RequestStatus.submitted else request_date + timedelta(hours=random.randint(1, 240)),
         )
         session.add(adoption_request)
         requests_created += 1
     session.commit()
 
 
+# ------------------------------
+# ------- BULK SEEDING ----------
+# ------------------------------
+# Generates millions of rows with explicit ids computed from the plan, so every chunk can be
+# generated independently (and in another process) from its own seeded RNG: the same seed
+# always yields the same data, whatever the number of workers.
+
+BULK_SPECIES = {
+    "dog": ["labrador", "terrier", "poodle", "shepherd"],
+    "cat": ["siamese", "calico", "maine Coon", "bengal"],
+    "bird": ["parakeet", "cockatiel", "canary"],
+    "rabbit": ["lop", "rex", "dutch"],
+}
+VACCINE_TYPES = ["Rabies", "Distemper", "Parvo", "Hepatitis"]
+
+
+@dataclass(frozen=True)
+class BulkPlan:
+    seed: int
+    orgs: int
+    shelters_per_org: int
+    staff_per_shelter: int
+    animals: int
+    adopters: int
+    requests: int
+    as_of: date
+    password_hash: str
+    batch_size: int = 10_000
+
+    @property
+    def shelters(self):
+        return self.orgs * self.shelters_per_org
+
+    @property
+    def staff(self):
+        return self.shelters * self.staff_per_shelter
+
+    @property
+    def first_staff_user_id(self):
+        return self.orgs + 1
+
+    @property
+    def first_adopter_id(self):
+        return self.orgs + self.staff + 1
+
+    @property
+    def users(self):
+        return self.orgs + self.staff + self.adopters
+
+
+def scaled_plan(animals, seed=42, as_of=None, batch_size=10_000, **sizes):
+    """Derive the other table sizes from the number of animals (about 5.6 rows per animal)."""
+    orgs = sizes.get("orgs") or max(1, animals // 20_000)
+    return BulkPlan(
+        seed=seed,
+        orgs=orgs,
+        shelters_per_org=sizes.get("shelters_per_org") or 10,
+        staff_per_shelter=sizes.get("staff_per_shelter") or 3,
+        animals=animals,
+        adopters=sizes.get("adopters") or max(10, animals // 4),
+        requests=sizes.get("requests") or animals,
+        as_of=as_of or date.today(),
+        # every user shares the same password, hash it once instead of once per row
+        password_hash=get_password_hash("password123"),
+        batch_size=batch_size,
+    )
+
+
+@lru_cache
+def _pools(seed):
+    """Small Faker-generated value pools; sampling them is far cheaper than calling Faker per row."""
+    pool_fake = Faker()
+    pool_fake.seed_instance(seed)
+    return {
+        "first_names": [pool_fake.first_name() for _ in range(500)],
+        "last_names": [pool_fake.last_name() for _ in range(500)],
+        "cities": [pool_fake.city() for _ in range(200)],
+        "sentences": [pool_fake.sentence() for _ in range(300)],
+        "conditions": [pool_fake.sentence(nb_words=5) for _ in range(100)],
+        "paragraphs": [pool_fake.paragraph(nb_sentences=3) for _ in range(300)],
+    }
+
+
+def _timestamp(plan, rng, max_days):
+    start = datetime.combine(plan.as_of, time(), tzinfo=timezone.utc)
+    return start - timedelta(seconds=rng.randrange(max_days * 86400))
+
+
+def _day(plan, rng, max_days):
+    return plan.as_of - timedelta(days=rng.randrange(max_days))
+
+
+def _gen_users(plan, rng, pools, start, stop):
+    for user_id in range(start + 1, stop + 1):
+        if user_id < plan.first_staff_user_id:
+            role = UserRole.org_admin
+        elif user_id < plan.first_adopter_id:
+            role = UserRole.staff
+        else:
+            role = UserRole.adopter
+        email = f"{rng.choice(pools['first_names'])}.{rng.choice(pools['last_names'])}.{user_id}@example.org".lower()
+        yield user_id, email, plan.password_hash, role, _timestamp(plan, rng, 3 * 365)
+
+
+def _gen_organizations(plan, rng, pools, start, stop):
+    for org_id in range(start + 1, stop + 1):
+        name = f"{rng.choice(pools['last_names'])} Animal Rescue {org_id}"
+        yield org_id, name, f"contact{org_id}@rescue.example.org", org_id, _timestamp(plan, rng, 3 * 365)
+
+
+def _gen_shelters(plan, rng, pools, start, stop):
+    for shelter_id in range(start + 1, stop + 1):
+        org_id = (shelter_id - 1) // plan.shelters_per_org + 1
+        branch = (shelter_id - 1) % plan.shelters_per_org + 1
+        city = rng.choice(pools["cities"])
+        yield shelter_id, org_id, f"{city} - Branch {branch}", city + " Shelter", _timestamp(plan, rng, 3 * 365)
+
+
+def _gen_staff(plan, rng, pools, start, stop):
+    for staff_id in range(start + 1, stop + 1):
+        yield staff_id, plan.first_staff_user_id + staff_id - 1, (staff_id - 1) // plan.staff_per_shelter + 1
+
+
+def _animal_shelter(plan, animal_id):
+    return (animal_id - 1) % plan.shelters + 1
+
+
+def _shelter_staff_user(plan, rng, shelter_id):
+    return plan.first_staff_user_id + (shelter_id - 1) * plan.staff_per_shelter + rng.randrange(plan.staff_per_shelter)
+
+
+def _gen_animals(plan, rng, pools, start, stop):
+    statuses = list(AdoptionStatus)
+    for animal_id in range(start + 1, stop + 1):
+        species = rng.choice(list(BULK_SPECIES))
+        created_at = _timestamp(plan, rng, 2 * 365)
+        yield (animal_id, _animal_shelter(plan, animal_id), rng.choice(pools["first_names"]), species,
+               rng.choice(BULK_SPECIES[species]), rng.choice(statuses), _day(plan, rng, 10 * 365),
+               rng.random() < 0.7, round(rng.uniform(1.0, 50.0), 2), rng.choice(pools["paragraphs"]),
+               created_at, created_at)
+
+
+def _gen_medical_records(plan, rng, pools, start, stop):
+    for animal_id in range(start + 1, stop + 1):
+        shelter_id = _animal_shelter(plan, animal_id)
+        for _ in range(rng.randint(1, 3)):
+            yield (animal_id, _shelter_staff_user(plan, rng, shelter_id), _day(plan, rng, 365),
+                   rng.choice(pools["conditions"]), rng.choice(pools["paragraphs"]), _timestamp(plan, rng, 365))
+
+
+def _gen_vaccinations(plan, rng, pools, start, stop):
+    for animal_id in range(start + 1, stop + 1):
+        shelter_id = _animal_shelter(plan, animal_id)
+        for _ in range(rng.randint(1, 2)):
+            vaccination_date = _day(plan, rng, 365)
+            yield (animal_id, _shelter_staff_user(plan, rng, shelter_id), rng.choice(VACCINE_TYPES),
+                   vaccination_date, vaccination_date + timedelta(days=365), rng.choice(pools["sentences"]),
+                   _timestamp(plan, rng, 365))
+
+
+def _gen_adoption_requests(plan, rng, pools, start, stop):
+    statuses = list(RequestStatus)
+    for _ in range(start, stop):
+        status, request_date = rng.choice(statuses), _timestamp(plan, rng, 365)
+        decided_at = None if status == RequestStatus.submitted else request_date + timedelta(seconds=rng.randrange(10 * 86400))
+        yield (rng.randint(1, plan.animals), plan.first_adopter_id + rng.randrange(plan.adopters),
+               status, request_date, decided_at)
+
+
+# (model, columns, generator, number of generator units); in FK order.
+# Leaf tables get database-assigned ids, their generators run once per animal (or request).
+BULK_TABLES = [
+    (User, ("id", "email", "password", "role", "created_at"), _gen_users, lambda plan: plan.users),
+    (Organization, ("id", "name", "contact_email", "admin_id", "created_at"), _gen_organizations, lambda plan: plan.orgs),
+    (Shelter, ("id", "organization_id", "name", "city", "created_at"), _gen_shelters, lambda plan: plan.shelters),
+    (Staff, ("id", "user_id", "shelter_id"), _gen_staff, lambda plan: plan.staff),
+    (Animal, ("id", "shelter_id", "name", "species_name", "breed_name", "status", "date_of_birth", "is_neutered",
+              "weight", "public_description", "created_at", "updated_at"), _gen_animals, lambda plan: plan.animals),
+    (MedicalRecord, ("animal_id", "staff_user_id", "exam_date", "condition", "vet_notes", "updated_at"),
+     _gen_medical_records, lambda plan: plan.animals),
+    (Vaccination, ("animal_id", "staff_user_id", "vaccine_type", "vaccination_date", "valid_until", "notes",
+                   "updated_at"), _gen_vaccinations, lambda plan: plan.animals),
+    (AdoptionRequest, ("animal_id", "adopter_user_id", "status", "request_date", "decided_at"), _gen_adoption_requests,
+     lambda plan: plan.requests),
+]
+
+
+def generate_chunk(plan, table_index, chunk_index):
+    """Rows for one batch of one table, seeded by (seed, table, chunk) only."""
+    _, _, generator, units = BULK_TABLES[table_index]
+    rng = random.Random(f"{plan.seed}:{table_index}:{chunk_index}")
+    start = chunk_index * plan.batch_size
+    stop = min(start + plan.batch_size, units(plan))
+    return list(generator(plan, rng, _pools(plan.seed), start, stop))
+
+
+def _chunks(plan, table_index, executor, workers):
+    """Yield a table's chunks in order, keeping at most 2 * workers batches in flight."""
+    n_chunks = -(-BULK_TABLES[table_index][3](plan) // plan.batch_size)
+    if executor is None:
+        for chunk_index in range(n_chunks):
+            yield generate_chunk(plan, table_index, chunk_index)
+        return
+    pending = deque()
+    for chunk_index in range(n_chunks):
+        pending.append(executor.submit(generate_chunk, plan, table_index, chunk_index))
+        if len(pending) >= 2 * workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _copy_rows(connection, table, columns, rows):
+    """COPY a batch into PostgreSQL as CSV (empty fields are NULL)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([value.name if isinstance(value, Enum) else value for value in row])
+    buffer.seek(0)
+    preparer = connection.dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column) for column in columns)
+    cursor = connection.connection.cursor()
+    cursor.copy_expert(f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _insert_rows(connection, table, columns, rows):
+    """Multi-row INSERT batch for databases without COPY."""
+    connection.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+# explicit ids leave PostgreSQL's sequences behind; SQLite (rowid) and MySQL (AUTO_INCREMENT)
+# continue after the largest id on their own
+BULK_DIALECTS = ("postgresql", "sqlite", "mysql", "mariadb")
+
+
+def _reset_sequences(connection):
+    """Move the id sequences past the explicitly written ids, so later inserts don't collide."""
+    if connection.dialect.name != "postgresql":
+        return
+    preparer = connection.dialect.identifier_preparer
+    for model, columns, _, _ in BULK_TABLES:
+        if "id" in columns:
+            table = model.__table__
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{preparer.format_table(table)}', 'id'), "
+                f"(SELECT max(id) FROM {preparer.format_table(table)}))"
+            ))
+
+
+def bulk_seed(target_engine, plan, workers=1):
+    """
+    Load the plan into empty tables with COPY (PostgreSQL) or batched multi-row INSERTs.
+    The schema must exist already (prepare_database / alembic upgrade head).
+    """
+    if target_engine.dialect.name not in BULK_DIALECTS:
+        raise SystemExit(f"🚫 Bulk seeding supports {', '.join(BULK_DIALECTS)}, not {target_engine.dialect.name}.")
+    with target_engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(User.__table__)).scalar():
+            raise SystemExit("🚫 Bulk seeding expects an empty database.")
+    use_copy = target_engine.dialect.name == "postgresql"
+    write_rows = _copy_rows if use_copy else _insert_rows
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    started = timer.perf_counter()
+    total = 0
+    try:
+        for table_index, (model, columns, _, _) in enumerate(BULK_TABLES):
+            table_started = timer.perf_counter()
+            count = 0
+            for rows in _chunks(plan, table_index, executor, workers):
+                with target_engine.begin() as connection:
+                    write_rows(connection, model.__table__, columns, rows)
+                count += len(rows)
+            elapsed = timer.perf_counter() - table_started
+            print(f"   -> {model.__tablename__}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+            total += count
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    with target_engine.begin() as connection:
+        _reset_sequences(connection)
+    # rows were written around the ORM, so the analytics counters are rebuilt from them
+    from app.db.shelter_stats import rebuild_shelter_stats
+    with Session(target_engine) as session:
+        rebuild_shelter_stats(session)
+        session.commit()
+    print(f"✅ Bulk seeding complete: {total} rows in {timer.perf_counter() - started:.1f}s")
+
+
 # ------------------------------
 # ---------- MAIN --------------
 # ------------------------------
-def main():
-    print("--- Starting PawBase Data Seeding ---")
-    from app.schemas.models import SQLModel
+def prepare_schema():
+    """The app's database (DATABASE_URL) with its schema handled as at startup (DB_STARTUP_MODE)."""
+    from app.core.startup import prepare_database
+    from app.db.database import engine
+
+    prepare_database()
+    print("✅ Database schema ready.")
+    return engine
 
-    # Create tables if not exist
-    SQLModel.metadata.create_all(engine)
-    print("✅ Database tables created/ensured.")
 
+def main(engine):
+    print("--- Starting PawBase Data Seeding ---")
     with Session(engine) as session:
         orgs = create_organizations(session)
         shelters = create_shelters(session, orgs)
@@ -248,5 +552,27 @@ def main():
         print("✅ Seeding complete!")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the PawBase database")
+    parser.add_argument("--bulk", action="store_true", help="high-volume mode for benchmark datasets")
+    parser.add_argument("--animals", type=int, default=100_000, help="bulk: animals to create, other tables scale with it")
+    parser.add_argument("--seed", type=int, default=42, help="bulk: RNG seed, the same seed gives the same data")
+    parser.add_argument("--workers", type=int, default=1, help="bulk: processes generating rows")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="bulk: rows per COPY / INSERT batch")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="bulk: date the data is relative to")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    if ENV == "production":
+        print("🚫 Seeding is disabled in production!")
+        exit(1)
+    args = parse_args()
+    engine = prepare_schema()
+    if args.bulk:
+        print("--- Starting PawBase bulk seeding ---")
+        bulk_seed(engine, scaled_plan(args.animals, seed=args.seed, as_of=args.as_of, batch_size=args.batch_size),
+                  workers=args.workers)
+    else:
+        engine.echo = True
+        main(engine)
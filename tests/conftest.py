@@ -0,0 +1,95 @@
+import os
+import tempfile
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+# settings are read when the app is imported: point it at a throwaway SQLite database first
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='pawbase-tests-')}/pawbase.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["DB_STARTUP_MODE"] = "create_all"
+os.environ["STARTUP_WARMUP"] = "false"
+os.environ["PRECOMPUTE_WORKER"] = "false"
+os.environ["DAILY_JOBS"] = "false"
+os.environ["STRICT_LAZY_LOADING"] = "true"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.jwt import create_access_token
+from app.db.database import engine as app_engine, init_db
+from app.schemas.enums import AdoptionStatus, RequestStatus, UserRole
+from app.schemas.models import (AdoptionRequest, Animal, MedicalRecord, Organization, Shelter, Staff, User,
+                                Vaccination)
+from main import app
+
+
+@pytest.fixture(scope="session")
+def engine():
+    init_db()
+    return app_engine
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def strict_lazy_loading(monkeypatch):
+    """Implicit relationship loads raise: a query that forgets its loading options fails the test."""
+    monkeypatch.setattr(settings, "STRICT_LAZY_LOADING", True)
+
+
+def _headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+
+@pytest.fixture
+def tenant(engine):
+    """A fresh organization with two shelters, a staff member, an adopter and a few animals with records."""
+    tag = uuid.uuid4().hex[:8]
+    with Session(engine) as session:
+        admin = User(email=f"admin-{tag}@example.org", password="-", role=UserRole.org_admin)
+        staff = User(email=f"staff-{tag}@example.org", password="-", role=UserRole.staff)
+        adopter = User(email=f"adopter-{tag}@example.org", password="-", role=UserRole.adopter)
+        session.add_all([admin, staff, adopter])
+        session.flush()
+        organization = Organization(name=f"Org {tag}", admin_id=admin.id)
+        session.add(organization)
+        session.flush()
+        shelters = [Shelter(name=f"Shelter {tag} {i}", organization_id=organization.id) for i in range(2)]
+        session.add_all(shelters)
+        session.flush()
+        membership = Staff(user_id=staff.id, shelter_id=shelters[0].id)
+        session.add(membership)
+        animals = [Animal(name=f"Animal {i}", species_name="dog", breed_name="mixed", shelter_id=shelters[i % 2].id,
+                          status=AdoptionStatus.available, is_neutered=True) for i in range(6)]
+        session.add_all(animals)
+        session.flush()
+        records = []
+        for animal in animals:
+            records += [
+                Vaccination(animal_id=animal.id, staff_user_id=staff.id, vaccine_type="Rabies",
+                            vaccination_date=date.today() - timedelta(days=350), valid_until=date.today() + timedelta(days=15)),
+                MedicalRecord(animal_id=animal.id, staff_user_id=staff.id, exam_date=date.today()),
+                AdoptionRequest(animal_id=animal.id, adopter_user_id=adopter.id, status=RequestStatus.submitted),
+            ]
+        session.add_all(records)
+        session.commit()
+        vaccination, medical_record, adoption_request = records[:3]
+        return SimpleNamespace(
+            organization_id=organization.id,
+            shelter_id=shelters[0].id,
+            staff_id=membership.id,
+            animal_id=animals[0].id,
+            vaccination_id=vaccination.id,
+            medical_record_id=medical_record.id,
+            adoption_request_id=adoption_request.id,
+            admin=_headers(admin.id),
+            staff=_headers(staff.id),
+            adopter=_headers(adopter.id),
+        )
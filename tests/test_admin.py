@@ -0,0 +1,23 @@
+import pytest
+
+from app.core.config import settings
+
+ADMIN_PATHS = ["/api/internal/admin/sql", "/api/internal/admin/compression", "/api/internal/admin/profiles"]
+
+
+@pytest.fixture
+def operator(monkeypatch):
+    monkeypatch.setattr(settings, "OPERATOR_TOKEN", "operator-secret")
+    return {"X-Operator-Token": "operator-secret"}
+
+
+@pytest.mark.parametrize("path", ADMIN_PATHS)
+def test_process_wide_stats_need_the_operator_token(client, tenant, operator, path):
+    assert client.get(path, headers=tenant.admin).status_code == 403
+    assert client.get(path, headers={"X-Operator-Token": "guess"}).status_code == 403
+    assert client.get(path, headers=operator).status_code == 200
+
+
+def test_admin_endpoints_are_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "OPERATOR_TOKEN", None)
+    assert client.get(ADMIN_PATHS[0], headers={"X-Operator-Token": ""}).status_code == 403
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.schemas.enums import RequestStatus, UserRole
+from app.schemas.models import AdoptionRequest, User
+from benchmarks.approvals import run_approvals
+from main import app
+
+APPROVE = {"status": RequestStatus.approved.value}
+
+
+def _second_request(engine, animal_id: int) -> int:
+    """Another adopter's open request for the same animal."""
+    with Session(engine) as session:
+        adopter = User(email=f"second-adopter-{animal_id}@example.org", password="-", role=UserRole.adopter)
+        session.add(adopter)
+        session.flush()
+        request = AdoptionRequest(animal_id=animal_id, adopter_user_id=adopter.id, status=RequestStatus.submitted)
+        session.add(request)
+        session.commit()
+        return request.id
+
+
+def test_concurrent_approvals_keep_one_winner_per_animal(engine):
+    result = run_approvals(lambda: TestClient(app), engine, animals=4, requests_per_animal=4, concurrency=8)
+    assert result["problems"] == []
+
+
+def test_stale_if_match_is_rejected(client, tenant):
+    path = f"/api/internal/adoptionRequests/{tenant.adoption_request_id}"
+    etag = client.get(path, headers=tenant.admin).headers["ETag"]
+    client.patch(path, headers=tenant.admin, json={"status": RequestStatus.rejected.value}).raise_for_status()
+
+    response = client.patch(path, headers={**tenant.admin, "If-Match": etag}, json=APPROVE)
+    assert response.status_code == 412
+
+    fresh = client.get(path, headers=tenant.admin).headers["ETag"]
+    response = client.patch(path, headers={**tenant.admin, "If-Match": fresh}, json=APPROVE)
+    assert response.status_code == 200
+
+
+def test_approving_an_adopted_animal_conflicts(client, engine, tenant):
+    other_request_id = _second_request(engine, tenant.animal_id)
+    response = client.patch(f"/api/internal/adoptionRequests/{tenant.adoption_request_id}",
+                            headers=tenant.admin, json=APPROVE)
+    assert response.status_code == 200
+
+    other = client.get(f"/api/internal/adoptionRequests/{other_request_id}", headers=tenant.admin).json()
+    assert other["status"] == RequestStatus.rejected.value
+    response = client.patch(f"/api/internal/adoptionRequests/{other_request_id}", headers=tenant.admin, json=APPROVE)
+    assert response.status_code == 409
@@ -0,0 +1,58 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BODY = "".join(f"animal {i} is looking for a home\n" for i in range(20000))
+
+
+def _app(**options) -> Starlette:
+    app = Starlette(routes=[Route("/", lambda request: PlainTextResponse(BODY))])
+    app.add_middleware(CompressionMiddleware, use_brotli=False, **options)
+    return app
+
+
+@pytest.fixture
+def threadpool_calls(monkeypatch):
+    calls = []
+    run_in_threadpool = compression.run_in_threadpool
+
+    async def recording(func, *args):
+        calls.append(len(args[0]))
+        return await run_in_threadpool(func, *args)
+
+    monkeypatch.setattr(compression, "run_in_threadpool", recording)
+    return calls
+
+
+def test_large_body_is_compressed_off_the_event_loop(threadpool_calls):
+    with TestClient(_app(threadpool_size=65536)).stream("GET", "/", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert len(raw) < len(BODY)
+    assert gzip.decompress(raw).decode() == BODY
+    assert threadpool_calls == [len(BODY)]
+
+
+def test_small_body_is_compressed_inline(threadpool_calls):
+    response = TestClient(_app(threadpool_size=len(BODY) + 1)).get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+    assert threadpool_calls == []
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*;q=0.5, gzip;q=0", None),
+    ("identity, *;q=0.1", "gzip"),
+    ("", None),
+])
+def test_choose_encoding(accept, expected):
+    assert choose_encoding(accept, use_brotli=False) == expected
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+from starlette.responses import Response
+
+from app.core.idempotency import IdempotencyMiddleware, claim_key, release_key, request_hash, store_response
+
+PATH = "/api/internal/vaccinations"
+
+
+def _created(calls: list):
+    async def app(scope, receive, send):
+        await receive()
+        calls.append(scope["path"])
+        response = Response(b'{"id": 7}', status_code=201, media_type="application/json",
+                            headers={"Location": f"{PATH}/7", "ETag": '"1"'})
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        await response(scope, receive, send)
+    return app
+
+
+def test_replay_has_every_header_of_the_first_response(engine, tenant):
+    calls = []
+    client = TestClient(IdempotencyMiddleware(_created(calls), ttl=60, lock_timeout=60))
+    headers = {**tenant.staff, "Idempotency-Key": "replay-headers"}
+
+    first = client.post(PATH, headers=headers, content=b"{}")
+    replay = client.post(PATH, headers=headers, content=b"{}")
+
+    assert calls == [PATH]
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.status_code == 201 and replay.content == first.content
+    for name in ("location", "etag", "content-type", "content-length"):
+        assert replay.headers[name] == first.headers[name]
+    assert replay.headers.get_list("set-cookie") == first.headers.get_list("set-cookie")
+
+
+def test_a_claim_taken_over_cannot_store_or_release(engine, tenant):
+    scope = {"method": "POST", "path": PATH, "query_string": b""}
+    hashed = request_hash(scope, b"{}")
+    user_id = 10**6 + tenant.organization_id
+    abandoned, _ = claim_key(user_id, "taken-over", hashed, lock_timeout=0)
+    token, existing = claim_key(user_id, "taken-over", hashed, lock_timeout=60)
+    assert existing is None and token != abandoned
+
+    store_response(user_id, "taken-over", abandoned, 201, [], b"late", ttl=60)
+    release_key(user_id, "taken-over", abandoned)
+    _, existing = claim_key(user_id, "taken-over", hashed, lock_timeout=60)
+    assert existing is not None and existing.status_code is None
+
+    store_response(user_id, "taken-over", token, 201, [], b"mine", ttl=60)
+    _, existing = claim_key(user_id, "taken-over", hashed, lock_timeout=60)
+    assert existing.body == b"mine"
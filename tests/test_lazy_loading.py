@@ -0,0 +1,43 @@
+import pytest
+
+# (path template, role): every list and detail endpoint, run under STRICT_LAZY_LOADING
+ENDPOINTS = [
+    ("/api/internals/animals/", "staff"),
+    ("/api/internals/animals/{animal_id}", "staff"),
+    ("/api/internal/vaccinations/", "staff"),
+    ("/api/internal/vaccinations/due", "staff"),
+    ("/api/internal/vaccinations/{vaccination_id}", "staff"),
+    ("/api/internal/medicalRecords/", "staff"),
+    ("/api/internal/medicalRecords/{medical_record_id}", "staff"),
+    ("/api/internal/adoptionRequests/", "admin"),
+    ("/api/internal/adoptionRequests/{adoption_request_id}", "admin"),
+    ("/api/internal/shelters/", "staff"),
+    ("/api/internal/shelters/{shelter_id}", "staff"),
+    ("/api/internal/staff/", "admin"),
+    ("/api/internal/staff/{staff_id}", "admin"),
+    ("/api/internal/organizations/{organization_id}", "admin"),
+    ("/api/internal/auth/me", "staff"),
+    ("/api/internal/sync/", "staff"),
+    ("/api/internal/analytics/", "admin"),
+    ("/api/public/animals/", None),
+    ("/api/public/animals/{animal_id}", None),
+]
+
+
+@pytest.mark.parametrize("path, role", ENDPOINTS)
+def test_endpoint_loads_relationships_explicitly(client, tenant, path, role):
+    headers = getattr(tenant, role) if role else {}
+    response = client.get(path.format(**vars(tenant)), headers=headers)
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("stream", ["json", "ndjson"])
+def test_streamed_list_loads_relationships_explicitly(client, tenant, stream):
+    response = client.get(f"/api/internals/animals/?stream={stream}", headers=tenant.admin)
+    assert response.status_code == 200, response.text
+
+
+def test_animal_delete_cascade_loads_children_explicitly(client, tenant):
+    response = client.delete(f"/api/internals/animals/{tenant.animal_id}", headers=tenant.admin)
+    assert response.status_code in (200, 204), response.text
+    assert client.get(f"/api/internals/animals/{tenant.animal_id}", headers=tenant.admin).status_code == 404
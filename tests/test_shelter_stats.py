@@ -0,0 +1,41 @@
+from sqlalchemy import select
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session
+
+from app.db.shelter_stats import rebuild_shelter_stats
+from app.schemas.models import AdoptionRequest, Animal, ShelterStats
+
+
+def _counters(session: Session, shelter_id: int) -> tuple:
+    stats = session.get(ShelterStats, shelter_id)
+    session.refresh(stats)
+    return stats.total_requests, stats.pending_requests, stats.animals_available
+
+
+def _assert_matches_rebuild(engine, shelter_id: int, organization_id: int):
+    with Session(engine) as session:
+        maintained = _counters(session, shelter_id)
+        rebuild_shelter_stats(session, organization_id)
+        assert _counters(session, shelter_id) == maintained
+        session.rollback()
+
+
+def test_deleting_an_animal_with_its_requests_keeps_counters(client, engine, tenant):
+    response = client.delete(f"/api/internals/animals/{tenant.animal_id}", headers=tenant.admin)
+    assert response.status_code in (200, 204), response.text
+    _assert_matches_rebuild(engine, tenant.shelter_id, tenant.organization_id)
+
+
+def test_requests_deleted_in_a_later_flush_than_their_animal(engine, tenant):
+    with Session(engine) as session:
+        animal = session.get(Animal, tenant.animal_id)
+        requests = session.execute(
+            select(AdoptionRequest).where(AdoptionRequest.animal_id == animal.id)).scalars().all()
+        # hide them from the cascade: the animal goes first, the requests in the next flush
+        set_committed_value(animal, "adoption_requests", [])
+        session.delete(animal)
+        session.flush()
+        for request in requests:
+            session.delete(request)
+        session.commit()
+    _assert_matches_rebuild(engine, tenant.shelter_id, tenant.organization_id)